@@ -8,12 +8,18 @@
 - ProjectAPI: 项目管理相关的 API
 - TagAPI: 标签管理相关的 API
 - BaseAPI: API 基础类
+- TaskQuery: 惰性的链式任务查询
+- WriteBuffer: 合并修改后批量提交的写缓冲
+- Batch: 按依赖顺序提交、失败时回滚的多操作批处理
 """
 
 from .base import BaseAPI
 from .tasks import TaskAPI, ReminderOption
+from .query import TaskQuery
 from .project import ProjectAPI
 from .tag import TagAPI
+from .buffer import WriteBuffer
+from .batch import Batch
 
 __all__ = [
     'BaseAPI',
@@ -21,6 +27,9 @@ __all__ = [
     'ProjectAPI',
     'TagAPI',
     'ReminderOption',
+    'TaskQuery',
+    'WriteBuffer',
+    'Batch',
 ]
 
 __version__ = '1.0.0'
@@ -1,23 +1,56 @@
 """
 基础API类
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Callable, Iterator, Iterable
 from ..utils.http import HttpClient
-from datetime import datetime
-import pytz
+from ..utils.resolver import NameResolver
+from ..utils.timezone import DEFAULT_TIMEZONE, UTC, get_timezone, localize
+from ..exceptions import APIError
+from datetime import datetime, tzinfo
+import time
+import requests
+
+# 批量接口每次请求最多包含的条目数
+BATCH_CHUNK_SIZE = 100
+
+# 整块请求失败（网络错误或重试后仍为服务端错误）时单条结果 info 的前缀，这类失败可以重新提交
+BATCH_REQUEST_FAILED = "批量请求失败"
 
 class BaseAPI:
     """所有API的基类"""
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, resolver: Optional[NameResolver] = None, timezone: Optional[str] = None):
         """
         初始化API实例
         
         Args:
             token: API访问令牌
+            resolver: 名称解析缓存，多个API模块可以共享同一个实例
+            timezone: 本地时区名称，输入的时间按该时区解释，返回的时间转换为该时区，默认为 Asia/Shanghai
         """
         self.token = token
         self.http = HttpClient(token)
+        self.resolver = resolver if resolver is not None else NameResolver()
+        self.timezone = timezone or DEFAULT_TIMEZONE
+        self.tz: tzinfo = get_timezone(self.timezone)
+
+    def _fetch_sync(self) -> Dict[str, Any]:
+        """
+        获取全量同步数据（未完成任务、项目、标签），并刷新名称解析缓存
+
+        Returns:
+            Dict[str, Any]: /api/v2/batch/check/0 的响应数据
+        """
+        response = self._get("/api/v2/batch/check/0")
+        if isinstance(response, dict):
+            self.resolver.sync(response)
+        return response
+
+    def _ensure_resolver(self) -> NameResolver:
+        """返回名称解析缓存，尚未填充时同步一次"""
+        if not self.resolver.loaded:
+            self._fetch_sync()
+        return self.resolver
     
     def _convert_date_format(self, date_str: Optional[str] = None, date_obj: Optional[datetime] = None) -> Optional[str]:
         """
@@ -47,11 +80,10 @@ class BaseAPI:
                 
             # 确保日期对象有时区信息
             if dt.tzinfo is None:
-                local_tz = pytz.timezone('Asia/Shanghai')
-                dt = local_tz.localize(dt)
+                dt = localize(dt, self.tz)
             
             # 转换为UTC时间
-            utc_dt = dt.astimezone(pytz.UTC)
+            utc_dt = dt.astimezone(UTC)
             
             # 返回指定格式
             return utc_dt.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
@@ -135,4 +167,105 @@ class BaseAPI:
         Returns:
             bool: 是否删除成功
         """
-        return self.http.delete(endpoint) 
\ No newline at end of file
+        return self.http.delete(endpoint) 
+
+    @staticmethod
+    def _chunked(items: List[Any], size: int) -> Iterator[List[Any]]:
+        """
+        将列表按固定大小分块
+
+        Args:
+            items: 列表
+            size: 每块的大小
+        """
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """网络错误、限流和服务端错误可以重试，认证和参数错误不重试"""
+        if isinstance(error, requests.RequestException):
+            return True
+        if isinstance(error, APIError):
+            return error.status_code == 429 or error.status_code >= 500
+        return False
+
+    def _post_with_retry(self, endpoint: str, data: Any, max_retries: int = 2,
+                         retry_delay: float = 1.0) -> Any:
+        """
+        发送POST请求，网络错误或服务端错误时按指数退避重试
+
+        Args:
+            endpoint: API端点
+            data: 请求数据
+            max_retries: 最多重试次数
+            retry_delay: 首次重试前的等待秒数
+
+        Returns:
+            Any: 响应数据，重试次数用完或错误不可重试时抛出最后一次的异常
+        """
+        attempt = 0
+        while True:
+            try:
+                return self._post(endpoint, data=data)
+            except Exception as e:
+                if attempt >= max_retries or not self._is_retryable(e):
+                    raise
+                time.sleep(retry_delay * (2 ** attempt))
+                attempt += 1
+
+    def _post_batch(self, endpoint: str, action: str, items: Iterable[Any],
+                    key: Callable[[Any], str], chunk_size: int = BATCH_CHUNK_SIZE,
+                    max_retries: int = 2, retry_delay: float = 1.0) -> List[Dict[str, Any]]:
+        """
+        通过批量接口分块提交，返回与输入一一对应的结果
+
+        每块发送一个 {"add": [], "update": [], "delete": []} 请求，action 决定条目放在哪个数组中。
+        网络错误或服务端错误时整块重试（指数退避），服务端在 id2error 中返回的单条错误不重试。
+
+        Args:
+            endpoint: 批量接口，如 /api/v2/batch/task
+            action: "add"、"update" 或 "delete"
+            items: 条目列表
+            key: 从条目中取出ID的函数，用于匹配 id2etag/id2error
+            chunk_size: 每个请求最多包含的条目数
+            max_retries: 每块最多重试次数
+            retry_delay: 首次重试前的等待秒数
+
+        Returns:
+            List[Dict[str, Any]]: 每个条目的结果 {"success", "info", "data", "etag"}
+        """
+        results = []
+        for chunk in self._chunked(list(items), chunk_size):
+            payload = {"add": [], "update": [], "delete": []}
+            payload[action] = chunk
+            try:
+                response = self._post_with_retry(endpoint, payload, max_retries, retry_delay)
+            except Exception as e:
+                results.extend({
+                    "success": False,
+                    "info": f"{BATCH_REQUEST_FAILED}: {str(e)}",
+                    "data": item,
+                    "etag": None
+                } for item in chunk)
+                continue
+
+            id2etag = response.get('id2etag', {}) if isinstance(response, dict) else {}
+            id2error = response.get('id2error', {}) if isinstance(response, dict) else {}
+            for item in chunk:
+                item_id = key(item)
+                if item_id in id2error:
+                    results.append({
+                        "success": False,
+                        "info": f"操作失败: {id2error[item_id]}",
+                        "data": item,
+                        "etag": None
+                    })
+                else:
+                    results.append({
+                        "success": True,
+                        "info": "操作成功",
+                        "data": item,
+                        "etag": id2etag.get(item_id)
+                    })
+        return results
@@ -0,0 +1,359 @@
+"""
+多操作批处理：按依赖顺序提交，失败时通过补偿操作回滚
+"""
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+from .base import BATCH_CHUNK_SIZE
+from .buffer import BATCH_ENDPOINTS, BufferItem, _item_key
+from .project import PROJECT_FIELDS
+from ..utils.ids import generate_id
+
+if TYPE_CHECKING:
+    from ..client import DidaClient
+
+# 提交顺序：先创建/更新项目和标签，再处理任务，最后删除不再被任务引用的标签和项目
+PHASES = (
+    ('project', ('add', 'update')),
+    ('tag', ('add', 'update')),
+    ('task', ('add', 'update', 'delete')),
+    ('tag', ('delete',)),
+    ('project', ('delete',)),
+)
+
+
+class _Operation:
+    """批处理中的一个操作"""
+
+    __slots__ = ('entity', 'action', 'item', 'previous', 'result')
+
+    def __init__(self, entity: str, action: str, item: BufferItem, previous: Optional[Dict[str, Any]] = None):
+        self.entity = entity
+        self.action = action
+        self.item = item
+        self.previous = previous  # 操作前的数据，用于生成补偿操作
+        self.result: Optional[Dict[str, Any]] = None
+
+    def compensation(self) -> Optional[Tuple[str, BufferItem]]:
+        """撤销该操作的 (操作, 条目)，无法撤销时返回None"""
+        if self.action == 'add':
+            if self.entity == 'task':
+                return 'delete', {'taskId': self.item['id'], 'projectId': self.item.get('projectId')}
+            return 'delete', _item_key(self.entity, 'add', self.item)
+        if self.previous is None:
+            return None
+        if self.action == 'update':
+            if self.entity == 'task':
+                # 只恢复被修改的字段
+                restore = {'id': self.item['id'], 'projectId': self.item.get('projectId')}
+                restore.update((field, self.previous.get(field)) for field in self.item if field not in ('id', 'etag'))
+                return 'update', restore
+            return 'update', self.previous
+        if self.entity == 'task':
+            # isCompleted 是SDK添加的标记，etag 由服务端重新生成
+            return 'add', {k: v for k, v in self.previous.items() if k not in ('isCompleted', 'etag')}
+        return 'add', self.previous
+
+
+class Batch:
+    """
+    多操作批处理
+
+    在 with 块中收集项目、标签和任务的操作，退出时按依赖顺序提交：项目和标签的创建/更新在引用它们的任务之前，
+    删除标签和项目在任务之后。同类实体的创建、更新（和任务删除）合并在同一个批量请求中，请求数只与分块数有关。
+    任意一块失败（请求失败或有条目返回错误）时，已经生效的操作按相反顺序执行补偿操作：
+    创建的实体被删除，更新恢复为原来的字段值，删除的实体按原数据重新创建。
+
+    示例:
+        with client.batch() as batch:
+            project = batch.create_project("新项目")
+            batch.create_tag("重要")
+            batch.create_task("第一个任务", project_name="新项目", tag_names=["重要"])
+        print(batch.result['info'])
+    """
+
+    def __init__(self, client: 'DidaClient', chunk_size: int = BATCH_CHUNK_SIZE, max_retries: int = 2):
+        """
+        初始化批处理
+
+        Args:
+            client: 客户端
+            chunk_size: 每个请求最多包含的条目数
+            max_retries: 网络错误或服务端错误时每块最多重试次数
+        """
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.result: Optional[Dict[str, Any]] = None
+        self._operations: List[_Operation] = []
+        self._task_updates: List[Tuple[_Operation, Dict[str, Any]]] = []
+        self._new_projects: Dict[str, str] = {}
+        self._committed = False
+
+    def __enter__(self) -> 'Batch':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # with 块中出现异常时不提交任何操作
+        if exc_type is None and not self._committed:
+            self.commit()
+
+    def create_project(self, name: str, color: Optional[str] = None, group_id: Optional[str] = None,
+                       view_mode: str = "list") -> Dict[str, Any]:
+        """添加创建项目的操作，返回带有本地生成ID的项目数据"""
+        project = {k: v for k, v in {
+            "id": generate_id(), "name": name, "color": color, "groupId": group_id, "viewMode": view_mode,
+            "inAll": True, "sortOrder": 0, "sortType": "sortOrder", "isInbox": False
+        }.items() if v is not None}
+        self._new_projects[name] = project['id']
+        self._add('project', 'add', project)
+        return project
+
+    def update_project(self, project_id: str, **fields) -> None:
+        """添加更新项目的操作，参数与 update_project 相同"""
+        current = self._resolver().project(project_id)
+        if current is None:
+            raise ValueError(f"未找到ID为 '{project_id}' 的项目")
+        update_data = dict(current)
+        for option, value in fields.items():
+            if option not in PROJECT_FIELDS:
+                raise TypeError(f"不支持的项目字段: {option}")
+            if value is not None:
+                update_data[PROJECT_FIELDS[option]] = value
+        self._add('project', 'update', update_data, previous=dict(current))
+
+    def delete_project(self, project_id: str) -> None:
+        """添加删除项目的操作"""
+        current = self._resolver().project(project_id)
+        if current is None:
+            raise ValueError(f"未找到ID为 '{project_id}' 的项目")
+        self._add('project', 'delete', project_id, previous=dict(current))
+
+    def create_tag(self, name: str, color: Optional[str] = None, sort_order: int = 0,
+                   sort_type: str = "name") -> Dict[str, Any]:
+        """添加创建标签的操作"""
+        tag = {k: v for k, v in {
+            "name": name, "label": name, "color": color, "sortOrder": sort_order,
+            "sortType": sort_type, "parent": None, "type": 1
+        }.items() if v is not None}
+        self._add('tag', 'add', tag)
+        return tag
+
+    def update_tag(self, name: str, color: Optional[str] = None, sort_order: Optional[int] = None,
+                   sort_type: Optional[str] = None) -> None:
+        """添加更新标签的操作（重命名没有批量接口，请使用 TagAPI.update_tags）"""
+        current = self._resolver().tag(name)
+        if current is None:
+            raise ValueError(f"未找到名称为 '{name}' 的标签")
+        update_data = dict(current, name=name, label=name)
+        if color is not None:
+            update_data['color'] = color
+        if sort_order is not None:
+            update_data['sortOrder'] = sort_order
+        if sort_type is not None:
+            update_data['sortType'] = sort_type
+        self._add('tag', 'update', update_data, previous=dict(current))
+
+    def delete_tag(self, name: str) -> None:
+        """添加删除标签的操作"""
+        current = self._resolver().tag(name)
+        if current is None:
+            raise ValueError(f"未找到名称为 '{name}' 的标签")
+        self._add('tag', 'delete', name, previous=dict(current))
+
+    def create_task(self, title: str, project_name: Optional[str] = None, **options) -> Dict[str, Any]:
+        """
+        添加创建任务的操作，参数与 create_task 相同
+
+        project_name 可以是同一批处理中创建的项目。
+
+        Returns:
+            Dict[str, Any]: 带有本地生成ID的任务数据
+        """
+        project_id = None
+        if project_name:
+            project_id = self._new_projects.get(project_name) or self.client.tasks._resolve_project_id(project_name)
+            if project_id is None:
+                raise ValueError(f"未找到项目: {project_name}")
+        task = self.client.tasks._build_task_payload(title, project_id=project_id, **options)
+        self._add('task', 'add', task)
+        return task
+
+    def update_task(self, task_id: str, **fields) -> None:
+        """添加更新任务的操作，参数与 update_task 相同；提交时只发送发生变化的字段"""
+        operation = self._add('task', 'update', {'id': task_id})
+        self._task_updates.append((operation, fields))
+
+    def delete_task(self, task_id: str) -> None:
+        """添加删除任务的操作"""
+        self._add('task', 'delete', {'taskId': task_id})
+
+    def commit(self) -> Dict[str, Any]:
+        """
+        提交所有操作
+
+        Returns:
+            Dict[str, Any]: {"success", "info", "data"}，data 包含每个操作的结果 results、
+                是否已回滚 rolled_back 以及回滚失败的明细 rollback_errors
+        """
+        if self._committed:
+            raise RuntimeError("批处理已经提交")
+        self._committed = True
+
+        error = self._prepare_tasks()
+        if error is not None:
+            return self._finish(False, error, rolled_back=False, rollback_errors=[])
+
+        applied: List[_Operation] = []
+        for entity, actions in PHASES:
+            operations = [op for op in self._operations
+                          if op.entity == entity and op.action in actions and op.result is None]
+            failure = self._send(entity, operations, applied)
+            if failure is not None:
+                rollback_errors = self._rollback(applied)
+                for op in applied:
+                    op.result = dict(op.result, success=False, info="已回滚")
+                for op in self._operations:
+                    if op.result is None:
+                        op.result = {"success": False, "info": "未提交（批处理已回滚）", "data": op.item}
+                return self._finish(False, f"批处理失败并已回滚: {failure}", rolled_back=True,
+                                    rollback_errors=rollback_errors)
+        return self._finish(True, f"批处理成功，共 {len(self._operations)} 个操作", rolled_back=False,
+                            rollback_errors=[])
+
+    def _resolver(self):
+        return self.client.tasks._ensure_resolver()
+
+    def _add(self, entity: str, action: str, item: BufferItem,
+             previous: Optional[Dict[str, Any]] = None) -> _Operation:
+        if self._committed:
+            raise RuntimeError("批处理已经提交")
+        operation = _Operation(entity, action, item, previous)
+        self._operations.append(operation)
+        return operation
+
+    def _prepare_tasks(self) -> Optional[str]:
+        """读取被更新和删除的任务的当前数据（一次查询），生成只包含变化字段的更新和补偿数据"""
+        targets = [op for op in self._operations if op.entity == 'task' and op.action in ('update', 'delete')]
+        if not targets:
+            return None
+        ids = [op.item['id'] if op.action == 'update' else op.item['taskId'] for op in targets]
+        tasks_api = self.client.tasks
+        raw_tasks = {task['id']: task for task in tasks_api.query().with_ids(*ids)._execute(raw=True)}
+        missing = [task_id for task_id in ids if task_id not in raw_tasks]
+        if missing:
+            return f"未找到任务: {', '.join(missing)}"
+
+        for op in targets:
+            if op.action == 'delete':
+                op.previous = raw_tasks[op.item['taskId']]
+                op.item['projectId'] = op.previous.get('projectId')
+        for op, fields in self._task_updates:
+            raw = raw_tasks[op.item['id']]
+            fields = dict(fields)
+            project_id = None
+            project_name = fields.pop('project_name', None)
+            if project_name:
+                project_id = self._new_projects.get(project_name) or tasks_api._resolve_project_id(project_name)
+                if project_id is None:
+                    return f"未找到项目: {project_name}"
+            changes, _ = tasks_api._build_task_changes(tasks_api._simplify_task_data(raw),
+                                                       project_id=project_id, **fields)
+            op.previous = raw
+            op.item = dict({'id': raw['id'], 'projectId': raw.get('projectId')}, **changes)
+            if not changes:
+                op.result = {"success": True, "info": "无需更新", "data": op.item}
+        return None
+
+    def _send(self, entity: str, operations: List[_Operation], applied: List[_Operation]) -> Optional[str]:
+        """分块提交同一类实体的操作，生效的操作加入 applied；出现失败时返回错误信息"""
+        api = self.client.tasks
+        endpoint = BATCH_ENDPOINTS[entity]
+        for chunk in api._chunked(operations, self.chunk_size):
+            payload: Dict[str, List[BufferItem]] = {"add": [], "update": [], "delete": []}
+            for op in chunk:
+                payload[op.action].append(op.item)
+            try:
+                response = api._post_with_retry(endpoint, payload, self.max_retries)
+            except Exception as e:
+                for op in chunk:
+                    op.result = {"success": False, "info": f"批量请求失败: {str(e)}", "data": op.item}
+                return f"批量请求失败: {str(e)}"
+
+            id2error = response.get('id2error', {}) if isinstance(response, dict) else {}
+            failure = None
+            for op in chunk:
+                item_id = _item_key(entity, op.action, op.item)
+                if item_id in id2error:
+                    op.result = {"success": False, "info": f"操作失败: {id2error[item_id]}", "data": op.item}
+                    failure = failure or f"{item_id}: {id2error[item_id]}"
+                else:
+                    op.result = {"success": True, "info": "操作成功", "data": op.item}
+                    applied.append(op)
+            if failure is not None:
+                return failure
+        return None
+
+    def _rollback(self, applied: List[_Operation]) -> List[Dict[str, Any]]:
+        """按相反顺序执行补偿操作，返回无法回滚的操作"""
+        api = self.client.tasks
+        errors = []
+        # 与提交顺序相反：先撤销后执行的阶段
+        for entity, actions in reversed(PHASES):
+            compensations = []
+            for op in reversed(applied):
+                if op.entity != entity or op.action not in actions:
+                    continue
+                compensation = op.compensation()
+                if compensation is None:
+                    errors.append({"operation": op.action, "entity": entity, "data": op.item, "info": "无法回滚"})
+                else:
+                    compensations.append((op, compensation))
+            for chunk in api._chunked(compensations, self.chunk_size):
+                payload: Dict[str, List[BufferItem]] = {"add": [], "update": [], "delete": []}
+                for _, (action, item) in chunk:
+                    payload[action].append(item)
+                try:
+                    response = api._post_with_retry(BATCH_ENDPOINTS[entity], payload, self.max_retries)
+                except Exception as e:
+                    errors.extend({"operation": op.action, "entity": entity, "data": op.item,
+                                   "info": f"回滚失败: {str(e)}"} for op, _ in chunk)
+                    continue
+                id2error = response.get('id2error', {}) if isinstance(response, dict) else {}
+                for op, (action, item) in chunk:
+                    item_id = _item_key(entity, action, item)
+                    if item_id in id2error:
+                        errors.append({"operation": op.action, "entity": entity, "data": op.item,
+                                       "info": f"回滚失败: {id2error[item_id]}"})
+        return errors
+
+    def _finish(self, success: bool, info: str, rolled_back: bool,
+                rollback_errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if success:
+            self._apply_to_resolver()
+        for op in self._operations:
+            if op.result is None:
+                op.result = {"success": False, "info": "未提交", "data": op.item}
+        self.result = {
+            "success": success,
+            "info": info,
+            "data": {
+                "results": [op.result for op in self._operations],
+                "rolled_back": rolled_back,
+                "rollback_errors": rollback_errors,
+            }
+        }
+        return self.result
+
+    def _apply_to_resolver(self) -> None:
+        """提交成功后更新名称解析缓存"""
+        resolver = self.client.resolver
+        for op in self._operations:
+            if op.entity == 'project':
+                if op.action == 'delete':
+                    resolver.remove_project(op.item)
+                else:
+                    resolver.put_project(op.item)
+            elif op.entity == 'tag':
+                if op.action == 'delete':
+                    resolver.remove_tag(op.item)
+                else:
+                    resolver.put_tag(op.item)
@@ -0,0 +1,286 @@
+"""
+写缓冲，合并短时间内的多次修改后批量提交
+"""
+from typing import Dict, Any, List, Optional, Union
+from concurrent.futures import Future
+import threading
+import time
+from .base import BaseAPI, BATCH_CHUNK_SIZE
+
+# 各类实体对应的批量接口，按提交顺序排列：任务可能引用同一次提交中创建的项目和标签
+BATCH_ENDPOINTS = {
+    'project': '/api/v2/batch/project',
+    'tag': '/api/v2/batch/tag',
+    'task': '/api/v2/batch/task',
+}
+
+BufferItem = Union[Dict[str, Any], str]
+
+
+def _item_key(entity: str, action: str, item: BufferItem) -> str:
+    """取出条目对应的实体标识，用于合并和匹配 id2etag/id2error"""
+    if isinstance(item, str):
+        return item
+    if entity == 'task' and action == 'delete':
+        return item['taskId']
+    if entity == 'tag':
+        return item['name']
+    return item['id']
+
+
+class _Entry:
+    """缓冲中的一次待提交操作，可能由多次修改合并而来"""
+
+    __slots__ = ('entity', 'action', 'item', 'futures')
+
+    def __init__(self, entity: str, action: str, item: BufferItem, future: Future):
+        self.entity = entity
+        self.action = action
+        self.item = item
+        self.futures = [future]
+
+    def resolve(self, result: Dict[str, Any]) -> None:
+        for future in self.futures:
+            if not future.done():
+                future.set_result(result)
+
+
+class WriteBuffer:
+    """
+    任务、项目和标签修改的写缓冲
+
+    修改先放入缓冲并立即返回 Future，缓冲在等待时间到达或条目数达到上限时由后台线程提交，
+    每类实体一次请求（超过 chunk_size 时分块），按项目、标签、任务的顺序提交。同一实体的多次修改会被合并：
+
+    - 多次 update 合并为一次，后面的字段覆盖前面的
+    - add 之后的 update 合并进 add
+    - update 之后的 delete 只提交 delete
+    - add 之后的 delete 互相抵消，不会发送请求
+    - delete 之后再 add/update 同一实体时，先提交已缓冲的修改，保证顺序
+
+    每个 Future 的结果为 {"success", "info", "data"}，合并后的修改共享同一个结果。
+    项目和标签的修改提交成功后会同步更新API实例共享的名称解析缓存。
+
+    写缓冲是底层接口，条目为批量接口的原始格式：启用后 TaskAPI/ProjectAPI/TagAPI 的方法
+    （create_task、update_project 等）仍然直接发送请求，需要缓冲的修改应通过本类的方法提交。
+
+    示例:
+        buffer = client.enable_write_buffer(window=0.5)
+        future = buffer.update_task({"id": task_id, "projectId": project_id, "status": 2})
+        buffer.update_task({"id": task_id, "projectId": project_id, "title": "新标题"})
+        print(future.result())
+    """
+
+    def __init__(self, api: BaseAPI, window: float = 0.5, max_size: int = BATCH_CHUNK_SIZE,
+                 chunk_size: int = BATCH_CHUNK_SIZE, max_retries: int = 2):
+        """
+        初始化写缓冲
+
+        Args:
+            api: 用于发送请求的API实例
+            window: 第一条修改进入缓冲后最多等待的秒数
+            max_size: 缓冲的条目数达到该值时立即提交
+            chunk_size: 每个请求最多包含的条目数
+            max_retries: 网络错误或服务端错误时每块最多重试次数
+        """
+        self.api = api
+        self.window = window
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self._pending: Dict[tuple, _Entry] = {}
+        self._deadline: Optional[float] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name='dida-write-buffer', daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        """缓冲中待提交的条目数"""
+        return len(self._pending)
+
+    def __enter__(self) -> 'WriteBuffer':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_task(self, task: Dict[str, Any]) -> Future:
+        """缓冲创建任务，任务数据需包含本地生成的 id"""
+        return self.submit('task', 'add', task)
+
+    def update_task(self, task: Dict[str, Any]) -> Future:
+        """缓冲更新任务，任务数据需包含 id 和 projectId，只需包含要修改的字段"""
+        return self.submit('task', 'update', task)
+
+    def delete_task(self, task_id: str, project_id: str) -> Future:
+        """缓冲删除任务"""
+        return self.submit('task', 'delete', {'taskId': task_id, 'projectId': project_id})
+
+    def add_project(self, project: Dict[str, Any]) -> Future:
+        """缓冲创建项目，项目数据需包含本地生成的 id"""
+        return self.submit('project', 'add', project)
+
+    def update_project(self, project: Dict[str, Any]) -> Future:
+        """缓冲更新项目，项目数据需包含 id"""
+        return self.submit('project', 'update', project)
+
+    def delete_project(self, project_id: str) -> Future:
+        """缓冲删除项目"""
+        return self.submit('project', 'delete', project_id)
+
+    def add_tag(self, tag: Dict[str, Any]) -> Future:
+        """缓冲创建标签，标签数据需包含 name"""
+        return self.submit('tag', 'add', tag)
+
+    def update_tag(self, tag: Dict[str, Any]) -> Future:
+        """缓冲更新标签，标签数据需包含 name"""
+        return self.submit('tag', 'update', tag)
+
+    def delete_tag(self, tag_name: str) -> Future:
+        """缓冲删除标签"""
+        return self.submit('tag', 'delete', tag_name)
+
+    def submit(self, entity: str, action: str, item: BufferItem) -> Future:
+        """
+        将一次修改放入缓冲
+
+        Args:
+            entity: "task"、"project" 或 "tag"
+            action: "add"、"update" 或 "delete"
+            item: 批量接口中的条目
+
+        Returns:
+            Future: 提交完成后得到 {"success", "info", "data"}
+        """
+        if entity not in BATCH_ENDPOINTS:
+            raise ValueError(f"不支持的实体类型: {entity}")
+        if action not in ('add', 'update', 'delete'):
+            raise ValueError(f"不支持的操作: {action}")
+        key = (entity, _item_key(entity, action, item))
+        future: Future = Future()
+
+        while True:
+            with self._lock:
+                if not self._running:
+                    raise RuntimeError("写缓冲已关闭")
+                existing = self._pending.get(key)
+                if existing is not None and existing.action == 'delete' and action != 'delete':
+                    needs_flush = True
+                else:
+                    needs_flush = False
+                    self._merge(key, existing, entity, action, item, future)
+                    if self._deadline is None:
+                        self._deadline = time.monotonic() + self.window
+                    self._wakeup.notify_all()
+                    break
+            if needs_flush:
+                # 已缓冲删除的实体再次被创建或修改，先提交删除
+                self.flush()
+        return future
+
+    def flush(self) -> None:
+        """立即提交缓冲中的所有修改，并等待提交完成"""
+        with self._flush_lock:
+            with self._lock:
+                entries = list(self._pending.values())
+                self._pending.clear()
+                self._deadline = None
+            by_entity: Dict[str, List[_Entry]] = {}
+            for entry in entries:
+                by_entity.setdefault(entry.entity, []).append(entry)
+            # 按固定顺序提交：先项目、再标签、最后任务
+            for entity in BATCH_ENDPOINTS:
+                if entity in by_entity:
+                    self._send(entity, by_entity[entity])
+
+    def close(self) -> None:
+        """提交剩余修改并停止后台线程"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._wakeup.notify_all()
+        self._thread.join()
+        self.flush()
+
+    def _merge(self, key: tuple, existing: Optional[_Entry], entity: str, action: str,
+               item: BufferItem, future: Future) -> None:
+        """将修改合并进缓冲（需持有锁）"""
+        if existing is None:
+            self._pending[key] = _Entry(entity, action, item, future)
+            return
+        if action == 'delete':
+            if existing.action == 'add':
+                # 尚未提交的创建和删除互相抵消
+                del self._pending[key]
+                result = {"success": True, "info": "创建后即被删除，未提交", "data": item}
+                existing.resolve(result)
+                future.set_result(result)
+                return
+            existing.action = 'delete'
+            existing.item = item
+        elif existing.action in ('add', 'update'):
+            existing.item = dict(existing.item, **item)
+        else:
+            existing.action = action
+            existing.item = item
+        existing.futures.append(future)
+
+    def _loop(self) -> None:
+        """后台线程：等待时间到达或条目数达到上限时提交"""
+        while True:
+            with self._lock:
+                if not self._running:
+                    return
+                if self._deadline is None:
+                    self._wakeup.wait()
+                    continue
+                timeout = self._deadline - time.monotonic()
+                if timeout > 0 and len(self._pending) < self.max_size:
+                    self._wakeup.wait(timeout)
+                    continue
+            self.flush()
+
+    def _send(self, entity: str, entries: List[_Entry]) -> None:
+        """提交同一类实体的修改，每块一个请求"""
+        endpoint = BATCH_ENDPOINTS[entity]
+        for chunk in self.api._chunked(entries, self.chunk_size):
+            payload: Dict[str, List[BufferItem]] = {"add": [], "update": [], "delete": []}
+            for entry in chunk:
+                payload[entry.action].append(entry.item)
+            try:
+                response = self.api._post_with_retry(endpoint, payload, self.max_retries)
+            except Exception as e:
+                for entry in chunk:
+                    entry.resolve({"success": False, "info": f"批量请求失败: {str(e)}", "data": entry.item})
+                continue
+
+            id2etag = response.get('id2etag', {}) if isinstance(response, dict) else {}
+            id2error = response.get('id2error', {}) if isinstance(response, dict) else {}
+            for entry in chunk:
+                item_id = _item_key(entity, entry.action, entry.item)
+                if item_id in id2error:
+                    entry.resolve({"success": False, "info": f"操作失败: {id2error[item_id]}", "data": entry.item})
+                    continue
+                data = entry.item
+                if isinstance(data, dict) and id2etag.get(item_id):
+                    data = dict(data, etag=id2etag[item_id])
+                self._update_resolver(entity, entry.action, item_id, data)
+                entry.resolve({"success": True, "info": "操作成功", "data": data})
+
+    def _update_resolver(self, entity: str, action: str, item_id: str, data: BufferItem) -> None:
+        """提交成功的项目和标签修改同步到名称解析缓存"""
+        resolver = self.api.resolver
+        if entity == 'project':
+            if action == 'delete':
+                resolver.remove_project(item_id)
+            else:
+                resolver.put_project(data)
+        elif entity == 'tag':
+            if action == 'delete':
+                resolver.remove_tag(item_id)
+            else:
+                resolver.put_tag(data)
@@ -2,9 +2,30 @@
 项目相关API
 """
 from typing import List, Optional, Dict, Any
-from .base import BaseAPI
+from .base import BaseAPI, BATCH_CHUNK_SIZE
 from datetime import datetime
 import pytz
+from ..utils.ids import generate_id
+
+# update_project 的参数名与项目数据字段的对应关系
+PROJECT_FIELDS = {
+    'name': 'name',
+    'color': 'color',
+    'group_id': 'groupId',
+    'view_mode': 'viewMode',
+    'sort_order': 'sortOrder',
+    'sort_type': 'sortType',
+    'sort_option': 'sortOption',
+    'timeline': 'timeline',
+    'team_id': 'teamId',
+    'permission': 'permission',
+    'kind': 'kind',
+    'need_audit': 'needAudit',
+    'barcode_need_audit': 'barcodeNeedAudit',
+    'open_to_team': 'openToTeam',
+    'team_member_permission': 'teamMemberPermission',
+    'notification_options': 'notificationOptions',
+}
 
 class ProjectAPI(BaseAPI):
     """项目相关的API实现"""
@@ -23,10 +44,16 @@ class ProjectAPI(BaseAPI):
         Returns:
             List[Dict[str, Any]]: 项目列表
         """
-        response = self._get("/api/v2/batch/check/0")
+        response = self._fetch_sync()
         projects_data = response.get('projectProfiles', [])
         tasks_data = response.get('syncTaskBean', {}).get('update', [])
         
+        # 一次遍历按项目分组任务，避免为每个项目扫描全部任务
+        tasks_by_project: Dict[str, List[Dict[str, Any]]] = {}
+        if include_tasks:
+            for task in tasks_data:
+                tasks_by_project.setdefault(task.get('projectId'), []).append(task)
+        
         # 处理项目数据
         result = []
         for project in projects_data:
@@ -45,11 +72,7 @@ class ProjectAPI(BaseAPI):
                 
                 # 添加任务列表（如果需要）
                 if include_tasks:
-                    project_tasks = [
-                        task for task in tasks_data
-                        if task.get('projectId') == project['id']
-                    ]
-                    project_data['tasks'] = project_tasks
+                    project_data['tasks'] = tasks_by_project.get(project['id'], [])
                     
                 result.append(project_data)
                 
@@ -72,6 +95,8 @@ class ProjectAPI(BaseAPI):
             Dict[str, Any]: 创建的项目数据
         """
         project_data = {
+            # ID在本地生成，创建请求可以安全重试
+            "id": generate_id(),
             "name": name,
             "color": color,
             "groupId": group_id,
@@ -86,6 +111,8 @@ class ProjectAPI(BaseAPI):
         project_data = {k: v for k, v in project_data.items() if v is not None}
         
         response = self._post("/api/v2/project", data=project_data)
+        if isinstance(response, dict) and response.get('id'):
+            self.resolver.put_project(response)
         return response
 
     def get_project(self, project_id: str) -> Optional[Dict[str, Any]]:
@@ -138,16 +165,8 @@ class ProjectAPI(BaseAPI):
         Returns:
             Dict[str, Any]: 更新结果
         """
-        # 获取所有项目信息
-        response = self._get("/api/v2/batch/check/0")
-        projects = response.get('projectProfiles', [])
-        
-        # 查找当前项目
-        current_project = None
-        for project in projects:
-            if project['id'] == project_id:
-                current_project = project
-                break
+        # 从名称解析缓存中查找当前项目
+        current_project = self._ensure_resolver().project(project_id)
                 
         if not current_project:
             return {
@@ -203,6 +222,7 @@ class ProjectAPI(BaseAPI):
         try:
             # 发送批量更新请求
             response = self._post("/api/v2/batch/project", data=batch_data)
+            self.resolver.put_project(update_data)
             return {
                 "success": True,
                 "info": "项目更新成功",
@@ -226,16 +246,8 @@ class ProjectAPI(BaseAPI):
             Dict[str, Any]: 删除操作的结果
         """
         try:
-            # 获取所有项目信息
-            response = self._get("/api/v2/batch/check/0")
-            projects = response.get('projectProfiles', [])
-            
-            # 查找当前项目
-            current_project = None
-            for project in projects:
-                if project['id'] == project_id:
-                    current_project = project
-                    break
+            # 从名称解析缓存中查找当前项目
+            current_project = self._ensure_resolver().project(project_id)
                     
             if not current_project:
                 return {
@@ -253,6 +265,7 @@ class ProjectAPI(BaseAPI):
             
             # 发送批量删除请求
             response = self._post("/api/v2/batch/project", data=batch_data)
+            self.resolver.remove_project(project_id)
             
             return {
                 "success": True,
@@ -266,6 +279,131 @@ class ProjectAPI(BaseAPI):
                 "data": None
             }
 
+    def create_projects(self, projects: List[Dict[str, Any]], chunk_size: int = BATCH_CHUNK_SIZE,
+                        max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量创建项目，通过 /api/v2/batch/project 分块提交
+
+        Args:
+            projects: 项目列表，每个元素的键与 create_project 的参数相同，例如
+                      {"name": "工作", "color": "#FF0000", "view_mode": "kanban"}，
+                      可以通过 "id" 指定预先生成的项目ID
+            chunk_size: 每个请求最多包含的项目数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一一对应的结果，每项为 {"success", "info", "data"}，
+                成功时 data 为创建的项目数据（包含ID）
+        """
+        payloads = []
+        for project in projects:
+            project_data = {
+                # 批量接口需要客户端生成ID，可以通过 id 预先指定
+                "id": project.get('id') or generate_id(),
+                "name": project['name'],
+                "color": project.get('color'),
+                "groupId": project.get('group_id'),
+                "viewMode": project.get('view_mode', "list"),
+                "inAll": True,
+                "sortOrder": 0,
+                "sortType": "sortOrder",
+                "isInbox": project.get('is_inbox', False)
+            }
+            payloads.append({k: v for k, v in project_data.items() if v is not None})
+
+        results = self._post_batch("/api/v2/batch/project", "add", payloads, key=lambda item: item['id'],
+                                   chunk_size=chunk_size, max_retries=max_retries)
+        return [self._project_batch_result(result, "项目创建成功") for result in results]
+
+    def update_projects(self, changes: List[Dict[str, Any]], chunk_size: int = BATCH_CHUNK_SIZE,
+                        max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量更新项目，通过 /api/v2/batch/project 分块提交
+
+        当前项目数据从名称解析缓存中读取，没有实际变化的项目不会提交。
+
+        Args:
+            changes: 变更列表，每个元素包含项目 "id"，其余键与 update_project 的参数相同，例如
+                     {"id": "67c5c01e6f3a314670cbebb6", "name": "新名称", "color": "#00FF00"}
+            chunk_size: 每个请求最多包含的项目数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一一对应的结果，每项为 {"success", "info", "data"}
+        """
+        resolver = self._ensure_resolver()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(changes)
+        pending = []
+        for position, change in enumerate(changes):
+            current_project = resolver.project(change['id'])
+            if current_project is None:
+                results[position] = {"success": False, "info": f"未找到ID为 '{change['id']}' 的项目", "data": None}
+                continue
+            update_data = dict(current_project)
+            for option, field in PROJECT_FIELDS.items():
+                if change.get(option) is not None:
+                    update_data[field] = change[option]
+            if update_data == current_project:
+                results[position] = {"success": True, "info": "无需更新", "data": current_project}
+            else:
+                pending.append((position, update_data))
+
+        batch_results = self._post_batch("/api/v2/batch/project", "update", [item for _, item in pending],
+                                         key=lambda item: item['id'], chunk_size=chunk_size,
+                                         max_retries=max_retries)
+        for (position, _), result in zip(pending, batch_results):
+            results[position] = self._project_batch_result(result, "项目更新成功")
+        return results
+
+    def delete_projects(self, project_ids: List[str], chunk_size: int = BATCH_CHUNK_SIZE,
+                        max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量删除项目，通过 /api/v2/batch/project 分块提交
+
+        Args:
+            project_ids: 项目ID列表
+            chunk_size: 每个请求最多包含的项目数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一一对应的结果，每项为 {"success", "info", "data"}，data 为被删除的项目
+        """
+        resolver = self._ensure_resolver()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(project_ids)
+        pending = []
+        for position, project_id in enumerate(project_ids):
+            project = resolver.project(project_id)
+            if project is None:
+                results[position] = {"success": False, "info": f"未找到ID为 '{project_id}' 的项目", "data": None}
+            else:
+                pending.append((position, project))
+
+        batch_results = self._post_batch("/api/v2/batch/project", "delete", [project['id'] for _, project in pending],
+                                         key=lambda project_id: project_id, chunk_size=chunk_size,
+                                         max_retries=max_retries)
+        for (position, project), result in zip(pending, batch_results):
+            if result['success']:
+                resolver.remove_project(project['id'])
+            results[position] = {
+                "success": result['success'],
+                "info": f"成功删除项目 '{project.get('name', project['id'])}'" if result['success'] else result['info'],
+                "data": project
+            }
+        return results
+
+    def _project_batch_result(self, result: Dict[str, Any], success_info: str) -> Dict[str, Any]:
+        """将批量接口的单条结果转换为 {"success", "info", "data"} 格式，成功时同步更新名称解析缓存"""
+        data = dict(result['data'])
+        if result['etag']:
+            data['etag'] = result['etag']
+        if result['success']:
+            self.resolver.put_project(data)
+        return {
+            "success": result['success'],
+            "info": success_info if result['success'] else result['info'],
+            "data": data
+        }
+
     def get_project_tasks(self, project_id: str) -> List[Dict[str, Any]]:
         """
         获取项目下的所有任务
@@ -276,7 +414,7 @@ class ProjectAPI(BaseAPI):
         Returns:
             List[Dict[str, Any]]: 任务列表
         """
-        response = self._get("/api/v2/batch/check/0")
+        response = self._fetch_sync()
         tasks_data = response.get('syncTaskBean', {}).get('update', [])
         return [
             task for task in tasks_data
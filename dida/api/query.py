@@ -0,0 +1,432 @@
+"""
+任务查询构建器，支持惰性的链式查询
+"""
+from typing import List, Optional, Dict, Any, Callable, Iterator, Iterable, Union, TYPE_CHECKING
+from datetime import datetime
+import heapq
+
+if TYPE_CHECKING:
+    from .tasks import TaskAPI
+
+# 简化前后含义一致的字段，可以直接在原始任务数据上判断，避免不必要的简化开销
+RAW_FIELDS = {
+    'id', 'title', 'content', 'priority', 'status', 'projectId', 'columnId',
+    'kind', 'parentId', 'isAllDay', 'etag', 'sortOrder', 'progress', 'repeatFlag'
+}
+
+
+def select_fields(task: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """只保留任务中的指定字段，任务中不存在的字段会被忽略"""
+    return {field: task[field] for field in fields if field in task}
+
+
+class TaskQuery:
+    """
+    惰性的链式任务查询
+
+    每个链式方法都会返回新的查询对象，原查询保持不变，因此查询可以自由组合复用。
+    只有在迭代结果时才会请求数据，执行前会根据条件生成执行计划：
+
+    - 未完成任务来自一次同步请求，已完成任务需要按项目单独请求，
+      只有查询可能包含已完成任务时才会请求，并且只请求相关项目
+    - 能在原始数据上判断的条件会在简化任务数据之前执行
+    - 没有排序时结果以流的方式产出，达到 limit 后立即停止，不再请求剩余项目
+    - select() 限定字段时只计算需要的字段，raw() 时完全跳过简化
+
+    示例:
+        query = client.tasks.query().in_project("工作").completed(False)
+        for task in query.with_tags("重要").order_by("dueDate").limit(10):
+            print(task['title'])
+    """
+
+    def __init__(self, api: 'TaskAPI'):
+        """
+        初始化查询
+
+        Args:
+            api: 任务API实例
+        """
+        self._api = api
+        self._projects: List[str] = []
+        self._tags: List[str] = []
+        self._match_all_tags = False
+        self._due_range: Optional[tuple] = None
+        self._completed: Optional[bool] = None
+        self._ids: Optional[set] = None
+        self._conditions: Dict[str, Any] = {}
+        self._predicates: List[Callable[[Dict[str, Any]], bool]] = []
+        self._order: List[tuple] = []
+        self._limit: Optional[int] = None
+        self._fields: Optional[tuple] = None
+        self._raw = False
+
+    def _clone(self) -> 'TaskQuery':
+        """复制当前查询，保证链式调用不修改原查询"""
+        query = TaskQuery(self._api)
+        query._projects = list(self._projects)
+        query._tags = list(self._tags)
+        query._match_all_tags = self._match_all_tags
+        query._due_range = self._due_range
+        query._completed = self._completed
+        query._ids = set(self._ids) if self._ids is not None else None
+        query._conditions = dict(self._conditions)
+        query._predicates = list(self._predicates)
+        query._order = list(self._order)
+        query._limit = self._limit
+        query._fields = self._fields
+        query._raw = self._raw
+        return query
+
+    def where(self, predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+              **conditions) -> 'TaskQuery':
+        """
+        添加筛选条件
+
+        Args:
+            predicate: 自定义判断函数，参数为简化后的任务数据
+            **conditions: 字段等值条件，如 priority=5, status=0
+
+        Returns:
+            TaskQuery: 新的查询对象
+        """
+        query = self._clone()
+        if predicate is not None:
+            query._predicates.append(predicate)
+        query._conditions.update(conditions)
+        return query
+
+    def with_ids(self, *task_ids: str) -> 'TaskQuery':
+        """
+        限定任务ID，多次调用时取交集
+
+        找到全部指定任务后立即停止，所有任务都在未完成任务中时不会请求已完成任务。
+
+        Args:
+            *task_ids: 任务ID
+
+        Returns:
+            TaskQuery: 新的查询对象
+        """
+        query = self._clone()
+        ids = set(task_ids)
+        query._ids = ids if query._ids is None else query._ids & ids
+        return query
+
+    def in_project(self, *projects: str) -> 'TaskQuery':
+        """
+        限定项目，多个项目之间为或关系
+
+        Args:
+            *projects: 项目名称或项目ID
+
+        Returns:
+            TaskQuery: 新的查询对象
+        """
+        query = self._clone()
+        query._projects.extend(projects)
+        return query
+
+    def with_tags(self, *tags: str, match_all: bool = False) -> 'TaskQuery':
+        """
+        限定标签
+
+        Args:
+            *tags: 标签名称
+            match_all: True表示必须包含所有标签，False表示包含任意一个即可
+
+        Returns:
+            TaskQuery: 新的查询对象
+        """
+        query = self._clone()
+        query._tags.extend(tags)
+        query._match_all_tags = match_all
+        return query
+
+    def due_between(self, start: Optional[Union[str, datetime]] = None,
+                    end: Optional[Union[str, datetime]] = None) -> 'TaskQuery':
+        """
+        限定截止时间范围（包含边界），没有截止时间的任务会被排除
+
+        Args:
+            start: 开始时间，datetime对象或 "YYYY-MM-DD HH:MM:SS"/"YYYY-MM-DD" 格式的字符串
+            end: 结束时间，格式同上；只有日期时包含当天全天
+
+        Returns:
+            TaskQuery: 新的查询对象
+        """
+        query = self._clone()
+        query._due_range = (self._to_utc_key(start), self._to_utc_key(end, end_of_day=True))
+        return query
+
+    def completed(self, flag: Optional[bool] = True) -> 'TaskQuery':
+        """
+        限定完成状态
+
+        Args:
+            flag: True只查已完成，False只查未完成，None不限
+
+        Returns:
+            TaskQuery: 新的查询对象
+        """
+        query = self._clone()
+        query._completed = flag
+        return query
+
+    def select(self, *fields: str) -> 'TaskQuery':
+        """
+        只返回指定字段，只计算需要的字段（例如不需要时间字段就不做时区换算）
+
+        筛选条件和排序仍然使用完整数据，不受影响。
+
+        Args:
+            *fields: 字段名，如 "id", "title", "dueDate", "status"
+
+        Returns:
+            TaskQuery: 新的查询对象
+        """
+        query = self._clone()
+        query._fields = fields
+        return query
+
+    def raw(self, flag: bool = True) -> 'TaskQuery':
+        """
+        返回原始任务数据（API格式），没有需要简化后判断的条件时完全跳过简化
+
+        Args:
+            flag: 是否返回原始数据
+
+        Returns:
+            TaskQuery: 新的查询对象
+        """
+        query = self._clone()
+        query._raw = flag
+        return query
+
+    def order_by(self, field: str, descending: bool = False) -> 'TaskQuery':
+        """
+        添加排序字段，多次调用时按调用顺序依次比较，空值总是排在最后
+
+        Args:
+            field: 简化后任务数据中的字段名，如 dueDate, priority
+            descending: 是否降序
+
+        Returns:
+            TaskQuery: 新的查询对象
+        """
+        query = self._clone()
+        query._order.append((field, descending))
+        return query
+
+    def limit(self, n: int) -> 'TaskQuery':
+        """
+        限制返回数量
+
+        Args:
+            n: 最多返回的任务数
+
+        Returns:
+            TaskQuery: 新的查询对象
+        """
+        query = self._clone()
+        query._limit = n
+        return query
+
+    def explain(self) -> Dict[str, Any]:
+        """
+        返回执行计划，不会发起任何请求
+
+        Returns:
+            Dict[str, Any]: 执行计划
+        """
+        raw_conditions, task_conditions = self._split_conditions()
+        raw_filters = []
+        if self._ids is not None:
+            raw_filters.append('id')
+        if self._projects:
+            raw_filters.append('project')
+        if self._completed is not None:
+            raw_filters.append('completed')
+        raw_filters.extend(raw_conditions)
+        if self._tags:
+            raw_filters.append('tags')
+        if self._due_range:
+            raw_filters.append('dueDate')
+
+        sources = ['sync']
+        if self._completed is not False:
+            sources.append('completed')
+
+        return {
+            'sources': sources,
+            'completed_projects': (list(self._projects) or 'all') if self._completed is not False else None,
+            'raw_filters': raw_filters,
+            'task_filters': list(task_conditions) + ['predicate'] * len(self._predicates),
+            'order_by': list(self._order),
+            'limit': self._limit,
+            'streaming': not self._order,
+            'stops_early': self._ids is not None,
+            'fields': list(self._fields) if self._fields is not None else None,
+            'raw': self._raw,
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """惰性执行查询"""
+        if self._order:
+            # 排序字段可能不在返回的字段中，排序后再裁剪
+            results = self._sorted(self._execute(raw=self._raw))
+            if self._fields is not None:
+                results = (select_fields(task, self._fields) for task in results)
+            return results
+        results = self._execute(raw=self._raw, fields=self._fields)
+        if self._limit is not None:
+            results = self._take(results, self._limit)
+        return results
+
+    def all(self) -> List[Dict[str, Any]]:
+        """执行查询并返回列表"""
+        return list(self)
+
+    def first(self) -> Optional[Dict[str, Any]]:
+        """返回第一个结果，没有结果时返回None"""
+        return next(iter(self.limit(1)), None)
+
+    def count(self) -> int:
+        """返回结果数量"""
+        return sum(1 for _ in self)
+
+    def _to_utc_key(self, value: Optional[Union[str, datetime]], end_of_day: bool = False) -> Optional[str]:
+        """将时间边界转换为可直接与原始UTC时间字符串比较的格式，end_of_day 时只有日期的边界取当天最后一秒"""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            date_only = len(value) == 10
+            value = datetime.strptime(value, "%Y-%m-%d" if date_only else "%Y-%m-%d %H:%M:%S")
+            if date_only and end_of_day:
+                value = value.replace(hour=23, minute=59, second=59)
+        converted = self._api._convert_date_format(date_obj=value)
+        return converted[:19] if converted else None
+
+    def _split_conditions(self) -> tuple:
+        """把等值条件拆分为原始数据上可判断的和需要简化后判断的两部分"""
+        raw = {k: v for k, v in self._conditions.items() if k in RAW_FIELDS}
+        task = {k: v for k, v in self._conditions.items() if k not in RAW_FIELDS}
+        return raw, task
+
+    def _resolve_projects(self, projects: List[Dict[str, Any]]) -> Optional[set]:
+        """将项目名称或ID解析为项目ID集合，未限定项目时返回None"""
+        if not self._projects:
+            return None
+        name_to_id = {project.get('name'): project['id'] for project in projects}
+        # 不是已知项目名称的值按项目ID处理（例如不在项目列表中的收集箱ID）
+        return {name_to_id.get(project, project) for project in self._projects}
+
+    def _match_raw(self, task: Dict[str, Any], project_ids: Optional[set],
+                   raw_conditions: Dict[str, Any]) -> bool:
+        """在原始任务数据上执行低成本的筛选"""
+        if self._ids is not None and task.get('id') not in self._ids:
+            return False
+        if project_ids is not None and task.get('projectId') not in project_ids:
+            return False
+        if self._completed is not None and self._api._is_task_completed(task) != self._completed:
+            return False
+        for key, value in raw_conditions.items():
+            if task.get(key) != value:
+                return False
+        if self._tags:
+            task_tags = task.get('tags') or []
+            if self._match_all_tags:
+                if not all(tag in task_tags for tag in self._tags):
+                    return False
+            elif not any(tag in task_tags for tag in self._tags):
+                return False
+        if self._due_range:
+            due = task.get('dueDate')
+            if not due:
+                return False
+            due = due[:19]
+            start, end = self._due_range
+            if (start and due < start) or (end and due > end):
+                return False
+        return True
+
+    def _execute(self, raw: bool = False, fields: Optional[tuple] = None) -> Iterator[Dict[str, Any]]:
+        """
+        按执行计划逐个产出匹配的任务
+
+        Args:
+            raw: 是否产出原始任务数据（API格式），而不是简化后的任务数据
+            fields: 只产出这些字段
+        """
+        api = self._api
+        response = api._fetch_sync()
+        projects = response.get('projectProfiles', [])
+        tags = response.get('tags', [])
+
+        project_ids = self._resolve_projects(projects)
+        raw_conditions, task_conditions = self._split_conditions()
+        # 限定ID时记录尚未找到的任务，全部找到后不再读取后续数据源
+        remaining = set(self._ids) if self._ids is not None else None
+        if remaining is not None and not remaining:
+            return
+
+        def sources() -> Iterator[Dict[str, Any]]:
+            yield from api._iter_uncompleted_raw(response)
+            if self._completed is not False:
+                completed_projects = [
+                    project['id'] for project in projects
+                    if project_ids is None or project['id'] in project_ids
+                ]
+                yield from api._iter_completed_raw(completed_projects)
+
+        # 需要在简化后的完整数据上判断的条件
+        needs_task = bool(task_conditions or self._predicates)
+        project_table, tag_table = api._snapshot_tables(projects, tags)
+
+        for item in sources():
+            if remaining is not None:
+                remaining.discard(item.get('id'))
+            if self._match_raw(item, project_ids, raw_conditions):
+                if not needs_task:
+                    if raw:
+                        yield item if fields is None else select_fields(item, fields)
+                    else:
+                        # 没有简化后的条件时只计算需要的字段
+                        yield api._prepare_task(item, project_table, tag_table, fields)
+                else:
+                    task = api._prepare_task(dict(item) if raw else item, project_table, tag_table)
+                    if (all(task.get(key) == value for key, value in task_conditions.items())
+                            and all(predicate(task) for predicate in self._predicates)):
+                        result = item if raw else task
+                        yield result if fields is None else select_fields(result, fields)
+            if remaining is not None and not remaining:
+                return
+
+    @staticmethod
+    def _take(results: Iterator[Dict[str, Any]], n: int) -> Iterator[Dict[str, Any]]:
+        """最多产出n个结果，达到数量后不再消费上游"""
+        if n <= 0:
+            return
+        for index, task in enumerate(results, 1):
+            yield task
+            if index >= n:
+                return
+
+    def _sorted(self, results: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """按排序字段输出结果，只取前n个时使用堆避免全量排序"""
+        def key_for(field: str, descending: bool) -> Callable[[Dict[str, Any]], tuple]:
+            # 降序时整体反转，因此空值标记也要反转，保证空值始终排在最后
+            if descending:
+                return lambda task: (task.get(field) is not None, task.get(field))
+            return lambda task: (task.get(field) is None, task.get(field))
+
+        if len(self._order) == 1 and self._limit is not None:
+            field, descending = self._order[0]
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            yield from pick(self._limit, results, key=key_for(field, descending))
+            return
+
+        ordered = list(results)
+        # 稳定排序：从最后一个排序字段开始依次排序
+        for field, descending in reversed(self._order):
+            ordered.sort(key=key_for(field, descending), reverse=descending)
+        yield from (ordered if self._limit is None else ordered[:self._limit])
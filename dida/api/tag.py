@@ -2,7 +2,8 @@
 标签相关API
 """
 from typing import List, Optional, Dict, Any
-from .base import BaseAPI
+from concurrent.futures import ThreadPoolExecutor
+from .base import BaseAPI, BATCH_CHUNK_SIZE
 
 class TagAPI(BaseAPI):
     """标签相关的API实现"""
@@ -20,10 +21,18 @@ class TagAPI(BaseAPI):
         Returns:
             List[Dict[str, Any]]: 标签列表
         """
-        response = self._get("/api/v2/batch/check/0")
+        response = self._fetch_sync()
         tags_data = response.get('tags', [])
         tasks_data = response.get('syncTaskBean', {}).get('update', [])
         
+        # 一次遍历按标签分组任务，避免为每个标签扫描全部任务
+        tasks_by_tag: Dict[str, List[Dict[str, Any]]] = {}
+        if include_tasks:
+            for task in tasks_data:
+                # 同一任务重复的标签只计一次
+                for tag_name in dict.fromkeys(task.get('tags') or ()):
+                    tasks_by_tag.setdefault(tag_name, []).append(task)
+        
         # 处理标签数据
         result = []
         for tag in tags_data:
@@ -40,11 +49,7 @@ class TagAPI(BaseAPI):
                 
                 # 添加任务列表（如果需要）
                 if include_tasks:
-                    tag_tasks = [
-                        task for task in tasks_data
-                        if tag['name'] in task.get('tags', [])
-                    ]
-                    tag_data['tasks'] = tag_tasks
+                    tag_data['tasks'] = tasks_by_tag.get(tag['name'], [])
                     
                 result.append(tag_data)
                 
@@ -84,18 +89,23 @@ class TagAPI(BaseAPI):
         tag_data["add"][0] = {k: v for k, v in tag_data["add"][0].items() if v is not None}
         
         response = self._post("/api/v2/batch/tag", data=tag_data)
+        self.resolver.put_tag(tag_data["add"][0])
         return tag_data["add"][0]
 
-    def get_tag(self, tag_name: str) -> Optional[Dict[str, Any]]:
+    def get_tag(self, tag_name: str, include_tasks: bool = True) -> Optional[Dict[str, Any]]:
         """
         获取单个标签的详细信息
         
         Args:
             tag_name: 标签名称
+            include_tasks: 是否包含任务列表，为False时直接从名称解析缓存中查找，不请求网络
             
         Returns:
             Optional[Dict[str, Any]]: 标签数据，如果标签不存在则返回None
         """
+        if not include_tasks:
+            tag = self._ensure_resolver().tag(tag_name)
+            return dict(tag) if tag else None
         tags = self.get_tags(names=[tag_name])
         return tags[0] if tags else None
 
@@ -116,7 +126,7 @@ class TagAPI(BaseAPI):
             Dict[str, Any]: 更新结果
         """
         # 获取当前标签信息
-        current_tag = self.get_tag(old_name)
+        current_tag = self.get_tag(old_name, include_tasks=False)
         if not current_tag:
             return {
                 "success": False,
@@ -132,6 +142,7 @@ class TagAPI(BaseAPI):
                     "newName": new_name
                 }
                 self._put("/api/v2/tag/rename", data=rename_data)
+                self.resolver.rename_tag(old_name, new_name)
                 old_name = new_name  # 更新后续操作使用的名称
             
             # 构建更新数据
@@ -150,6 +161,7 @@ class TagAPI(BaseAPI):
             }
             
             response = self._post("/api/v2/batch/tag", data=update_data)
+            self.resolver.put_tag(update_data["update"][0])
             return {
                 "success": True,
                 "info": "标签更新成功",
@@ -174,7 +186,7 @@ class TagAPI(BaseAPI):
         """
         try:
             # 获取标签信息用于返回
-            tag = self.get_tag(tag_name)
+            tag = self.get_tag(tag_name, include_tasks=False)
             if not tag:
                 return {
                     "success": False,
@@ -191,6 +203,7 @@ class TagAPI(BaseAPI):
             
             # 发送删除请求
             self._post("/api/v2/batch/tag", data=delete_data)
+            self.resolver.remove_tag(tag_name)
             
             return {
                 "success": True,
@@ -204,6 +217,227 @@ class TagAPI(BaseAPI):
                 "data": None
             }
 
+    def create_tags(self, tags: List[Dict[str, Any]], chunk_size: int = BATCH_CHUNK_SIZE,
+                    max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量创建标签，通过 /api/v2/batch/tag 分块提交
+
+        根据名称解析缓存校验，已存在或在输入中重复的标签不会提交。
+
+        Args:
+            tags: 标签列表，每个元素的键与 create_tag 的参数相同，例如 {"name": "工作", "color": "#FF0000"}
+            chunk_size: 每个请求最多包含的标签数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一一对应的结果，每项为 {"success", "info", "data"}
+        """
+        resolver = self._ensure_resolver()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tags)
+        pending = []
+        seen = set()
+        for position, tag in enumerate(tags):
+            name = tag['name']
+            if resolver.tag(name) is not None or name in seen:
+                results[position] = {"success": False, "info": f"标签 '{name}' 已存在", "data": None}
+                continue
+            seen.add(name)
+            tag_data = {
+                "name": name,
+                "label": name,
+                "color": tag.get('color'),
+                "sortOrder": tag.get('sort_order', 0),
+                "sortType": tag.get('sort_type', "name"),
+                "parent": None,
+                "type": tag.get('tag_type', 1)
+            }
+            pending.append((position, {k: v for k, v in tag_data.items() if v is not None}))
+
+        batch_results = self._post_batch("/api/v2/batch/tag", "add", [item for _, item in pending],
+                                         key=lambda item: item['name'], chunk_size=chunk_size,
+                                         max_retries=max_retries)
+        for (position, tag_data), result in zip(pending, batch_results):
+            if result['success']:
+                resolver.put_tag(tag_data)
+            results[position] = {
+                "success": result['success'],
+                "info": "标签创建成功" if result['success'] else result['info'],
+                "data": tag_data
+            }
+        return results
+
+    def update_tags(self, changes: List[Dict[str, Any]], chunk_size: int = BATCH_CHUNK_SIZE,
+                    max_retries: int = 2, max_workers: int = 4) -> List[Dict[str, Any]]:
+        """
+        批量更新标签
+
+        重命名没有批量接口，按依赖关系分轮执行：目标名称被其他标签占用时，等占用它的标签改名之后再执行，
+        同一轮中互不依赖的重命名并发执行；互相改名形成的环通过临时名称打开。
+        重命名完成后，颜色和排序的修改通过 /api/v2/batch/tag 分块提交。
+
+        Args:
+            changes: 变更列表，每个元素包含原名称 "name"，其余键与 update_tag 的参数相同，例如
+                     {"name": "工作", "new_name": "工作/项目", "color": "#00FF00"}
+            chunk_size: 每个请求最多包含的标签数
+            max_retries: 每块最多重试次数
+            max_workers: 同一轮重命名的最大并发数
+
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一一对应的结果，每项为 {"success", "info", "data"}
+        """
+        resolver = self._ensure_resolver()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(changes)
+        positions: Dict[str, int] = {}
+        renames: Dict[str, str] = {}
+        for position, change in enumerate(changes):
+            name = change['name']
+            if resolver.tag(name) is None:
+                results[position] = {"success": False, "info": f"未找到名称为 '{name}' 的标签", "data": None}
+            elif name in positions:
+                results[position] = {"success": False, "info": f"标签 '{name}' 在变更列表中重复", "data": None}
+            else:
+                positions[name] = position
+                new_name = change.get('new_name')
+                if new_name and new_name != name:
+                    renames[name] = new_name
+
+        # 校验重命名目标：不能重复，也不能与不会被改名的已有标签冲突
+        targets: Dict[str, str] = {}
+        for name, new_name in list(renames.items()):
+            occupied = resolver.tag(new_name) is not None and new_name not in renames
+            if occupied or new_name in targets:
+                results[positions.pop(name)] = {"success": False, "info": f"标签 '{new_name}' 已存在", "data": None}
+                del renames[name]
+            else:
+                targets[new_name] = name
+        failed = self._run_renames(renames, max_workers)
+        for name, error in failed.items():
+            results[positions.pop(name)] = {"success": False, "info": f"重命名标签失败: {error}", "data": None}
+
+        pending = []
+        for name, position in positions.items():
+            change = changes[position]
+            final_name = renames.get(name, name)
+            current = resolver.tag(final_name) or {}
+            tag_data = {
+                "name": final_name,
+                "label": final_name,
+                "color": change['color'] if change.get('color') is not None else current.get('color'),
+                "sortOrder": change['sort_order'] if change.get('sort_order') is not None else current.get('sortOrder'),
+                "sortType": change['sort_type'] if change.get('sort_type') is not None else current.get('sortType'),
+                "parent": None,
+                "type": current.get('type', 1)
+            }
+            if all(current.get(key) == tag_data[key] for key in ('color', 'sortOrder', 'sortType')):
+                results[position] = {"success": True, "info": "标签更新成功", "data": tag_data}
+            else:
+                pending.append((position, tag_data))
+
+        batch_results = self._post_batch("/api/v2/batch/tag", "update", [item for _, item in pending],
+                                         key=lambda item: item['name'], chunk_size=chunk_size,
+                                         max_retries=max_retries)
+        for (position, tag_data), result in zip(pending, batch_results):
+            if result['success']:
+                resolver.put_tag(tag_data)
+            results[position] = {
+                "success": result['success'],
+                "info": "标签更新成功" if result['success'] else result['info'],
+                "data": tag_data
+            }
+        return results
+
+    def _run_renames(self, renames: Dict[str, str], max_workers: int) -> Dict[str, str]:
+        """
+        按依赖关系分轮执行重命名
+
+        Args:
+            renames: 原名称到新名称的映射，目标名称已经过校验
+            max_workers: 同一轮的最大并发数
+
+        Returns:
+            Dict[str, str]: 失败的原名称到错误信息的映射
+        """
+        pending = dict(renames)
+        origin = {name: name for name in pending}  # 当前名称对应的原名称（经过临时名称时不同）
+        failed: Dict[str, str] = {}
+        blocked = set()  # 改名失败、仍被占用的名称
+
+        def rename(old_name: str, new_name: str) -> None:
+            self._put("/api/v2/tag/rename", data={"name": old_name, "newName": new_name})
+            self.resolver.rename_tag(old_name, new_name)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending:
+                # 目标名称无法释放的重命名也会失败
+                for name in [name for name, new_name in pending.items() if new_name in blocked]:
+                    failed[origin[name]] = f"标签 '{pending.pop(name)}' 仍被占用"
+                    blocked.add(name)
+                if not pending:
+                    break
+
+                wave = {name: new_name for name, new_name in pending.items() if new_name not in pending}
+                if not wave:
+                    # 只剩下环：先把其中一个标签改为临时名称
+                    name = next(iter(pending))
+                    temp_name = f"{name}~rename"
+                    while self.resolver.tag(temp_name) is not None or temp_name in pending:
+                        temp_name += "~"
+                    wave = {name: temp_name}
+                    pending[temp_name] = pending.pop(name)
+                    origin[temp_name] = origin[name]
+                    # 临时重命名失败时按原名称记录
+                    steps = {name: executor.submit(rename, name, temp_name)}
+                else:
+                    steps = {name: executor.submit(rename, name, new_name) for name, new_name in wave.items()}
+                    for name in wave:
+                        pending.pop(name)
+
+                for name, step in steps.items():
+                    try:
+                        step.result()
+                    except Exception as e:
+                        failed[origin[name]] = str(e)
+                        blocked.add(name)
+                        temp_name = wave[name]
+                        if temp_name in pending and origin.get(temp_name) == origin[name]:
+                            pending.pop(temp_name)
+        return failed
+
+    def delete_tags(self, tag_names: List[str], chunk_size: int = BATCH_CHUNK_SIZE,
+                    max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量删除标签，通过 /api/v2/batch/tag 分块提交
+
+        Args:
+            tag_names: 标签名称列表
+            chunk_size: 每个请求最多包含的标签数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一一对应的结果，每项为 {"success", "info", "data"}
+        """
+        resolver = self._ensure_resolver()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tag_names)
+        pending = []
+        for position, name in enumerate(tag_names):
+            tag = resolver.tag(name)
+            if tag is None:
+                results[position] = {"success": False, "info": f"未找到名称为 '{name}' 的标签", "data": None}
+            else:
+                pending.append((position, dict(tag)))
+
+        batch_results = self._post_batch("/api/v2/batch/tag", "delete", [tag['name'] for _, tag in pending],
+                                         key=lambda name: name, chunk_size=chunk_size, max_retries=max_retries)
+        for (position, tag), result in zip(pending, batch_results):
+            if result['success']:
+                resolver.remove_tag(tag['name'])
+            results[position] = {
+                "success": result['success'],
+                "info": f"成功删除标签 '{tag['name']}'" if result['success'] else result['info'],
+                "data": tag
+            }
+        return results
+
     def merge_tags(self, source_tag_name: str, target_tag_name: str) -> Dict[str, Any]:
         """
         合并标签
@@ -222,6 +456,7 @@ class TagAPI(BaseAPI):
             }
             
             response = self._put("/api/v2/tag/merge", data=merge_data)
+            self.resolver.remove_tag(source_tag_name)
             return {
                 "success": True,
                 "info": f"成功将标签 '{source_tag_name}' 合并到 '{target_tag_name}'",
@@ -247,7 +482,7 @@ class TagAPI(BaseAPI):
         Returns:
             List[Dict[str, Any]]: 任务列表
         """
-        response = self._get("/api/v2/batch/check/0")
+        response = self._fetch_sync()
         tasks_data = response.get('syncTaskBean', {}).get('update', [])
         return [
             task for task in tasks_data
@@ -2,12 +2,20 @@
 任务API版本2，支持灵活的任务查询功能
 """
 
-from typing import List, Optional, Dict, Any, Union
-from datetime import datetime, timedelta
-import pytz
-from .base import BaseAPI
+from typing import List, Optional, Dict, Any, Union, Iterator, Iterable, Callable
+from datetime import datetime, date, timedelta, tzinfo
+import bisect
+import itertools
+from .base import BaseAPI, BATCH_CHUNK_SIZE
+from .query import TaskQuery, select_fields
+from ..exceptions import APIError
+from ..utils.tree_index import TaskTreeIndex, FilteredTaskTree, TaskView
+from ..utils.recurrence import RecurrenceEngine, is_recurring, parse_task_datetime
+from ..utils.timezone import get_timezone, localize, shift
+from ..utils.date_index import DateIndex
+from ..utils.scheduler import ReminderScheduler, ReminderCallback
+from ..utils.ids import generate_id
 from enum import Enum
-import random
 
 class ReminderOption(Enum):
     """标准提醒选项"""
@@ -37,11 +45,26 @@ class ReminderOption(Enum):
         }
         return descriptions.get(option, "未知提醒类型")
 
+# 相邻任务 sortOrder 的间隔，与滴答清单客户端一致
+SORT_ORDER_STEP = 1 << 40
+
+# 简化任务数据时转换为本地时间字符串的字段
+TASK_DATE_FIELDS = frozenset(('startDate', 'dueDate', 'modifiedTime', 'createdTime', 'completedTime'))
+
+# 简化任务数据中缺失时有默认值的字段 -> 默认值的构造函数
+TASK_FIELD_DEFAULTS = {
+    'tags': list, 'tagDetails': list, 'reminders': list, 'exDate': list, 'attachments': list,
+    'progress': int, 'deleted': int, 'imgMode': int, 'sortOrder': int,
+    'isCompleted': bool, 'isFloating': bool,
+}
+
 class TaskAPI(BaseAPI):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._completed_columns = set()  # 存储已完成状态的栏目ID
         self._column_info = {}  # 存储栏目信息
+        self._tree_index = TaskTreeIndex()  # 持久化的任务树索引
+        self._recurrence = RecurrenceEngine(self.timezone)  # 重复任务展开（带缓存）
 
     def _update_column_info(self, projects: List[Dict[str, Any]]) -> None:
         """
@@ -58,13 +81,18 @@ class TaskAPI(BaseAPI):
                     if '已完成' in column.get('name', ''):
                         self._completed_columns.add(column['id'])
 
-    def get_tasks(self, mode: str = "all", keyword: Optional[str] = None, priority: Optional[int] = None,
-                  project_name: Optional[str] = None, tag_names: Optional[List[str]] = None,
-                  created_after: Optional[datetime] = None, created_before: Optional[datetime] = None,
-                  completed_after: Optional[datetime] = None, completed_before: Optional[datetime] = None,
-                  completed: Optional[bool] = None) -> List[Dict[str, Any]]:
+    def get_task_views(self, mode: str = "all", keyword: Optional[str] = None, priority: Optional[int] = None,
+                       project_name: Optional[str] = None, tag_names: Optional[List[str]] = None,
+                       created_after: Optional[datetime] = None, created_before: Optional[datetime] = None,
+                       completed_after: Optional[datetime] = None, completed_before: Optional[datetime] = None,
+                       completed: Optional[bool] = None, fields: Optional[Iterable[str]] = None,
+                       raw: bool = False) -> List[TaskView]:
         """
-        获取任务，支持多种模式和筛选条件
+        获取任务树的只读视图，参数与 get_tasks 相同
+
+        视图与任务快照共享数据，不复制任务，适合只读遍历大量任务；需要修改结果或序列化为JSON时
+        使用 get_tasks，或对视图调用 to_dict()。筛选条件在原始任务数据上判断，fields/raw
+        只影响返回的任务数据，不影响筛选结果。
         
         Args:
             mode: 查询模式，支持 "all", "today", "yesterday", "recent_7_days"
@@ -77,82 +105,102 @@ class TaskAPI(BaseAPI):
             completed_after: 完成时间开始筛选
             completed_before: 完成时间结束筛选
             completed: 是否已完成，True表示已完成，False表示未完成，None表示全部
+            fields: 只返回这些字段（简化后的字段名），只计算需要的字段，id 和 parentId 总会保留
+            raw: 为True时返回原始任务数据（API格式），完全跳过简化
             
         Returns:
-            List[Dict[str, Any]]: 符合条件的任务列表
+            List[TaskView]: 符合条件的任务树（根任务列表）。每个元素是只读的字典视图，
+                其中 children 只包含保留的子任务，需要普通字典时调用 to_dict()
         """
-        tasks = self.get_all_tasks()
+        raw_tasks, projects, tags = self._fetch_all_raw()
+        tasks = self._present_tasks(raw_tasks, projects, tags, fields, raw)
+        index = self._tree_index
+        index.sync(tasks)
+        project_names = {project_id: project.get('name', '') for project_id, project in projects.items()}
         # 如果是查询今天的任务，默认只显示未完成的任务
         if mode == "today" and completed is None:
             completed = False
 
-        def match_keyword(task: Dict[str, Any], kw: str) -> bool:
-            """递归检查任务及其子任务是否匹配关键词"""
-            # 检查当前任务
-            if (kw.lower() in task.get('title', '').lower() or 
-                kw.lower() in task.get('content', '').lower()):
-                return True
-            
-            # 递归检查子任务
-            for child in task.get('children', []):
-                if match_keyword(child, kw):
-                    return True
-            return False
+        # 关键词匹配任务自身或任意子孙任务，即命中任务及其所有祖先
+        keyword_matches = None
+        if keyword:
+            kw = keyword.lower()
+            keyword_matches = index.with_ancestors(
+                task['id'] for task in raw_tasks
+                if kw in task.get('title', '').lower() or kw in task.get('content', '').lower()
+            )
+
+        def task_matches(task: Dict[str, Any]) -> bool:
+            """检查任务自身是否匹配所有条件"""
+            # 首先检查完成状态
+            if completed is not None and self._is_task_completed(task) != completed:
+                return False
 
-        def filter_tasks(task_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-            """递归过滤任务列表"""
-            filtered_tasks = []
-            for task in task_list:
-                # 首先处理子任务
-                children = []
-                if task.get('children'):
-                    children = filter_tasks(task['children'])
-
-                # 检查当前任务是否匹配所有条件
-                task_matches = True
-
-                # 首先检查完成状态
-                is_completed = self._is_task_completed(task)
-                if completed is not None and is_completed != completed:
-                    task_matches = False
-
-                # 检查时间相关条件
-                if task_matches:
-                    if mode == "today" and not self._is_today(task):
-                        task_matches = False
-                    elif mode == "yesterday" and not self._is_yesterday(task):
-                        task_matches = False
-                    elif mode == "recent_7_days" and not self._is_recent_7_days(task):
-                        task_matches = False
-
-                # 其他过滤条件
-                if task_matches:
-                    if keyword and not match_keyword(task, keyword):
-                        task_matches = False
-                    if priority is not None and task.get('priority') != priority:
-                        task_matches = False
-                    if project_name and project_name.lower() not in task.get('projectName', '').lower():
-                        task_matches = False
-                    if tag_names and not any(tag in task.get('tags', []) for tag in tag_names):
-                        task_matches = False
-                    if created_after and self._parse_date(task.get('createdTime')) < created_after:
-                        task_matches = False
-                    if created_before and self._parse_date(task.get('createdTime')) > created_before:
-                        task_matches = False
-                    if completed_after and self._parse_date(task.get('completedTime')) < completed_after:
-                        task_matches = False
-                    if completed_before and self._parse_date(task.get('completedTime')) > completed_before:
-                        task_matches = False
-
-                # 如果当前任务匹配或者有匹配的子任务，则添加到结果中
-                if task_matches or children:
-                    task_copy = task.copy()
-                    task_copy['children'] = children
-                    filtered_tasks.append(task_copy)
-
-            return filtered_tasks
-
-        return filter_tasks(tasks)
+            # 检查时间相关条件
+            if mode == "today" and not self._is_today(task):
+                return False
+            elif mode == "yesterday" and not self._is_yesterday(task):
+                return False
+            elif mode == "recent_7_days" and not self._is_recent_7_days(task):
+                return False
+
+            # 其他过滤条件
+            if keyword_matches is not None and task['id'] not in keyword_matches:
+                return False
+            if priority is not None and task.get('priority') != priority:
+                return False
+            if project_name and project_name.lower() not in project_names.get(task.get('projectId'), '').lower():
+                return False
+            if tag_names and not any(tag in (task.get('tags') or []) for tag in tag_names):
+                return False
+            # 原始数据中的时间是UTC时间，统一换算为本地时间后比较
+            if created_after and parse_task_datetime(task.get('createdTime'), self.tz) < created_after:
+                return False
+            if created_before and parse_task_datetime(task.get('createdTime'), self.tz) > created_before:
+                return False
+            if completed_after and parse_task_datetime(task.get('completedTime'), self.tz) < completed_after:
+                return False
+            if completed_before and parse_task_datetime(task.get('completedTime'), self.tz) > completed_before:
+                return False
+            return True
+
+        # 匹配的任务及其祖先组成过滤树，任务数据与快照共享，不做复制
+        matched = {task['id'] for task in raw_tasks if task_matches(task)}
+        return FilteredTaskTree.from_index(index, matched).roots()
+
+    def get_tasks(self, mode: str = "all", keyword: Optional[str] = None, priority: Optional[int] = None,
+                  project_name: Optional[str] = None, tag_names: Optional[List[str]] = None,
+                  created_after: Optional[datetime] = None, created_before: Optional[datetime] = None,
+                  completed_after: Optional[datetime] = None, completed_before: Optional[datetime] = None,
+                  completed: Optional[bool] = None, fields: Optional[Iterable[str]] = None,
+                  raw: bool = False) -> List[Dict[str, Any]]:
+        """
+        获取任务，支持多种模式和筛选条件
+
+        Args:
+            mode: 查询模式，支持 "all", "today", "yesterday", "recent_7_days"
+            keyword: 关键词筛选（支持模糊搜索，会搜索标题、内容和子任务）
+            priority: 优先级筛选 (0-最低, 1-低, 3-中, 5-高)
+            project_name: 项目名称筛选
+            tag_names: 标签名称列表筛选
+            created_after: 创建时间开始筛选
+            created_before: 创建时间结束筛选
+            completed_after: 完成时间开始筛选
+            completed_before: 完成时间结束筛选
+            completed: 是否已完成，True表示已完成，False表示未完成，None表示全部
+            fields: 只返回这些字段（简化后的字段名），只计算需要的字段，id 和 parentId 总会保留
+            raw: 为True时返回原始任务数据（API格式），完全跳过简化
+
+        Returns:
+            List[Dict[str, Any]]: 符合条件的任务树（根任务列表），children 只包含保留的子任务。
+                每个任务都是独立的字典，可以修改或直接序列化为JSON
+        """
+        views = self.get_task_views(
+            mode=mode, keyword=keyword, priority=priority, project_name=project_name, tag_names=tag_names,
+            created_after=created_after, created_before=created_before, completed_after=completed_after,
+            completed_before=completed_before, completed=completed, fields=fields, raw=raw
+        )
+        return [view.to_dict() for view in views]
 
     def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
         """
@@ -178,145 +226,215 @@ class TaskAPI(BaseAPI):
                 print(f"Warning: Unrecognized date format: {date_str}")
                 return None
 
-    def _is_today(self, task: Dict[str, Any]) -> bool:
+    def _day_window(self, days_offset: int = 0, days: int = 1) -> tuple:
+        """
+        获取以今天为基准的时间窗口
+
+        Args:
+            days_offset: 相对今天的天数偏移，-1表示昨天
+            days: 窗口包含的天数
+
+        Returns:
+            tuple: (窗口开始, 窗口结束)，带时区的本地时间
         """
-        判断任务是否是今天的任务
+        today = datetime.now(self.tz).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+        start = today + timedelta(days=days_offset)
+        # 按日历日期计算边界，夏令时切换的日子也是完整的一天
+        return localize(start, self.tz), localize(start + timedelta(days=days), self.tz)
+
+    def _in_window(self, task: Dict[str, Any], window_start: datetime, window_end: datetime) -> bool:
+        """
+        判断任务是否落在时间窗口内
         规则：
-        1. 任务的时间范围（startDate到dueDate）与今天有重叠
+        1. 任务的时间范围（startDate到dueDate）与窗口有重叠
         2. 对于全天任务，结束时间应该是当天的23:59:59
         3. 时间判断时要考虑时区
+        4. 重复任务按重复规则展开后，任意一次发生与窗口重叠即可
         """
-        local_tz = pytz.timezone('Asia/Shanghai')
-        now = datetime.now(local_tz)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
+        if is_recurring(task):
+            return self._recurrence.occurs_in(task, window_start, window_end)
 
-        # 获取任务的开始和结束时间
-        start_date = self._parse_date(task.get('startDate'))
-        due_date = self._parse_date(task.get('dueDate'))
+        # 获取任务的开始和结束时间（本地时间），UTC格式的原始数据会先换算到本地时区
+        start_date = parse_task_datetime(task.get('startDate'), self.tz)
+        due_date = parse_task_datetime(task.get('dueDate'), self.tz)
 
-        # 如果既没有开始时间也没有结束时间，则不是今天的任务
+        # 如果既没有开始时间也没有结束时间，则不在窗口内
         if not start_date and not due_date:
             return False
 
-        # 确保时区一致
-        if start_date and start_date.tzinfo is None:
-            start_date = local_tz.localize(start_date)
-        elif start_date:
-            start_date = start_date.astimezone(local_tz)
-
-        if due_date and due_date.tzinfo is None:
-            due_date = local_tz.localize(due_date)
-        elif due_date:
-            due_date = due_date.astimezone(local_tz)
-
         # 对于全天任务，调整结束时间到当天的23:59:59
         if task.get('isAllDay') and due_date:
             due_date = due_date.replace(hour=23, minute=59, second=59)
 
+        # 确保时区一致
+        if start_date:
+            start_date = localize(start_date, self.tz)
+        if due_date:
+            due_date = localize(due_date, self.tz)
+
         # 检查时间范围是否重叠
         if start_date and due_date:
-            return start_date < today_end and due_date >= today_start
+            return start_date < window_end and due_date >= window_start
         elif start_date:
-            return start_date < today_end
+            return start_date < window_end
         else:  # 只有 due_date
-            return due_date >= today_start
+            return due_date >= window_start
+
+    def _is_today(self, task: Dict[str, Any]) -> bool:
+        """判断任务是否是今天的任务"""
+        return self._in_window(task, *self._day_window())
 
     def _is_yesterday(self, task: Dict[str, Any]) -> bool:
+        """判断任务是否是昨天的任务"""
+        return self._in_window(task, *self._day_window(days_offset=-1))
+
+    def _is_recent_7_days(self, task: Dict[str, Any]) -> bool:
+        """判断任务是否在最近7天内（今天起的未来7天）"""
+        return self._in_window(task, *self._day_window(days=7))
+
+    def agenda(self, start: Union[str, date, datetime], end: Union[str, date, datetime],
+               granularity: str = "day", timezone: Optional[str] = None,
+               include_completed: bool = True) -> Dict[str, List[Dict[str, Any]]]:
         """
-        判断任务是否是昨天的任务
-        规则：
-        1. 任务的时间范围（startDate到dueDate）与昨天有重叠
-        2. 对于全天任务，结束时间应该是当天的23:59:59
-        3. 时间判断时要考虑时区
+        按天或按小时汇总时间范围内的任务，用于日历视图
+
+        只同步一次数据并构建日期索引，不会为每一天分别查询。多天任务会出现在它覆盖的每个时间段中，
+        重复任务按重复规则展开后放入每次发生所在的时间段。全天任务按日期归入对应的天，
+        不受时区换算影响；按小时汇总时全天任务归入当天 00:00 的时间段。
+
+        Args:
+            start: 开始时间，datetime对象、date对象或 "YYYY-MM-DD"/"YYYY-MM-DD HH:MM:SS" 格式的字符串
+            end: 结束时间，格式同上。只有日期时包含当天，带时间时不包含该时刻
+            granularity: 汇总粒度，"day" 或 "hour"
+            timezone: 时间段所在的时区，默认为客户端的时区
+            include_completed: 是否包含已完成任务，为False时不会请求各项目的已完成任务
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: 时间段 -> 任务列表，按时间排序并包含没有任务的时间段。
+                按天时键为 "YYYY-MM-DD"，按小时时键为 "YYYY-MM-DD HH:00"
         """
-        local_tz = pytz.timezone('Asia/Shanghai')
-        now = datetime.now(local_tz)
-        yesterday_start = (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        yesterday_end = yesterday_start + timedelta(days=1)
+        if granularity not in ("day", "hour"):
+            raise ValueError("granularity 只支持 'day' 或 'hour'")
+        tz = get_timezone(timezone) if timezone else self.tz
+        window_start = self._agenda_bound(start, tz, is_end=False)
+        window_end = self._agenda_bound(end, tz, is_end=True)
 
-        # 获取任务的开始和结束时间
-        start_date = self._parse_date(task.get('startDate'))
-        due_date = self._parse_date(task.get('dueDate'))
+        # 时间段边界，按天时用日历日期计算，保证夏令时切换的日子也是完整的一天
+        bounds = []
+        if granularity == "day":
+            day = window_start.date()
+            while True:
+                bound = localize(datetime.combine(day, datetime.min.time()), tz)
+                if bound >= window_end:
+                    break
+                bounds.append(bound)
+                day += timedelta(days=1)
+            key_format = "%Y-%m-%d"
+        else:
+            bound = window_start.replace(minute=0, second=0, microsecond=0)
+            while bound < window_end:
+                bounds.append(bound)
+                bound = shift(bound, timedelta(hours=1), tz)
+            key_format = "%Y-%m-%d %H:00"
+        if not bounds:
+            return {}
+        buckets: List[List[Dict[str, Any]]] = [[] for _ in bounds]
 
-        # 如果既没有开始时间也没有结束时间，则不是昨天的任务
-        if not start_date and not due_date:
-            return False
+        query = self.query()
+        if not include_completed:
+            query = query.completed(False)
+        index = DateIndex(query, self._recurrence)
 
-        # 确保时区一致
-        if start_date and start_date.tzinfo is None:
-            start_date = local_tz.localize(start_date)
-        elif start_date:
-            start_date = start_date.astimezone(local_tz)
+        def bucket_of(moment: datetime) -> int:
+            return bisect.bisect_right(bounds, moment) - 1
 
-        if due_date and due_date.tzinfo is None:
-            due_date = local_tz.localize(due_date)
-        elif due_date:
-            due_date = due_date.astimezone(local_tz)
+        # 每个日期对应的第一个时间段，用于放置全天任务
+        day_positions: Dict[date, int] = {}
+        for position, bound in enumerate(bounds):
+            day_positions.setdefault(bound.date(), position)
 
-        # 对于全天任务，调整结束时间到当天的23:59:59
-        if task.get('isAllDay') and due_date:
-            due_date = due_date.replace(hour=23, minute=59, second=59)
+        # 全天任务按日期而不是时刻归类，查询时前后各放宽一天，避免时区差异漏掉
+        margin = timedelta(days=1)
+        for task, occ_start, occ_end in index.occurrences(window_start - margin, window_end + margin):
+            if task.get('isAllDay'):
+                day, last_day = occ_start.date(), occ_end.date()
+                positions = []
+                while day <= last_day:
+                    if day in day_positions:
+                        positions.append(day_positions[day])
+                    day += timedelta(days=1)
+            else:
+                # 发生区间按 [开始, 结束) 处理，结束时刻不属于任务；只有截止时间的任务只占开始时刻
+                last_moment = max(occ_end - timedelta(microseconds=1), occ_start)
+                if occ_start >= window_end or last_moment < window_start:
+                    continue
+                first = max(bucket_of(occ_start), 0)
+                last = bucket_of(min(last_moment, window_end - timedelta(microseconds=1)))
+                positions = range(first, last + 1)
+            for position in positions:
+                bucket = buckets[position]
+                if not bucket or bucket[-1] is not task:
+                    bucket.append(task)
 
-        # 检查时间范围是否重叠
-        if start_date and due_date:
-            return start_date < yesterday_end and due_date >= yesterday_start
-        elif start_date:
-            return start_date < yesterday_end
-        else:  # 只有 due_date
-            return due_date >= yesterday_start
+        return {bound.strftime(key_format): tasks for bound, tasks in zip(bounds, buckets)}
 
-    def _is_recent_7_days(self, task: Dict[str, Any]) -> bool:
-        """
-        判断任务是否在最近7天内
-        规则：
-        1. 任务的时间范围（startDate到dueDate）与未来7天有重叠
-        2. 对于全天任务，结束时间应该是当天的23:59:59
-        3. 时间判断时要考虑时区
+    def schedule_reminders(self, callback: ReminderCallback, start: bool = True) -> ReminderScheduler:
         """
-        local_tz = pytz.timezone('Asia/Shanghai')
-        now = datetime.now(local_tz)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        week_end = today_start + timedelta(days=7)
+        根据未完成任务的提醒设置创建本地提醒调度器
 
-        # 获取任务的开始和结束时间
-        start_date = self._parse_date(task.get('startDate'))
-        due_date = self._parse_date(task.get('dueDate'))
+        只请求一次同步数据（不需要已完成任务）。之后任务变化时调用调度器的 sync()/update_task()
+        即可增量重新调度，不需要定时轮询全部任务。
 
-        # 如果既没有开始时间也没有结束时间，则不在最近7天内
-        if not start_date and not due_date:
-            return False
+        Args:
+            callback: 提醒回调，参数为 (任务数据, 提醒时间, 触发器)
+            start: 是否立即启动后台线程
 
-        # 确保时区一致
-        if start_date and start_date.tzinfo is None:
-            start_date = local_tz.localize(start_date)
-        elif start_date:
-            start_date = start_date.astimezone(local_tz)
+        Returns:
+            ReminderScheduler: 提醒调度器
+        """
+        scheduler = ReminderScheduler(callback, timezone=self.timezone, engine=self._recurrence)
+        scheduler.sync(self.query().completed(False))
+        if start:
+            scheduler.start()
+        return scheduler
 
-        if due_date and due_date.tzinfo is None:
-            due_date = local_tz.localize(due_date)
-        elif due_date:
-            due_date = due_date.astimezone(local_tz)
+    def _agenda_bound(self, value: Union[str, date, datetime], tz: tzinfo,
+                      is_end: bool) -> datetime:
+        """将日程范围的边界转换为带时区的时间，只有日期的结束边界包含当天"""
+        date_only = False
+        if isinstance(value, str):
+            date_only = len(value) == 10
+            value = datetime.strptime(value, "%Y-%m-%d" if date_only else "%Y-%m-%d %H:%M:%S")
+        elif not isinstance(value, datetime):
+            date_only = True
+            value = datetime.combine(value, datetime.min.time())
+        if date_only and is_end:
+            value += timedelta(days=1)
+        if value.tzinfo is None:
+            return localize(value, tz)
+        return value.astimezone(tz)
 
-        # 对于全天任务，调整结束时间到当天的23:59:59
-        if task.get('isAllDay') and due_date:
-            due_date = due_date.replace(hour=23, minute=59, second=59)
+    @staticmethod
+    def _snapshot_tables(projects: List[Dict[str, Any]], tags: List[Dict[str, Any]]) -> tuple:
+        """
+        为一次同步数据建立查找表，合并项目和标签信息时每个任务只需常数次查找
 
-        # 检查时间范围是否重叠
-        if start_date and due_date:
-            return start_date < week_end and due_date >= today_start
-        elif start_date:
-            return start_date < week_end
-        else:  # 只有 due_date
-            return due_date >= today_start
+        Args:
+            projects: 项目列表
+            tags: 标签列表
 
-    def _merge_project_info(self, task_data: Dict[str, Any], projects: List[Dict[str, Any]]) -> Dict[str, Any]:
+        Returns:
+            tuple: (项目ID -> 项目, 标签名称 -> 标签)
+        """
+        return {project['id']: project for project in projects}, {tag['name']: tag for tag in tags}
+
+    def _merge_project_info(self, task_data: Dict[str, Any], projects: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """
         合并项目信息到任务数据中
         
         Args:
             task_data: 任务数据
-            projects: 项目列表
+            projects: 项目ID -> 项目的查找表
             
         Returns:
             Dict[str, Any]: 合并后的任务数据
@@ -324,21 +442,20 @@ class TaskAPI(BaseAPI):
         if not task_data.get('projectId'):
             return task_data
             
-        for project in projects:
-            if project['id'] == task_data['projectId']:
-                task_data['projectName'] = project['name']
-                task_data['projectKind'] = project['kind']
-                break
+        project = projects.get(task_data['projectId'])
+        if project is not None:
+            task_data['projectName'] = project['name']
+            task_data['projectKind'] = project['kind']
                 
         return task_data
 
-    def _merge_tag_info(self, task_data: Dict[str, Any], tags: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _merge_tag_info(self, task_data: Dict[str, Any], tags: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """
         合并标签信息到任务数据中
         
         Args:
             task_data: 任务数据
-            tags: 标签列表
+            tags: 标签名称 -> 标签的查找表
             
         Returns:
             Dict[str, Any]: 合并后的任务数据
@@ -348,45 +465,62 @@ class TaskAPI(BaseAPI):
             
         tag_details = []
         for tag_name in task_data['tags']:
-            for tag in tags:
-                if tag['name'] == tag_name:
-                    tag_details.append({
-                        'name': tag['name'],
-                        'label': tag['label']
-                    })
-                    break
+            tag = tags.get(tag_name)
+            if tag is not None:
+                tag_details.append({
+                    'name': tag['name'],
+                    'label': tag['label']
+                })
         
         task_data['tagDetails'] = tag_details
         return task_data
 
-    def _simplify_task_data(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _simplify_task_data(self, task_data: Dict[str, Any],
+                            fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         简化任务数据，只保留必要字段
         
         Args:
             task_data: 原始任务数据
+            fields: 只计算并返回这些字段（子任务项同样只保留这些字段），默认返回全部必要字段
             
         Returns:
             Dict[str, Any]: 简化后的任务数据
         """
+        tz = self.tz
+
         def format_date(date_str: Optional[str]) -> Optional[str]:
             """内部函数：格式化日期字符串"""
             if not date_str:
                 return None
-            try:
-                # 如果包含T和时区信息
-                if 'T' in date_str and ('+0000' in date_str or 'Z' in date_str):
-                    # 去掉毫秒和时区信息
-                    base_time = date_str.split('.')[0]
-                    # 解析UTC时间
-                    dt = datetime.strptime(base_time, "%Y-%m-%dT%H:%M:%S")
-                    # 加8小时转换为北京时间
-                    dt = dt + timedelta(hours=8)
-                    # 返回简单的时间格式
+            # 带时区信息的UTC时间转换为本地时间，夏令时按当时实际的偏移计算
+            if 'T' in date_str:
+                dt = parse_task_datetime(date_str, tz)
+                if dt is not None:
                     return dt.strftime("%Y-%m-%d %H:%M:%S")
-                return date_str
-            except Exception:
-                return date_str
+            return date_str
+
+        if fields is not None:
+            # 只计算需要的字段，省去其余字段的时间转换和子任务项的递归
+            selected = {}
+            children = None
+            for field in fields:
+                if field in ('items', 'children'):
+                    if children is None:
+                        children = [self._simplify_task_data(item, fields) for item in task_data.get('items') or ()]
+                    value = children
+                elif field in TASK_DATE_FIELDS:
+                    value = format_date(task_data.get(field))
+                elif field == 'timeZone':
+                    value = self.timezone
+                elif field in task_data:
+                    value = task_data[field]
+                else:
+                    default = TASK_FIELD_DEFAULTS.get(field)
+                    value = default() if default else None
+                if value is not None:
+                    selected[field] = value
+            return selected
 
         children = []
         if task_data.get('items'):
@@ -406,6 +540,7 @@ class TaskAPI(BaseAPI):
             'projectId': task_data.get('projectId'),
             'projectKind': task_data.get('projectKind'),
             'columnId': task_data.get('columnId'),
+            'tags': task_data.get('tags', []),
             'tagDetails': task_data.get('tagDetails', []),
             'kind': task_data.get('kind'),
             'isAllDay': task_data.get('isAllDay'),
@@ -419,7 +554,7 @@ class TaskAPI(BaseAPI):
             'completedUserId': task_data.get('completedUserId'),
             'isCompleted': task_data.get('isCompleted', False),
             'creator': task_data.get('creator'),
-            'timeZone': 'Asia/Shanghai',
+            'timeZone': self.timezone,
             'isFloating': task_data.get('isFloating', False),
             'reminders': task_data.get('reminders', []),
             'exDate': task_data.get('exDate', []),
@@ -444,20 +579,7 @@ class TaskAPI(BaseAPI):
         Returns:
             List[Dict[str, Any]]: 树形结构的任务列表
         """
-        task_map = {task['id']: task for task in tasks}
-        
-        for task in tasks:
-            task['children'] = []
-        
-        root_tasks = []
-        for task in tasks:
-            parent_id = task.get('parentId')
-            if parent_id and parent_id in task_map:
-                task_map[parent_id]['children'].append(task)
-            else:
-                root_tasks.append(task)
-        
-        return root_tasks
+        return TaskTreeIndex(tasks).build_tree()
 
     def _is_task_completed(self, task: Dict[str, Any]) -> bool:
         """
@@ -482,47 +604,157 @@ class TaskAPI(BaseAPI):
 
         return False
 
-    def get_all_tasks(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        tasks = self._get_all_tasks_flat(filters)
-        return self.build_task_tree(tasks)
+    def get_all_tasks(self, filters: Optional[Dict[str, Any]] = None, fields: Optional[Iterable[str]] = None,
+                      raw: bool = False) -> List[Dict[str, Any]]:
+        """
+        获取所有任务（包括已完成任务）的树形结构
 
-    def _get_all_tasks_flat(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        # 获取基本数据
-        response = self._get("/api/v2/batch/check/0")
-        tasks = []
-        
-        # 从batch/0获取未完成的任务（只要TEXT类型的）
+        Args:
+            filters: 筛选条件
+            fields: 只返回这些字段（简化后的字段名），只计算需要的字段，id 和 parentId 总会保留
+            raw: 为True时返回原始任务数据（API格式），完全跳过简化
+
+        Returns:
+            List[Dict[str, Any]]: 根任务列表，子任务在 children 字段中
+        """
+        tasks = self._get_all_tasks_flat(filters, fields=fields, raw=raw)
+        # 复用持久化的树索引，只更新新增、删除和父任务变化的部分
+        self._tree_index.sync(tasks)
+        return self._tree_index.build_tree()
+
+    def query(self) -> TaskQuery:
+        """
+        创建惰性的链式任务查询
+
+        示例:
+            client.tasks.query().in_project("工作").with_tags("重要").order_by("dueDate").limit(10)
+
+        Returns:
+            TaskQuery: 查询构建器，迭代时才会请求数据
+        """
+        return TaskQuery(self)
+
+    def _iter_uncompleted_raw(self, response: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        从同步数据中逐个产出未完成的原始任务（只要TEXT类型的）
+
+        Args:
+            response: 同步数据
+        """
         for task in response.get('syncTaskBean', {}).get('update', []):
             if task.get('kind') == 'TEXT':
                 task['isCompleted'] = False  # 标记为未完成
-                tasks.append(task)
-        
-        # 获取所有项目的已完成任务
-        projects = response.get('projectProfiles', [])
-        for project in projects:
-            completed_tasks = self._get(f"/api/v2/project/{project['id']}/completed/")
+                yield task
+
+    def _iter_completed_raw(self, project_ids: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        按项目逐个请求并产出已完成的原始任务，只有在迭代到某个项目时才会发起请求
+
+        Args:
+            project_ids: 项目ID列表
+        """
+        for project_id in project_ids:
+            completed_tasks = self._get(f"/api/v2/project/{project_id}/completed/")
             for task in completed_tasks:
                 if task.get('kind') == 'TEXT':
                     task['isCompleted'] = True  # 标记为已完成
-                    tasks.append(task)
+                    yield task
 
-        # 处理所有任务（添加项目和标签信息）
-        all_tasks = []
-        for task in tasks:
-            if task.get('kind') == 'TEXT':
-                task = self._merge_project_info(task, projects)
-                task = self._merge_tag_info(task, response.get('tags', []))
-                simplified_task = self._simplify_task_data(task)
-                all_tasks.append(simplified_task)
-
-        # 应用过滤器
-        if filters:
-            filtered_tasks = []
-            for task in all_tasks:
-                if self._apply_filters(task, filters):
-                    filtered_tasks.append(task)
-            return filtered_tasks
-        return all_tasks
+    def iter_tasks(self, completed: Optional[bool] = None, fields: Optional[Iterable[str]] = None,
+                   raw: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        逐个产出任务（扁平结构），不构建任务树，已完成任务在迭代到对应项目时才会请求
+
+        示例:
+            for task in client.tasks.iter_tasks(fields=["id", "title", "dueDate", "status"]):
+                print(task["title"])
+
+        Args:
+            completed: 是否已完成，True表示已完成，False表示未完成（不会请求已完成任务），None表示全部
+            fields: 只返回这些字段（简化后的字段名），只计算需要的字段
+            raw: 为True时产出原始任务数据（API格式），完全跳过简化
+
+        Returns:
+            Iterator[Dict[str, Any]]: 任务迭代器
+        """
+        query = self.query().completed(completed)
+        if fields is not None:
+            query = query.select(*fields)
+        if raw:
+            query = query.raw()
+        return iter(query)
+
+    def _prepare_task(self, task: Dict[str, Any], projects: Dict[str, Dict[str, Any]],
+                      tags: Dict[str, Dict[str, Any]], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        合并项目和标签信息并简化原始任务数据
+
+        Args:
+            task: 原始任务数据
+            projects: 项目ID -> 项目的查找表（_snapshot_tables）
+            tags: 标签名称 -> 标签的查找表（_snapshot_tables）
+            fields: 只计算这些字段，不需要项目或标签详情时跳过对应的合并
+
+        Returns:
+            Dict[str, Any]: 简化后的任务数据
+        """
+        if fields is None or 'projectName' in fields or 'projectKind' in fields:
+            task = self._merge_project_info(task, projects)
+        if fields is None or 'tagDetails' in fields:
+            task = self._merge_tag_info(task, tags)
+        return self._simplify_task_data(task, fields)
+
+    def _fetch_all_raw(self) -> tuple:
+        """
+        获取所有原始任务（包括已完成任务）
+
+        Returns:
+            tuple: (原始任务列表, 项目ID -> 项目, 标签名称 -> 标签)
+        """
+        response = self._fetch_sync()
+        projects, tags = self._snapshot_tables(response.get('projectProfiles', []), response.get('tags', []))
+
+        # 未完成任务来自同步数据，已完成任务需要按项目单独获取
+        tasks = list(self._iter_uncompleted_raw(response))
+        tasks.extend(self._iter_completed_raw(projects.keys()))
+        return tasks, projects, tags
+
+    def _present_tasks(self, tasks: List[Dict[str, Any]], projects: Dict[str, Dict[str, Any]],
+                       tags: Dict[str, Dict[str, Any]], fields: Optional[Iterable[str]] = None,
+                       raw: bool = False) -> List[Dict[str, Any]]:
+        """
+        将原始任务转换为返回给调用方的格式，用于构建任务树，因此总会保留 id 和 parentId
+
+        Args:
+            tasks: 原始任务列表
+            projects: 项目ID -> 项目的查找表
+            tags: 标签名称 -> 标签的查找表
+            fields: 只保留这些字段
+            raw: 是否保留原始格式
+
+        Returns:
+            List[Dict[str, Any]]: 任务列表
+        """
+        if fields is not None:
+            fields = tuple(fields) + tuple(field for field in ('id', 'parentId') if field not in fields)
+        if raw:
+            if fields is None:
+                return tasks
+            return [select_fields(task, fields) for task in tasks]
+        return [self._prepare_task(task, projects, tags, fields) for task in tasks]
+
+    def _get_all_tasks_flat(self, filters: Optional[Dict[str, Any]] = None, fields: Optional[Iterable[str]] = None,
+                            raw: bool = False) -> List[Dict[str, Any]]:
+        tasks, projects, tags = self._fetch_all_raw()
+        if not filters:
+            return self._present_tasks(tasks, projects, tags, fields, raw)
+
+        # 过滤条件针对简化后的完整数据，过滤后再转换为需要的格式
+        kept = [
+            task for task in tasks
+            if self._apply_filters(self._prepare_task(dict(task), projects, tags), filters)
+        ]
+        return self._present_tasks(kept, projects, tags, fields, raw)
 
     def _convert_reminder_format(self, reminder: str) -> str:
         """
@@ -572,56 +804,56 @@ class TaskAPI(BaseAPI):
         Returns:
             str: 生成的提醒ID
         """
-        # 使用当前时间戳的十六进制表示作为基础
-        timestamp_hex = hex(int(datetime.now().timestamp()))[2:]
-        
-        # 生成一个6位的随机十六进制数
-        random_hex = hex(random.randint(0, 16777215))[2:].zfill(6)
-        
-        # 组合ID，确保总长度为24个字符
-        reminder_id = f"{timestamp_hex}6f3a{random_hex}"
-        
-        # 如果长度不足24，用随机字符补齐
-        while len(reminder_id) < 24:
-            reminder_id += hex(random.randint(0, 15))[2:]
-        
-        return reminder_id[:24]
+        return generate_id()
 
-    def create_task(self, title: str, content: Optional[str] = None, priority: Optional[int] = None,
-                  project_name: Optional[str] = None, tag_names: Optional[List[str]] = None,
-                  start_date: Optional[str] = None, due_date: Optional[str] = None,
-                  is_all_day: bool = False, reminder: Optional[Union[str, ReminderOption]] = None,
-                  parent_id: Optional[str] = None) -> Dict[str, Any]:
+    def _resolve_project_id(self, project_name: Optional[str]) -> Optional[str]:
         """
-        创建新任务
-        
+        根据项目名称查找项目ID，使用名称解析缓存
+
+        缓存中没有该名称时（例如项目是在其他客户端中创建的）重新同步一次再查找。
+
+        Args:
+            project_name: 项目名称
+
+        Returns:
+            Optional[str]: 项目ID，未找到时返回None
+        """
+        if not project_name:
+            return None
+        was_loaded = self.resolver.loaded
+        project_id = self._ensure_resolver().project_id(project_name)
+        if project_id is None and was_loaded:
+            self._fetch_sync()
+            project_id = self.resolver.project_id(project_name)
+        return project_id
+
+    def _build_task_payload(self, title: str, content: Optional[str] = None, priority: Optional[int] = None,
+                            project_id: Optional[str] = None, tag_names: Optional[List[str]] = None,
+                            start_date: Optional[str] = None, due_date: Optional[str] = None,
+                            is_all_day: bool = False, reminder: Optional[Union[str, ReminderOption]] = None,
+                            parent_id: Optional[str] = None, task_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        构建创建任务的请求数据
+
         Args:
             title: 任务标题
             content: 任务内容
-            priority: 优先级 (0-最低, 1-低, 3-中, 5-高)
-            project_name: 项目名称
+            priority: 优先级
+            project_id: 项目ID
             tag_names: 标签名称列表
             start_date: 开始时间 (格式: YY-MM-DD HH:MM:SS)
             due_date: 到期时间 (格式: YY-MM-DD HH:MM:SS)
             is_all_day: 是否为全天任务
-            reminder: 提醒时间，支持以下格式：
-                     - "0": 准时提醒
-                     - "-5M": 提前5分钟
-                     - "-1H": 提前1小时
-                     - "-1D": 提前1天
-                     - "-1W": 提前1周
-                     也可以使用 ReminderOption 枚举值
-            parent_id: 父任务ID（如果是子任务）
-            
+            reminder: 提醒时间
+            parent_id: 父任务ID
+            task_id: 任务ID，默认在本地生成
+
         Returns:
-            Dict[str, Any]: 创建的任务数据
+            Dict[str, Any]: API格式的任务数据
         """
-        # 获取项目列表
-        response = self._get("/api/v2/batch/check/0")
-        projects = response.get('projectProfiles', [])
-        
-        # 构建基本任务数据
+        # 构建基本任务数据，ID在本地生成，创建请求可以安全重试
         task_data = {
+            'id': task_id or generate_id(),
             'title': title,
             'content': content or '',
             'priority': priority or 0,
@@ -631,11 +863,8 @@ class TaskAPI(BaseAPI):
         }
         
         # 处理项目信息
-        if project_name:
-            for project in projects:
-                if project['name'] == project_name:
-                    task_data['projectId'] = project['id']
-                    break
+        if project_id:
+            task_data['projectId'] = project_id
         
         # 处理标签
         if tag_names:
@@ -676,15 +905,117 @@ class TaskAPI(BaseAPI):
             task_data['dueDate'] = self._convert_date_format(date_str=due_date)
         
         # 设置时区
-        task_data['timeZone'] = 'Asia/Shanghai'
+        task_data['timeZone'] = self.timezone
         task_data['isFloating'] = False
+        return task_data
+
+    def create_task(self, title: str, content: Optional[str] = None, priority: Optional[int] = None,
+                  project_name: Optional[str] = None, tag_names: Optional[List[str]] = None,
+                  start_date: Optional[str] = None, due_date: Optional[str] = None,
+                  is_all_day: bool = False, reminder: Optional[Union[str, ReminderOption]] = None,
+                  parent_id: Optional[str] = None, task_id: Optional[str] = None,
+                  max_retries: int = 2) -> Dict[str, Any]:
+        """
+        创建新任务
+
+        任务ID在本地生成（也可以通过 task_id 指定），网络错误或服务端错误时用同一个ID重试，
+        不会重复创建任务。
+        
+        Args:
+            title: 任务标题
+            content: 任务内容
+            priority: 优先级 (0-最低, 1-低, 3-中, 5-高)
+            project_name: 项目名称
+            tag_names: 标签名称列表
+            start_date: 开始时间 (格式: YY-MM-DD HH:MM:SS)
+            due_date: 到期时间 (格式: YY-MM-DD HH:MM:SS)
+            is_all_day: 是否为全天任务
+            reminder: 提醒时间，支持以下格式：
+                     - "0": 准时提醒
+                     - "-5M": 提前5分钟
+                     - "-1H": 提前1小时
+                     - "-1D": 提前1天
+                     - "-1W": 提前1周
+                     也可以使用 ReminderOption 枚举值
+            parent_id: 父任务ID（如果是子任务）
+            task_id: 任务ID，默认在本地生成。调用方可以预先生成ID，在响应返回前建立本地索引
+            max_retries: 最多重试次数
+            
+        Returns:
+            Dict[str, Any]: 创建的任务数据
+
+        Raises:
+            ValueError: 未找到 project_name 对应的项目
+        """
+        project_id = self._resolve_project_id(project_name)
+        if project_name and project_id is None:
+            raise ValueError(f"未找到项目: {project_name}")
+        task_data = self._build_task_payload(
+            title, content=content, priority=priority,
+            project_id=project_id,
+            tag_names=tag_names, start_date=start_date, due_date=due_date,
+            is_all_day=is_all_day, reminder=reminder, parent_id=parent_id, task_id=task_id
+        )
         
         # 发送创建任务请求
-        response = self._post("/api/v2/task", data=task_data)
+        response = self._post_with_retry("/api/v2/task", task_data, max_retries)
         
         # 简化并返回创建的任务数据
         return self._simplify_task_data(response)
 
+    def create_tasks(self, tasks: List[Dict[str, Any]], chunk_size: int = BATCH_CHUNK_SIZE,
+                     max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量创建任务，通过 /api/v2/batch/task 分块提交
+
+        项目名称通过名称解析缓存解析（缓存为空时只同步一次），
+        任务ID在本地生成，服务端返回的结果按ID对应回输入。网络错误或服务端错误时整块重试。
+
+        Args:
+            tasks: 任务列表，每个元素的键与 create_task 的参数相同，例如
+                   {"title": "任务", "project_name": "工作", "tag_names": ["重要"], "due_date": "2024-02-20 18:00:00"}
+            chunk_size: 每个请求最多包含的任务数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一一对应的结果，每项为 {"success", "info", "data"}，
+                成功时 data 为创建的任务数据（包含ID），未找到项目的任务不会提交
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+        project_ids: Dict[str, Optional[str]] = {}  # 每个项目名称只解析一次
+        pending = []
+        payloads = []
+        for position, task in enumerate(tasks):
+            options = dict(task)
+            title = options.pop('title')
+            project_name = options.pop('project_name', None)
+            if project_name and project_name not in project_ids:
+                project_ids[project_name] = self._resolve_project_id(project_name)
+            project_id = project_ids.get(project_name) if project_name else None
+            if project_name and project_id is None:
+                results[position] = {"success": False, "info": f"未找到项目: {project_name}", "data": task}
+                continue
+            # 任务ID在本地生成（或由 task_id 指定），用于对应批量结果
+            payloads.append(self._build_task_payload(title, project_id=project_id, **options))
+            pending.append(position)
+
+        batch_results = self._post_batch("/api/v2/batch/task", "add", payloads, key=lambda item: item['id'],
+                                         chunk_size=chunk_size, max_retries=max_retries)
+        for position, result in zip(pending, batch_results):
+            results[position] = self._task_batch_result(result, "任务创建成功")
+        return results
+
+    def _task_batch_result(self, result: Dict[str, Any], success_info: str) -> Dict[str, Any]:
+        """将批量接口的单条结果转换为 {"success", "info", "data"} 格式"""
+        data = dict(result['data'])
+        if result['etag']:
+            data['etag'] = result['etag']
+        return {
+            "success": result['success'],
+            "info": success_info if result['success'] else result['info'],
+            "data": self._simplify_task_data(data)
+        }
+
     def _find_tasks_by_title(self, title: str) -> List[Dict[str, Any]]:
         """
         通过标题模糊匹配查找任务
@@ -695,26 +1026,26 @@ class TaskAPI(BaseAPI):
         Returns:
             List[Dict[str, Any]]: 匹配的任务列表
         """
-        all_tasks = self.get_all_tasks()
-        matched_tasks = []
-        
-        def search_tasks(tasks: List[Dict[str, Any]]):
-            for task in tasks:
-                if title.lower() in task['title'].lower():
-                    matched_tasks.append(task)
-                if task.get('children'):
-                    search_tasks(task['children'])
-        
-        search_tasks(all_tasks)
-        return matched_tasks
+        self.get_all_tasks()
+        keyword = title.lower()
+        # 按先序遍历树索引，结果顺序与逐层递归查找一致
+        return [
+            task for task in map(self._tree_index.get, self._tree_index.preorder())
+            if keyword in task['title'].lower()
+        ]
 
     def update_task(self, task_id_or_title: str, title: Optional[str] = None, content: Optional[str] = None,
                    priority: Optional[int] = None, project_name: Optional[str] = None,
                    tag_names: Optional[List[str]] = None, start_date: Optional[str] = None,
                    due_date: Optional[str] = None, is_all_day: Optional[bool] = None,
-                   reminder: Optional[Union[str, ReminderOption]] = None, status: Optional[int] = None) -> Dict[str, Any]:
+                   reminder: Optional[Union[str, ReminderOption]] = None, status: Optional[int] = None,
+                   task: Optional[Dict[str, Any]] = None, on_conflict: str = "merge") -> Dict[str, Any]:
         """
         更新任务，支持通过ID或标题（模糊匹配）更新
+
+        传入 task 快照时不再重新读取任务，而是带上快照中的 etag 做条件更新，只发送发生变化的字段。
+        任务在读取快照之后被其他客户端修改时会产生冲突，按 on_conflict 处理：
+        "merge" 重新读取任务，把本次修改应用到最新数据上后重试；"fail" 直接返回失败和最新的任务数据。
         
         Args:
             task_id_or_title: 任务ID或标题
@@ -734,10 +1065,19 @@ class TaskAPI(BaseAPI):
                      - "-1W": 提前1周
                      也可以使用 ReminderOption 枚举值
             status: 新的任务状态
+            task: 调用方持有的任务快照（简化格式，需包含 id、projectId 和 etag）
+            on_conflict: etag 冲突时的处理方式，"merge" 或 "fail"
             
         Returns:
             Dict[str, Any]: 更新后的任务数据或错误信息
         """
+        if task is not None:
+            return self._update_task_conditional(
+                task, on_conflict, title=title, content=content, priority=priority,
+                project_name=project_name, tag_names=tag_names, start_date=start_date,
+                due_date=due_date, is_all_day=is_all_day, reminder=reminder, status=status
+            )
+
         # 尝试直接通过ID获取任务
         task = self.get_task(task_id_or_title)
         
@@ -774,13 +1114,11 @@ class TaskAPI(BaseAPI):
             update_data['status'] = status
         
         # 处理项目信息
-        if project_name is not None:
-            response = self._get("/api/v2/batch/check/0")
-            projects = response.get('projectProfiles', [])
-            for project in projects:
-                if project['name'] == project_name:
-                    update_data['projectId'] = project['id']
-                    break
+        if project_name:
+            project_id = self._resolve_project_id(project_name)
+            if project_id is None:
+                return {"success": False, "info": f"未找到项目: {project_name}", "data": task}
+            update_data['projectId'] = project_id
         
         # 处理标签
         if tag_names is not None:
@@ -842,6 +1180,206 @@ class TaskAPI(BaseAPI):
                 "data": None
             }
 
+    def _update_task_conditional(self, task: Dict[str, Any], on_conflict: str = "merge",
+                                 project_name: Optional[str] = None, max_conflicts: int = 3,
+                                 **fields) -> Dict[str, Any]:
+        """
+        基于任务快照的条件更新
+
+        请求中带上快照的 etag，服务端返回该任务的错误（或 409/412）时视为冲突。
+
+        Args:
+            task: 任务快照
+            on_conflict: "merge" 重新读取后合并重试，"fail" 直接返回失败
+            project_name: 新的项目名称
+            max_conflicts: merge 模式下最多处理的冲突次数
+            **fields: 与 update_task 相同的更新参数
+
+        Returns:
+            Dict[str, Any]: {"success", "info", "data"}
+        """
+        if on_conflict not in ("merge", "fail"):
+            raise ValueError(f"不支持的冲突处理方式: {on_conflict}")
+
+        project_id = None
+        if project_name is not None:
+            project_id = self._resolve_project_id(project_name)
+            if project_id is None:
+                return {"success": False, "info": f"未找到项目: {project_name}", "data": task}
+
+        current = task
+        for _ in range(max_conflicts + 1):
+            changes, updated = self._build_task_changes(current, project_id=project_id, **fields)
+            if not changes:
+                return {"success": True, "info": "无需更新", "data": current}
+
+            payload = {'id': current['id'], 'projectId': current.get('projectId')}
+            if current.get('etag'):
+                payload['etag'] = current['etag']
+            payload.update(changes)
+
+            error = None
+            try:
+                response = self._post("/api/v2/batch/task", data={"add": [], "update": [payload], "delete": []})
+            except APIError as e:
+                if e.status_code not in (409, 412):
+                    return {"success": False, "info": f"更新任务失败: {str(e)}", "data": current}
+                error = str(e)
+            except Exception as e:
+                return {"success": False, "info": f"更新任务失败: {str(e)}", "data": current}
+            else:
+                response = response if isinstance(response, dict) else {}
+                error = response.get('id2error', {}).get(current['id'])
+                if error is None:
+                    result = dict(current, **updated)
+                    etag = response.get('id2etag', {}).get(current['id'])
+                    if etag:
+                        result['etag'] = etag
+                    return {"success": True, "info": "任务更新成功", "data": result}
+
+            # 冲突：任务已被其他客户端修改
+            latest = self.get_task(current['id'])
+            if latest is None:
+                return {"success": False, "info": f"更新任务失败: {error}", "data": current}
+            if on_conflict == "fail":
+                return {"success": False, "info": f"任务已被修改，更新冲突: {error}", "data": latest}
+            current = latest
+
+        return {"success": False, "info": "任务被频繁修改，多次重试后仍然冲突", "data": current}
+
+    def _build_task_changes(self, current: Dict[str, Any], project_id: Optional[str] = None,
+                            title: Optional[str] = None, content: Optional[str] = None,
+                            priority: Optional[int] = None, tag_names: Optional[List[str]] = None,
+                            start_date: Optional[str] = None, due_date: Optional[str] = None,
+                            is_all_day: Optional[bool] = None,
+                            reminder: Optional[Union[str, ReminderOption]] = None,
+                            status: Optional[int] = None) -> tuple:
+        """
+        计算任务需要更新的字段，与当前值相同的字段会被忽略
+
+        Args:
+            current: 简化后的当前任务数据
+            project_id: 新的项目ID
+            其余参数与 update_task 相同
+
+        Returns:
+            tuple: (API格式的变更字段, 简化格式的变更字段)，没有变化时均为空字典
+        """
+        changes: Dict[str, Any] = {}
+        updated: Dict[str, Any] = {}
+
+        def change(field: str, value: Any, api_value: Any = None) -> None:
+            if current.get(field) != value:
+                updated[field] = value
+                changes[field] = value if api_value is None else api_value
+
+        if title is not None:
+            change('title', title)
+        if content is not None:
+            change('content', content)
+        if priority is not None:
+            change('priority', priority)
+        if status is not None:
+            change('status', status)
+        if project_id is not None:
+            change('projectId', project_id)
+        if tag_names is not None:
+            change('tags', list(tag_names))
+
+        # 简化后的时间是本地时间字符串，可以直接与输入比较
+        if start_date is not None:
+            change('startDate', start_date, self._convert_date_format(date_str=start_date))
+        if due_date is not None:
+            if is_all_day or (is_all_day is None and current.get('isAllDay')):
+                # 全天任务的结束时间是23:59:59
+                dt = datetime.strptime(due_date, "%Y-%m-%d %H:%M:%S").replace(hour=23, minute=59, second=59)
+                change('dueDate', dt.strftime("%Y-%m-%d %H:%M:%S"), self._convert_date_format(date_obj=dt))
+            else:
+                change('dueDate', due_date, self._convert_date_format(date_str=due_date))
+        if is_all_day is not None:
+            change('isAllDay', is_all_day)
+
+        if reminder is not None:
+            if reminder:
+                reminder_value = reminder.value if isinstance(reminder, ReminderOption) else reminder
+                reminder_trigger = self._convert_reminder_format(reminder_value)
+                if current.get('reminder') != reminder_trigger:
+                    reminders = [{'id': self._generate_reminder_id(), 'trigger': reminder_trigger}]
+                    updated.update(reminder=reminder_trigger, reminders=reminders)
+                    changes.update(reminder=reminder_trigger, reminders=reminders)
+            elif current.get('reminder') or current.get('reminders'):
+                # 清除提醒，reminder 也要清除，否则合并到当前数据时会留下旧的提醒
+                updated.update(reminder=None, reminders=[])
+                changes.update(reminder=None, reminders=[])
+
+        return changes, updated
+
+    def update_tasks(self, changes: List[Dict[str, Any]], chunk_size: int = BATCH_CHUNK_SIZE,
+                     max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量更新任务，通过 /api/v2/batch/task 分块提交
+
+        只发送发生变化的字段（以及 id、projectId、etag），请求的值与当前值完全相同的任务不会提交。
+        当前任务数据通过一次查询获取，找到全部任务后即停止读取；项目名称通过名称解析缓存解析。
+
+        Args:
+            changes: 变更列表，每个元素包含任务 "id"，其余键与 update_task 的参数相同，例如
+                     {"id": "67c5c01e6f3a314670cbebb6", "priority": 5, "due_date": "2024-02-20 18:00:00"}
+            chunk_size: 每个请求最多包含的任务数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一一对应的结果，每项为 {"success", "info", "data"}，
+                成功时 data 为更新后的任务数据
+        """
+        task_ids = [change['id'] for change in changes]
+        current_tasks = {task['id']: task for task in self.query().with_ids(*task_ids)}
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(changes)
+        project_ids: Dict[str, Optional[str]] = {}  # 每个项目名称只解析一次
+        pending = []
+        for position, change in enumerate(changes):
+            options = dict(change)
+            task_id = options.pop('id')
+            project_name = options.pop('project_name', None)
+            current = current_tasks.get(task_id)
+            if current is None:
+                results[position] = {"success": False, "info": f"未找到任务: {task_id}", "data": None}
+                continue
+
+            project_id = None
+            if project_name is not None:
+                if project_name not in project_ids:
+                    project_ids[project_name] = self._resolve_project_id(project_name)
+                project_id = project_ids[project_name]
+                if project_id is None:
+                    results[position] = {"success": False, "info": f"未找到项目: {project_name}", "data": current}
+                    continue
+
+            api_changes, updated = self._build_task_changes(current, project_id=project_id, **options)
+            if not api_changes:
+                results[position] = {"success": True, "info": "无需更新", "data": current}
+                continue
+
+            payload = {'id': task_id, 'projectId': current.get('projectId')}
+            if current.get('etag'):
+                payload['etag'] = current['etag']
+            payload.update(api_changes)
+            pending.append((position, payload, dict(current, **updated)))
+
+        batch_results = self._post_batch("/api/v2/batch/task", "update", [item[1] for item in pending],
+                                         key=lambda item: item['id'], chunk_size=chunk_size,
+                                         max_retries=max_retries)
+        for (position, _, updated_task), result in zip(pending, batch_results):
+            if result['success'] and result['etag']:
+                updated_task['etag'] = result['etag']
+            results[position] = {
+                "success": result['success'],
+                "info": "任务更新成功" if result['success'] else result['info'],
+                "data": updated_task
+            }
+        return results
+
     def delete_task(self, task_id_or_title: str) -> Dict[str, Any]:
         """
         删除任务，支持通过ID或标题（模糊匹配）删除
@@ -904,6 +1442,335 @@ class TaskAPI(BaseAPI):
                 "data": task
             }
 
+    def _resolve_targets(self, ids_or_query: Union[Iterable[str], TaskQuery]) -> tuple:
+        """
+        在本地解析批量操作的目标任务
+
+        Args:
+            ids_or_query: 任务ID列表或 TaskQuery 查询对象
+
+        Returns:
+            tuple: (结果列表, [(位置, 任务)])，结果列表与输入一一对应，未找到的ID已经填入失败结果
+        """
+        if isinstance(ids_or_query, TaskQuery):
+            targets = list(ids_or_query)
+            return [None] * len(targets), list(enumerate(targets))
+
+        task_ids = list(ids_or_query)
+        tasks = {task['id']: task for task in self.query().with_ids(*task_ids)}
+        results: List[Optional[Dict[str, Any]]] = [None] * len(task_ids)
+        found = []
+        for position, task_id in enumerate(task_ids):
+            if task_id in tasks:
+                found.append((position, tasks[task_id]))
+            else:
+                results[position] = {"success": False, "info": f"未找到任务: {task_id}", "data": None}
+        return results, found
+
+    def delete_tasks(self, ids_or_query: Union[Iterable[str], TaskQuery], chunk_size: int = BATCH_CHUNK_SIZE,
+                     max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量删除任务，通过 /api/v2/batch/task 分块提交
+
+        目标任务在本地解析：传入ID列表时通过一次查询获取任务所在项目，找到全部任务后即停止读取；
+        传入查询对象时删除查询的所有结果。
+
+        Args:
+            ids_or_query: 任务ID列表，或 TaskQuery 查询对象，例如
+                          client.tasks.query().in_project("归档").completed()
+            chunk_size: 每个请求最多包含的任务数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            List[Dict[str, Any]]: 每个任务的结果 {"success", "info", "data"}，传入ID列表时与输入顺序一一对应
+        """
+        results, found = self._resolve_targets(ids_or_query)
+        items = [{"taskId": task['id'], "projectId": task['projectId']} for _, task in found]
+        batch_results = self._post_batch("/api/v2/batch/task", "delete", items, key=lambda item: item['taskId'],
+                                         chunk_size=chunk_size, max_retries=max_retries)
+        for (position, task), result in zip(found, batch_results):
+            results[position] = {
+                "success": result['success'],
+                "info": f"成功删除任务 '{task['title']}'" if result['success'] else result['info'],
+                "data": task
+            }
+        return results
+
+    def complete_tasks(self, ids_or_query: Union[Iterable[str], TaskQuery], include_subtasks: bool = False,
+                       chunk_size: int = BATCH_CHUNK_SIZE, max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量完成任务，通过 /api/v2/batch/task 分块提交状态更新
+
+        Args:
+            ids_or_query: 任务ID列表，或 TaskQuery 查询对象
+            include_subtasks: 是否同时完成所有未完成的子孙任务
+            chunk_size: 每个请求最多包含的任务数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            List[Dict[str, Any]]: 每个任务的结果 {"success", "info", "data"}，前面部分与输入一一对应，
+                随之完成的子孙任务的结果追加在后面
+        """
+        return self._set_tasks_status(ids_or_query, 2, include_subtasks, chunk_size, max_retries)
+
+    def reopen_tasks(self, ids_or_query: Union[Iterable[str], TaskQuery], include_subtasks: bool = False,
+                     chunk_size: int = BATCH_CHUNK_SIZE, max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量将已完成的任务恢复为未完成，参数和返回值与 complete_tasks 相同
+        """
+        return self._set_tasks_status(ids_or_query, 0, include_subtasks, chunk_size, max_retries)
+
+    def _set_tasks_status(self, ids_or_query: Union[Iterable[str], TaskQuery], status: int,
+                          include_subtasks: bool, chunk_size: int, max_retries: int) -> List[Dict[str, Any]]:
+        """批量设置任务状态，状态已经相同的任务不会提交"""
+        results, found = self._resolve_targets(ids_or_query)
+        completing = status == 2
+
+        if include_subtasks and found:
+            # 子任务与父任务在同一个项目中，只需要读取相关项目的任务；
+            # 中间层级的子任务可能已经是目标状态，树中必须包含全部任务，否则其下的子任务会被遗漏
+            target_ids = {task['id'] for _, task in found}
+            project_ids = {task['projectId'] for _, task in found if task.get('projectId')}
+            candidates = {task['id']: task for task in self.query().in_project(*project_ids)}
+            candidates.update((task['id'], task) for _, task in found)
+            index = TaskTreeIndex(candidates.values())
+            for _, task in list(found):
+                for child_id in index.descendants(task['id']):
+                    child = index.get(child_id)
+                    if child_id not in target_ids and child.get('status') != status:
+                        target_ids.add(child_id)
+                        results.append(None)
+                        found.append((len(results) - 1, child))
+
+        completed_time = self._convert_date_format(date_obj=datetime.now(self.tz)) if completing else None
+        updates = []
+        pending = []
+        for position, task in found:
+            if task.get('status') == status:
+                results[position] = {"success": True, "info": "无需更新", "data": task}
+                continue
+            updates.append({'id': task['id'], 'projectId': task.get('projectId'),
+                            'status': status, 'completedTime': completed_time})
+            pending.append((position, task))
+
+        batch_results = self._post_batch("/api/v2/batch/task", "update", updates, key=lambda item: item['id'],
+                                         chunk_size=chunk_size, max_retries=max_retries)
+        success_info = "任务已完成" if completing else "任务已恢复为未完成"
+        for (position, task), result in zip(pending, batch_results):
+            updated = dict(task, status=status, isCompleted=completing)
+            if completing:
+                updated['completedTime'] = datetime.now(self.tz).strftime("%Y-%m-%d %H:%M:%S")
+            else:
+                updated.pop('completedTime', None)
+            if result['success'] and result['etag']:
+                updated['etag'] = result['etag']
+            results[position] = {
+                "success": result['success'],
+                "info": success_info if result['success'] else result['info'],
+                "data": updated if result['success'] else task
+            }
+        return results
+
+    def add_tags(self, task_selector: Union[Iterable[str], TaskQuery], tags: List[str],
+                 chunk_size: int = BATCH_CHUNK_SIZE, max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量为任务添加标签
+
+        新的标签列表在本地根据任务快照计算，已经包含所有标签的任务不会提交，其余任务通过
+        /api/v2/batch/task 分块更新 tags 字段。
+
+        Args:
+            task_selector: 任务ID列表，或 TaskQuery 查询对象
+            tags: 要添加的标签名称
+            chunk_size: 每个请求最多包含的任务数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            List[Dict[str, Any]]: 每个任务的结果 {"success", "info", "data"}，传入ID列表时与输入顺序一一对应
+        """
+        def add(current: List[str]) -> List[str]:
+            return current + [tag for tag in dict.fromkeys(tags) if tag not in current]
+        return self._update_tags(task_selector, add, chunk_size, max_retries)
+
+    def remove_tags(self, task_selector: Union[Iterable[str], TaskQuery], tags: List[str],
+                    chunk_size: int = BATCH_CHUNK_SIZE, max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量移除任务的标签，参数和返回值与 add_tags 相同；不包含这些标签的任务不会提交
+        """
+        removed = set(tags)
+
+        def remove(current: List[str]) -> List[str]:
+            return [tag for tag in current if tag not in removed]
+        return self._update_tags(task_selector, remove, chunk_size, max_retries)
+
+    def _update_tags(self, task_selector: Union[Iterable[str], TaskQuery],
+                     compute: Callable[[List[str]], List[str]], chunk_size: int,
+                     max_retries: int) -> List[Dict[str, Any]]:
+        """根据任务当前的标签计算新标签，只提交发生变化的任务"""
+        results, found = self._resolve_targets(task_selector)
+        updates = []
+        pending = []
+        for position, task in found:
+            current = list(task.get('tags') or [])
+            new_tags = compute(current)
+            if new_tags == current:
+                results[position] = {"success": True, "info": "无需更新", "data": task}
+                continue
+            update = {'id': task['id'], 'projectId': task.get('projectId'), 'tags': new_tags}
+            if task.get('etag'):
+                update['etag'] = task['etag']
+            updates.append(update)
+            pending.append((position, dict(task, tags=new_tags)))
+
+        batch_results = self._post_batch("/api/v2/batch/task", "update", updates, key=lambda item: item['id'],
+                                         chunk_size=chunk_size, max_retries=max_retries)
+        for (position, updated), result in zip(pending, batch_results):
+            if result['success'] and result['etag']:
+                updated['etag'] = result['etag']
+            results[position] = {
+                "success": result['success'],
+                "info": "任务标签更新成功" if result['success'] else result['info'],
+                "data": updated
+            }
+        return results
+
+    def move_tasks(self, task_ids: List[str], to_project: Optional[str] = None, to_column: Optional[str] = None,
+                   chunk_size: int = BATCH_CHUNK_SIZE, max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        批量移动任务到其他项目或看板栏目
+
+        目标项目和栏目只解析一次。跨项目移动通过 /api/v2/batch/taskProject 分块提交，
+        随后通过 /api/v2/batch/task 分块更新 sortOrder 和 columnId：移动的任务保持原有的相对顺序，
+        依次排在目标位置已有任务之后。总请求数与分块数成正比，与任务数无关。
+
+        Args:
+            task_ids: 任务ID列表
+            to_project: 目标项目名称或ID，为None时任务留在原项目中
+            to_column: 目标栏目名称或ID，为None时不指定栏目（跨项目移动时原栏目会被清除）；
+                目标项目中没有该栏目的任务返回失败。已经在目标位置的任务不会提交
+            chunk_size: 每个请求最多包含的任务数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            List[Dict[str, Any]]: 与输入顺序一一对应的结果，每项为 {"success", "info", "data"}，
+                成功时 data 为移动后的任务数据
+        """
+        response = self._fetch_sync()
+        projects = response.get('projectProfiles', [])
+        results: List[Optional[Dict[str, Any]]] = [None] * len(task_ids)
+
+        target_project = None
+        if to_project is not None:
+            target_project = next(
+                (project for project in projects if to_project in (project['name'], project['id'])), None
+            )
+            if target_project is None and not to_project.startswith('inbox'):
+                return [{"success": False, "info": f"未找到项目: {to_project}", "data": None} for _ in task_ids]
+
+        # 收集箱不在项目列表中，按ID直接使用
+        target_project_id = target_project['id'] if target_project else to_project
+
+        # 在已有的同步数据中查找任务，全部找到后不再请求已完成任务
+        project_table, tag_table = self._snapshot_tables(projects, response.get('tags', []))
+        remaining = set(task_ids)
+        tasks = {}
+        for raw in itertools.chain(self._iter_uncompleted_raw(response),
+                                   self._iter_completed_raw(project['id'] for project in projects)):
+            if raw['id'] in remaining:
+                remaining.discard(raw['id'])
+                tasks[raw['id']] = self._prepare_task(dict(raw), project_table, tag_table)
+                if not remaining:
+                    break
+        project_names = {project['id']: project['name'] for project in projects}
+        columns_by_project = {project['id']: project.get('columns') or [] for project in projects}
+
+        def target_of(task: Dict[str, Any]) -> tuple:
+            """任务移动后所在的 (项目ID, 栏目ID)，目标项目中没有 to_column 对应的栏目时栏目ID为None"""
+            project_id = target_project_id or task['projectId']
+            if to_column is None:
+                column_id = task.get('columnId') if project_id == task['projectId'] else None
+            else:
+                column_id = next(
+                    (column['id'] for column in columns_by_project.get(project_id, [])
+                     if to_column in (column.get('name'), column['id'])),
+                    None
+                )
+            return project_id, column_id
+
+        moving = []
+        targets = {}
+        for position, task_id in enumerate(task_ids):
+            task = tasks.get(task_id)
+            if task is None:
+                results[position] = {"success": False, "info": f"未找到任务: {task_id}", "data": None}
+                continue
+            target = target_of(task)
+            if to_column is not None and target[1] is None:
+                results[position] = {"success": False, "info": f"未找到栏目: {to_column}", "data": task}
+            elif target == (task['projectId'], task.get('columnId')):
+                # 已经在目标位置，不改变原有的排序
+                results[position] = {"success": True, "info": "任务已在目标位置", "data": task}
+            else:
+                targets[task_id] = target
+                moving.append((position, task))
+
+        # 跨项目移动
+        cross_project = [
+            {"taskId": task['id'], "fromProjectId": task['projectId'], "toProjectId": targets[task['id']][0]}
+            for _, task in moving if targets[task['id']][0] != task['projectId']
+        ]
+        failed = {}
+        for chunk in self._chunked(cross_project, chunk_size):
+            try:
+                result = self._post_with_retry("/api/v2/batch/taskProject", chunk, max_retries)
+            except Exception as e:
+                failed.update((item['taskId'], f"移动项目失败: {str(e)}") for item in chunk)
+                continue
+            id2error = result.get('id2error', {}) if isinstance(result, dict) else {}
+            failed.update((task_id, f"移动项目失败: {error}") for task_id, error in id2error.items())
+
+        # 目标位置已有任务的最大 sortOrder
+        max_order: Dict[tuple, int] = {}
+        moving_ids = {task['id'] for _, task in moving}
+        for raw in self._iter_uncompleted_raw(response):
+            if raw['id'] in moving_ids:
+                continue
+            key = (raw.get('projectId'), raw.get('columnId'))
+            max_order[key] = max(max_order.get(key, raw.get('sortOrder', 0)), raw.get('sortOrder', 0))
+
+        updates = []
+        pending = []
+        for position, task in sorted(moving, key=lambda item: item[1].get('sortOrder', 0)):
+            if task['id'] in failed:
+                results[position] = {"success": False, "info": failed[task['id']], "data": task}
+                continue
+            project_id, column_id = targets[task['id']]
+            key = (project_id, column_id)
+            max_order[key] = max_order.get(key, 0) + SORT_ORDER_STEP
+            update = {'id': task['id'], 'projectId': project_id, 'sortOrder': max_order[key]}
+            if column_id is not None:
+                update['columnId'] = column_id
+            updates.append(update)
+            moved = dict(task, projectId=project_id, sortOrder=update['sortOrder'])
+            moved['projectName'] = project_names.get(project_id, task.get('projectName'))
+            if column_id is None:
+                moved.pop('columnId', None)
+            else:
+                moved['columnId'] = column_id
+            pending.append((position, moved))
+
+        batch_results = self._post_batch("/api/v2/batch/task", "update", updates, key=lambda item: item['id'],
+                                         chunk_size=chunk_size, max_retries=max_retries)
+        for (position, moved), result in zip(pending, batch_results):
+            if result['success'] and result['etag']:
+                moved['etag'] = result['etag']
+            results[position] = {
+                "success": result['success'],
+                "info": "任务移动成功" if result['success'] else result['info'],
+                "data": moved
+            }
+        return results
+
     def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
         """
         获取单个任务的详细信息
@@ -2,8 +2,11 @@
 滴答清单SDK主客户端
 """
 from typing import Optional
-from .api import TaskAPI, ProjectAPI, TagAPI
+from .api import TaskAPI, ProjectAPI, TagAPI, WriteBuffer, Batch
+from .api.base import BATCH_CHUNK_SIZE
 from .utils.auth import TokenManager
+from .utils.resolver import NameResolver
+from .utils.timezone import DEFAULT_TIMEZONE, get_timezone
 from .exceptions import ConfigurationError
 
 class DidaClient:
@@ -23,7 +26,8 @@ class DidaClient:
         self,
         email: Optional[str] = None,
         password: Optional[str] = None,
-        token: Optional[str] = None
+        token: Optional[str] = None,
+        timezone: str = DEFAULT_TIMEZONE
     ):
         """
         初始化客户端
@@ -32,12 +36,19 @@ class DidaClient:
             email: 用户邮箱
             password: 用户密码
             token: 访问令牌。如果提供了token，将优先使用token而不是邮箱密码
+            timezone: 本地时区名称（如 "America/New_York"），输入的时间按该时区解释，
+                返回的时间转换为该时区，"今天"等按该时区的日期计算
             
         Raises:
             ConfigurationError: 当既没有提供有效的token，也没有提供正确的邮箱密码组合时
         """
         # 初始化Token管理器
         self._token_manager = TokenManager(token)
+        get_timezone(timezone)  # 尽早发现无效的时区名称
+        self.timezone = timezone
+        self.write_buffer: Optional[WriteBuffer] = None
+        # 各API模块共享的名称解析缓存
+        self.resolver = NameResolver()
         
         # 如果没有token，尝试使用邮箱密码登录获取token
         if not token and email and password:
@@ -54,9 +65,60 @@ class DidaClient:
     
     def _init_apis(self):
         """初始化API模块"""
-        self.tasks = TaskAPI(self._token_manager.token)
-        self.projects = ProjectAPI(self._token_manager.token)
-        self.tags = TagAPI(self._token_manager.token)
+        self.tasks = TaskAPI(self._token_manager.token, resolver=self.resolver, timezone=self.timezone)
+        self.projects = ProjectAPI(self._token_manager.token, resolver=self.resolver, timezone=self.timezone)
+        self.tags = TagAPI(self._token_manager.token, resolver=self.resolver, timezone=self.timezone)
+        if self.write_buffer is not None:
+            # 已缓冲的修改使用新token提交
+            self.write_buffer.api = self.tasks
+
+    def enable_write_buffer(self, window: float = 0.5, max_size: int = BATCH_CHUNK_SIZE,
+                            chunk_size: int = BATCH_CHUNK_SIZE, max_retries: int = 2) -> WriteBuffer:
+        """
+        启用写缓冲，之后可以通过 client.write_buffer 缓冲修改，合并后批量提交
+
+        写缓冲是底层接口，只合并通过返回的 WriteBuffer（add_task、update_project 等方法）
+        提交的修改，条目为批量接口的原始格式。client.tasks/projects/tags 的方法
+        （create_task、update_task、create_project 等）不会经过缓冲，启用后仍然各自立即发送请求。
+
+        Args:
+            window: 第一条修改进入缓冲后最多等待的秒数
+            max_size: 缓冲的条目数达到该值时立即提交
+            chunk_size: 每个请求最多包含的条目数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            WriteBuffer: 写缓冲，重复调用时返回已启用的缓冲
+        """
+        if self.write_buffer is None:
+            self.write_buffer = WriteBuffer(self.tasks, window=window, max_size=max_size,
+                                            chunk_size=chunk_size, max_retries=max_retries)
+        return self.write_buffer
+
+    def batch(self, chunk_size: int = BATCH_CHUNK_SIZE, max_retries: int = 2) -> Batch:
+        """
+        创建多操作批处理，在 with 块中收集操作，退出时按依赖顺序提交，失败时自动回滚
+
+        示例:
+            with client.batch() as batch:
+                batch.create_project("新项目")
+                batch.create_task("任务", project_name="新项目")
+            print(batch.result['info'])
+
+        Args:
+            chunk_size: 每个请求最多包含的条目数
+            max_retries: 每块最多重试次数
+
+        Returns:
+            Batch: 批处理
+        """
+        return Batch(self, chunk_size=chunk_size, max_retries=max_retries)
+
+    def disable_write_buffer(self):
+        """提交缓冲中剩余的修改并关闭写缓冲"""
+        if self.write_buffer is not None:
+            self.write_buffer.close()
+            self.write_buffer = None
     
     @property
     def token(self) -> str:
@@ -80,6 +142,21 @@ class DidaClient:
             登录成功后会自动更新客户端使用的token
         """
         self._token_manager.login(email, password)
+        self.resolver.clear()  # 可能是另一个账号，缓存需要重新同步
+        self._init_apis()
+    
+    def set_timezone(self, timezone: str):
+        """
+        设置本地时区
+        
+        Args:
+            timezone: 时区名称，如 "Asia/Shanghai"、"America/New_York"
+            
+        注意：
+            设置时区后会重新创建所有API模块，任务树索引和重复任务展开缓存会被清空
+        """
+        get_timezone(timezone)
+        self.timezone = timezone
         self._init_apis()
     
     def set_token(self, token: str):
@@ -93,4 +170,5 @@ class DidaClient:
             设置新token后会自动更新所有API模块使用的token
         """
         self._token_manager.token = token
+        self.resolver.clear()  # 可能是另一个账号，缓存需要重新同步
         self._init_apis() 
\ No newline at end of file
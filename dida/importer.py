@@ -0,0 +1,442 @@
+"""
+从 CSV/JSON/NDJSON 文件批量导入任务
+
+以流的方式读取文件，逐块映射为 create_task 的参数后通过批量接口提交：
+
+- 项目和标签只解析一次（名称解析缓存），缺失的项目和标签按块批量创建
+- 并发提交的块数有上限，达到上限时暂停读取文件（背压），内存占用与文件大小无关
+- 任务ID由导入种子和记录序号确定，中断后从检查点文件恢复时，重新提交的任务ID不变，不会重复创建
+
+库用法:
+    importer = TaskImporter(client, checkpoint="import.ckpt")
+    report = importer.run("tasks.csv")
+
+命令行用法:
+    dida-import tasks.csv --token YOUR_TOKEN --checkpoint import.ckpt --map "任务名称=title"
+"""
+from typing import Dict, Any, List, Optional, Iterator, Iterable, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+from .client import DidaClient
+from .api.base import BATCH_CHUNK_SIZE, BATCH_REQUEST_FAILED
+from .utils.ids import generate_seed, derive_id
+
+# 文件列名到 create_task 参数的默认映射
+DEFAULT_FIELD_MAP = {
+    'title': 'title',
+    'content': 'content',
+    'priority': 'priority',
+    'project': 'project_name',
+    'project_name': 'project_name',
+    'tags': 'tag_names',
+    'tag_names': 'tag_names',
+    'start_date': 'start_date',
+    'due_date': 'due_date',
+    'is_all_day': 'is_all_day',
+    'reminder': 'reminder',
+    '标题': 'title',
+    '内容': 'content',
+    '优先级': 'priority',
+    '项目': 'project_name',
+    '标签': 'tag_names',
+    '开始时间': 'start_date',
+    '截止时间': 'due_date',
+    '全天': 'is_all_day',
+    '提醒': 'reminder',
+}
+
+FORMATS = ('csv', 'json', 'ndjson')
+
+
+def detect_format(path: str) -> str:
+    """根据文件扩展名判断格式"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    if extension == '.json':
+        return 'json'
+    return 'csv'
+
+
+def _iter_json_array(fh, buffer_size: int = 65536) -> Iterator[Dict[str, Any]]:
+    """逐个解析顶层JSON数组中的元素，不把整个文件读入内存"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    eof = False
+    while True:
+        buffer = buffer.lstrip()
+        if not started:
+            if buffer:
+                if buffer[0] != '[':
+                    raise ValueError("JSON文件的顶层必须是数组")
+                buffer = buffer[1:]
+                started = True
+                continue
+        else:
+            if buffer.startswith(','):
+                buffer = buffer[1:]
+                continue
+            if buffer.startswith(']'):
+                return
+            if buffer:
+                try:
+                    item, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    # 元素可能恰好在块末尾被截断（例如数字），未到文件末尾时继续读取再解析
+                    if end < len(buffer) or eof:
+                        yield item
+                        buffer = buffer[end:]
+                        continue
+        if eof:
+            if started:
+                raise ValueError("JSON数组不完整")
+            return
+        chunk = fh.read(buffer_size)
+        if not chunk:
+            eof = True
+        buffer += chunk
+
+
+def read_records(path: str, fmt: Optional[str] = None, encoding: str = 'utf-8') -> Iterator[Dict[str, Any]]:
+    """
+    以流的方式读取文件中的记录
+
+    Args:
+        path: 文件路径
+        fmt: "csv"、"json" 或 "ndjson"，默认根据扩展名判断
+        encoding: 文件编码
+
+    Returns:
+        Iterator[Dict[str, Any]]: 记录
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"不支持的文件格式: {fmt}")
+    # utf-8-sig 兼容 Excel 导出的带 BOM 的 CSV
+    with open(path, 'r', encoding='utf-8-sig' if encoding == 'utf-8' else encoding, newline='') as fh:
+        if fmt == 'csv':
+            yield from csv.DictReader(fh)
+        elif fmt == 'ndjson':
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_array(fh)
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y', '是')
+    return bool(value)
+
+
+def _to_datetime_str(value: Any) -> Optional[str]:
+    """规范化为 create_task 使用的 "YYYY-MM-DD HH:MM:SS" 格式"""
+    if not value:
+        return None
+    value = str(value).strip().replace('T', ' ')
+    if len(value) == 10:
+        return f"{value} 00:00:00"
+    if len(value) == 16:
+        return f"{value}:00"
+    return value[:19]
+
+
+def map_record(record: Dict[str, Any], field_map: Dict[str, str]) -> Dict[str, Any]:
+    """
+    将一条记录映射为 create_task 的参数
+
+    Args:
+        record: 文件中的记录
+        field_map: 列名到 create_task 参数的映射
+
+    Returns:
+        Dict[str, Any]: create_task 的参数，没有标题时抛出 ValueError
+    """
+    options: Dict[str, Any] = {}
+    for column, value in record.items():
+        field = field_map.get(column)
+        if field is None or value is None or value == '':
+            continue
+        if field == 'tag_names':
+            if isinstance(value, str):
+                value = [tag.strip() for tag in value.replace(';', ',').split(',') if tag.strip()]
+        elif field == 'priority':
+            value = int(value)
+        elif field == 'is_all_day':
+            value = _to_bool(value)
+        elif field in ('start_date', 'due_date'):
+            value = _to_datetime_str(value)
+        options[field] = value
+    if not options.get('title'):
+        raise ValueError("缺少任务标题")
+    return options
+
+
+class ImportCheckpoint:
+    """
+    导入检查点：记录导入种子、块大小、已完成的块、永久失败的记录以及需要重新提交的记录，
+    每次更新后原子地写入文件
+    """
+
+    def __init__(self, path: Optional[str], chunk_size: int):
+        self.path = path
+        self.seed = generate_seed()  # 任务ID的种子，包含独立于 generate_id 的随机数
+        self.chunk_size = chunk_size
+        self.completed: set = set()
+        self.failed: Dict[int, List[Dict[str, Any]]] = {}  # 块中永久失败的记录
+        self.pending: Dict[int, List[int]] = {}  # 已提交但有记录暂时失败的块，及需要重新提交的记录序号
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as fh:
+                state = json.load(fh)
+            self.seed = state['seed']
+            self.chunk_size = state['chunk_size']
+            self.completed = set(state.get('completed', []))
+            self.failed = {int(index): errors for index, errors in state.get('failed', {}).items()}
+            self.pending = {int(index): records for index, records in state.get('pending', {}).items()}
+
+    def mark_completed(self, chunk_index: int, errors: Iterable[Dict[str, Any]] = (),
+                       retry: Iterable[int] = ()) -> None:
+        """
+        记录块已经提交
+
+        Args:
+            chunk_index: 块序号
+            errors: 块中永久失败的记录（格式错误或服务端拒绝），恢复导入时计入报告，不会重新提交
+            retry: 暂时失败（网络错误或服务端错误）的记录序号，恢复导入时用相同的任务ID重新提交；
+                为空时该块完成
+        """
+        with self._lock:
+            errors = list(errors)
+            if errors:
+                self.failed[chunk_index] = self.failed.get(chunk_index, []) + errors
+            retry = sorted(retry)
+            if retry:
+                self.pending[chunk_index] = retry
+            else:
+                self.pending.pop(chunk_index, None)
+                self.completed.add(chunk_index)
+            self._save()
+
+    def _save(self) -> None:
+        """先写临时文件再替换，避免中断时留下损坏的检查点（需持有锁）"""
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as fh:
+            json.dump({'seed': self.seed, 'chunk_size': self.chunk_size,
+                       'completed': sorted(self.completed),
+                       'failed': {str(index): errors for index, errors in sorted(self.failed.items())},
+                       'pending': {str(index): records for index, records in sorted(self.pending.items())}},
+                      fh, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+
+class TaskImporter:
+    """
+    流式任务导入器
+
+    文件按 chunk_size 分块，每块先批量创建缺失的项目和标签，再通过 create_tasks 提交；
+    最多 max_workers 个块同时提交，另有同样数量的块可以排队，超过后暂停读取文件。
+    块中的有效记录提交后即在检查点中记录该块：格式错误或被服务端拒绝的记录一并写入检查点，
+    恢复时计入报告而不重新提交；网络错误或服务端错误导致失败的记录，以及提交过程中断的块，
+    恢复时会用相同的任务ID重新提交。
+    """
+
+    def __init__(self, client: DidaClient, field_map: Optional[Dict[str, str]] = None,
+                 chunk_size: int = BATCH_CHUNK_SIZE, max_workers: int = 4,
+                 checkpoint: Optional[str] = None, create_missing: bool = True):
+        """
+        初始化导入器
+
+        Args:
+            client: 客户端
+            field_map: 额外的列名映射，会覆盖默认映射，如 {"任务名称": "title"}
+            chunk_size: 每块的任务数（从检查点恢复时使用检查点中的块大小）
+            max_workers: 同时提交的最大块数
+            checkpoint: 检查点文件路径，为None时不记录进度
+            create_missing: 是否自动创建缺失的项目和标签
+        """
+        self.client = client
+        self.field_map = dict(DEFAULT_FIELD_MAP, **(field_map or {}))
+        self.max_workers = max_workers
+        self.checkpoint = ImportCheckpoint(checkpoint, chunk_size)
+        self.create_missing = create_missing
+        self._entity_lock = threading.Lock()
+
+    def run(self, path: str, fmt: Optional[str] = None, encoding: str = 'utf-8') -> Dict[str, Any]:
+        """
+        导入文件
+
+        Args:
+            path: 文件路径
+            fmt: "csv"、"json" 或 "ndjson"，默认根据扩展名判断
+            encoding: 文件编码
+
+        Returns:
+            Dict[str, Any]: {"success", "info", "data"}，data 包含 created、failed、skipped 数量和失败明细 errors
+        """
+        report = {'created': 0, 'failed': 0, 'skipped': 0, 'errors': []}
+        report_lock = threading.Lock()
+        self.client.tasks._ensure_resolver()
+
+        slots = threading.BoundedSemaphore(self.max_workers * 2)
+        futures: List[Future] = []
+
+        def submit(chunk_index: int, chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+            slots.acquire()  # 背压：排队的块过多时阻塞读取
+            future = executor.submit(self._import_chunk, chunk_index, chunk, report, report_lock)
+            future.add_done_callback(lambda _: slots.release())
+            futures.append(future)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for chunk_index, chunk in self._chunks(read_records(path, fmt, encoding)):
+                chunk = self._resume_chunk(chunk_index, chunk, report)
+                if chunk:
+                    submit(chunk_index, chunk)
+            for future in futures:
+                error = future.exception()
+                if error is not None:
+                    report['errors'].append({'record': None, 'info': f"导入失败: {str(error)}"})
+
+        success = report['failed'] == 0 and not report['errors']
+        return {
+            "success": success,
+            "info": f"导入完成: 创建 {report['created']} 个，失败 {report['failed']} 个，跳过 {report['skipped']} 个",
+            "data": report
+        }
+
+    def _chunks(self, records: Iterable[Dict[str, Any]]) -> Iterator[Tuple[int, List[Tuple[int, Dict[str, Any]]]]]:
+        """把记录按块大小分组，记录序号从0开始"""
+        chunk: List[Tuple[int, Dict[str, Any]]] = []
+        chunk_index = 0
+        for record_index, record in enumerate(records):
+            chunk.append((record_index, record))
+            if len(chunk) >= self.checkpoint.chunk_size:
+                yield chunk_index, chunk
+                chunk = []
+                chunk_index += 1
+        if chunk:
+            yield chunk_index, chunk
+
+    def _resume_chunk(self, chunk_index: int, chunk: List[Tuple[int, Dict[str, Any]]],
+                      report: Dict[str, Any]) -> List[Tuple[int, Dict[str, Any]]]:
+        """根据检查点取出块中仍需提交的记录，之前已经处理的记录计入报告"""
+        if chunk_index in self.checkpoint.completed:
+            remaining = []
+        elif chunk_index in self.checkpoint.pending:
+            retry = set(self.checkpoint.pending[chunk_index])
+            remaining = [(record_index, record) for record_index, record in chunk if record_index in retry]
+        else:
+            return chunk
+        previous_errors = self.checkpoint.failed.get(chunk_index, [])
+        report['skipped'] += len(chunk) - len(remaining) - len(previous_errors)
+        report['failed'] += len(previous_errors)
+        report['errors'].extend(previous_errors)
+        return remaining
+
+    def _record_id(self, record_index: int) -> str:
+        """由导入种子和记录序号确定的 ObjectId 格式任务ID，恢复导入时保持不变"""
+        return derive_id(self.checkpoint.seed, record_index)
+
+    def _import_chunk(self, chunk_index: int, chunk: List[Tuple[int, Dict[str, Any]]],
+                      report: Dict[str, Any], report_lock: threading.Lock) -> None:
+        """导入一个块（或从检查点恢复时块中需要重新提交的记录）"""
+        errors = []
+        tasks = []
+        record_indexes = []
+        for record_index, record in chunk:
+            try:
+                options = map_record(record, self.field_map)
+            except (ValueError, TypeError) as e:
+                errors.append({'record': record_index, 'info': f"记录格式错误: {str(e)}"})
+                continue
+            options['task_id'] = self._record_id(record_index)
+            tasks.append(options)
+            record_indexes.append(record_index)
+
+        if self.create_missing:
+            self._create_missing(tasks)
+        results = self.client.tasks.create_tasks(tasks) if tasks else []
+        created = 0
+        retry = []
+        transient_errors = []
+        for record_index, result in zip(record_indexes, results):
+            if result['success']:
+                created += 1
+            elif result['info'].startswith(BATCH_REQUEST_FAILED):
+                retry.append(record_index)
+                transient_errors.append({'record': record_index, 'info': result['info']})
+            else:
+                errors.append({'record': record_index, 'info': result['info']})
+
+        with report_lock:
+            report['created'] += created
+            report['failed'] += len(errors) + len(transient_errors)
+            report['errors'].extend(errors + transient_errors)
+        self.checkpoint.mark_completed(chunk_index, errors, retry)
+
+    def _create_missing(self, tasks: List[Dict[str, Any]]) -> None:
+        """批量创建块中引用但尚不存在的项目和标签；加锁避免并发的块重复创建"""
+        resolver = self.client.resolver
+        with self._entity_lock:
+            projects = list(dict.fromkeys(
+                task['project_name'] for task in tasks
+                if task.get('project_name') and resolver.project_id(task['project_name']) is None
+            ))
+            tags = list(dict.fromkeys(
+                tag for task in tasks for tag in task.get('tag_names') or ()
+                if resolver.tag(tag) is None
+            ))
+            if projects:
+                self.client.projects.create_projects([{'name': name} for name in projects])
+            if tags:
+                self.client.tags.create_tags([{'name': name} for name in tags])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(prog='dida-import', description='从 CSV/JSON/NDJSON 文件批量导入滴答清单任务')
+    parser.add_argument('path', help='要导入的文件')
+    parser.add_argument('--format', choices=FORMATS, help='文件格式，默认根据扩展名判断')
+    parser.add_argument('--encoding', default='utf-8', help='文件编码，默认 utf-8')
+    parser.add_argument('--token', default=os.environ.get('DIDA_TOKEN'), help='访问令牌，默认读取环境变量 DIDA_TOKEN')
+    parser.add_argument('--email', help='邮箱（未提供 token 时使用）')
+    parser.add_argument('--password', help='密码（未提供 token 时使用）')
+    parser.add_argument('--checkpoint', help='检查点文件，中断后使用同一个文件重新运行即可继续导入')
+    parser.add_argument('--chunk-size', type=int, default=BATCH_CHUNK_SIZE, help='每个批量请求的任务数')
+    parser.add_argument('--workers', type=int, default=4, help='同时提交的最大请求数')
+    parser.add_argument('--map', action='append', default=[], metavar='列名=字段',
+                        help='列名映射，如 "任务名称=title"，可以重复指定')
+    parser.add_argument('--no-create', action='store_true', help='不自动创建缺失的项目和标签')
+    args = parser.parse_args(argv)
+
+    field_map = {}
+    for mapping in args.map:
+        column, _, field = mapping.partition('=')
+        if not field:
+            parser.error(f"列名映射格式错误: {mapping}")
+        field_map[column] = field
+
+    client = DidaClient(email=args.email, password=args.password, token=args.token)
+    importer = TaskImporter(client, field_map=field_map, chunk_size=args.chunk_size, max_workers=args.workers,
+                            checkpoint=args.checkpoint, create_missing=not args.no_create)
+    result = importer.run(args.path, fmt=args.format, encoding=args.encoding)
+    print(result['info'])
+    for error in result['data']['errors'][:20]:
+        print(f"  记录 {error['record']}: {error['info']}", file=sys.stderr)
+    return 0 if result['success'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,5 +6,9 @@ from .task import Task
 from .project import Project
 from .tag import Tag
 from .base import BaseModel
+from .compact import CompactModel, CompactTask, CompactProject, CompactTag
 
-__all__ = ["Task", "Project", "Tag", "BaseModel"]
+__all__ = [
+    "Task", "Project", "Tag", "BaseModel",
+    "CompactModel", "CompactTask", "CompactProject", "CompactTag",
+]
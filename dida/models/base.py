@@ -7,6 +7,33 @@ import json
 
 T = TypeVar('T', bound='BaseModel')
 
+
+class LazyDatetime:
+    """
+    延迟解析的时间属性
+
+    赋值时只保存原始值（时间字符串或datetime），第一次读取时才调用实例的
+    _parse_datetime_with_timezone 解析，并用结果替换原始值，之后的读取直接返回缓存。
+    原始值保存在名为 "_属性名" 的实例属性中（使用 __slots__ 的类需要声明该 slot）。
+    """
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.storage = '_' + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = getattr(instance, self.storage, None)
+        if isinstance(value, str):
+            value = instance._parse_datetime_with_timezone(value)
+            setattr(instance, self.storage, value)
+        return value
+
+    def __set__(self, instance, value) -> None:
+        setattr(instance, self.storage, value or None)
+
+
 class BaseModel:
     """所有数据模型的基类"""
     
@@ -0,0 +1,171 @@
+"""
+紧凑数据模型
+
+Task/Project/Tag 的每个实例都带有 __dict__，属性较多的任务对象每个要占用一千多字节。
+这里的模型用 __slots__ 存储属性、在类上声明默认值，适合在内存中长时间保存大量对象（如统计分析），
+from_dict/to_dict 以及其他方法与对应的普通模型完全相同。
+"""
+from typing import Dict, Any
+import json
+from .task import Task
+from .project import Project
+from .tag import Tag
+from ..utils.timezone import DEFAULT_TIMEZONE
+
+
+class CompactModel:
+    """紧凑模型的基类，子类在 _defaults 中声明全部属性及默认值"""
+
+    __slots__ = ()
+    _defaults: Dict[str, Any] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # _defaults 中的属性必须都有对应的 slot 或描述符，否则要到实例化时才会报错
+        missing = {name for name in cls._defaults if not hasattr(cls, name)}
+        if missing:
+            raise TypeError(f"{cls.__name__} 的 __slots__ 缺少属性: {', '.join(sorted(missing))}")
+
+    def __init__(self, **kwargs):
+        """
+        初始化模型实例
+
+        Args:
+            **kwargs: 模型属性，只能是 _defaults 中声明的属性
+        """
+        for name, default in self._defaults.items():
+            value = kwargs.pop(name, default)
+            if isinstance(default, list) and not value:
+                # 列表默认值不能在实例之间共享
+                value = []
+            setattr(self, name, value)
+        if kwargs:
+            raise TypeError(f"{self.__class__.__name__} 不支持的属性: {', '.join(kwargs)}")
+
+    def __str__(self) -> str:
+        """返回模型的字符串表示"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def __repr__(self) -> str:
+        """返回模型的开发者字符串表示"""
+        return f"{self.__class__.__name__}({self.to_dict()})"
+
+
+class CompactTask(CompactModel):
+    """使用 __slots__ 的任务模型，行为与 Task 相同"""
+
+    __slots__ = (
+        'title', 'content', 'priority', 'status', '_start_date', '_due_date', 'project_id', 'tags',
+        'sort_order', 'time_zone', 'is_floating', 'is_all_day', 'reminder', 'reminders', 'repeat_flag',
+        'ex_date', 'items', 'progress', '_modified_time', 'etag', 'deleted', '_created_time', 'creator',
+        'attachments', 'column_id', 'kind', 'img_mode', 'id', 'created', 'modified',
+    )
+    _defaults = {
+        'title': '',
+        'content': '',
+        'priority': 0,
+        'status': 0,
+        'start_date': None,
+        'due_date': None,
+        'project_id': None,
+        'tags': [],
+        'sort_order': 0,
+        'time_zone': DEFAULT_TIMEZONE,
+        'is_floating': False,
+        'is_all_day': False,
+        'reminder': '',
+        'reminders': [],
+        'repeat_flag': '',
+        'ex_date': [],
+        'items': [],
+        'progress': 0,
+        'modified_time': None,
+        'etag': None,
+        'deleted': 0,
+        'created_time': None,
+        'creator': None,
+        'attachments': [],
+        'column_id': '',
+        'kind': 'TEXT',
+        'img_mode': 0,
+        'id': None,
+        'created': None,
+        'modified': None,
+    }
+
+    start_date = Task.start_date
+    due_date = Task.due_date
+    modified_time = Task.modified_time
+    created_time = Task.created_time
+    _parse_datetime_with_timezone = Task._parse_datetime_with_timezone
+    from_dict = classmethod(Task.from_dict.__func__)
+    to_dict = Task.to_dict
+    is_completed = Task.is_completed
+    is_overdue = Task.is_overdue
+    complete = Task.complete
+    uncomplete = Task.uncomplete
+    add_tag = Task.add_tag
+    remove_tag = Task.remove_tag
+
+
+class CompactProject(CompactModel):
+    """使用 __slots__ 的项目模型，行为与 Project 相同，项目下的任务为 CompactTask"""
+
+    __slots__ = ('name', 'color', 'group_id', 'tasks', 'in_all', 'kind', 'view_mode',
+                 'id', 'sort_order', 'sort_type')
+    _defaults = {
+        'name': '',
+        'color': '#FFD324',
+        'group_id': None,
+        'tasks': [],
+        'in_all': True,
+        'kind': 'TASK',
+        'view_mode': 'list',
+        'id': None,
+        'sort_order': None,
+        'sort_type': None,
+    }
+    task_class = CompactTask
+
+    from_dict = classmethod(Project.from_dict.__func__)
+    to_dict = Project.to_dict
+    add_task = Project.add_task
+    remove_task = Project.remove_task
+    get_task = Project.get_task
+    get_completed_tasks = Project.get_completed_tasks
+    get_uncompleted_tasks = Project.get_uncompleted_tasks
+
+
+class CompactTag(CompactModel):
+    """使用 __slots__ 的标签模型，行为与 Tag 相同，标签下的任务为 CompactTask"""
+
+    __slots__ = ('name', 'color', 'parent', 'sort_order', 'sort_type', 'tasks', 'label', 'id')
+    _defaults = {
+        'name': '',
+        'color': '#FFD457',
+        'parent': None,
+        'sort_order': -1099511693312,
+        'sort_type': 'project',
+        'tasks': [],
+        'label': None,
+        'id': None,
+    }
+    task_class = CompactTask
+
+    def __init__(self, **kwargs):
+        """
+        初始化标签实例
+
+        Args:
+            **kwargs: 与 Tag 的参数相同
+        """
+        kwargs.setdefault('label', kwargs.get('name', ''))
+        super().__init__(**kwargs)
+
+    from_dict = classmethod(Tag.from_dict.__func__)
+    to_dict = Tag.to_dict
+    add_task = Tag.add_task
+    remove_task = Tag.remove_task
+    get_task = Tag.get_task
+    get_completed_tasks = Tag.get_completed_tasks
+    get_uncompleted_tasks = Tag.get_uncompleted_tasks
@@ -8,6 +8,9 @@ from .task import Task
 class Project(BaseModel):
     """项目数据模型"""
     
+    # from_dict 创建项目下任务时使用的任务模型
+    task_class = Task
+    
     def __init__(
         self,
         name: str,
@@ -60,7 +63,7 @@ class Project(BaseModel):
         tasks = []
         if isinstance(data.get('tasks'), list):
             tasks = [
-                Task.from_dict(task_data)
+                cls.task_class.from_dict(task_data)
                 for task_data in data['tasks']
             ]
         
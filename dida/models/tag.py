@@ -8,6 +8,9 @@ from .task import Task
 class Tag(BaseModel):
     """标签数据模型"""
     
+    # from_dict 创建标签下任务时使用的任务模型
+    task_class = Task
+    
     def __init__(
         self,
         name: str,
@@ -51,7 +54,7 @@ class Tag(BaseModel):
             Tag: 标签实例
         """
         tasks = [
-            Task.from_dict(task_data)
+            cls.task_class.from_dict(task_data)
             for task_data in data.get('tasks', [])
         ]
         
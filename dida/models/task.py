@@ -3,12 +3,18 @@
 """
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-import pytz
-from .base import BaseModel
+from .base import BaseModel, LazyDatetime
+from ..utils.timezone import DEFAULT_TIMEZONE, UTC, get_timezone, localize
 
 class Task(BaseModel):
     """任务数据模型"""
     
+    # 时间字段在第一次读取时才解析，只读取部分字段时可以省去其余字段的解析开销
+    start_date = LazyDatetime()
+    due_date = LazyDatetime()
+    modified_time = LazyDatetime()
+    created_time = LazyDatetime()
+    
     def __init__(
         self,
         title: str,
@@ -20,7 +26,7 @@ class Task(BaseModel):
         project_id: Optional[str] = None,
         tags: Optional[List[str]] = None,
         sort_order: int = 0,
-        time_zone: str = "Asia/Shanghai",
+        time_zone: str = DEFAULT_TIMEZONE,
         is_floating: bool = False,
         is_all_day: bool = False,
         reminder: str = "",
@@ -53,7 +59,7 @@ class Task(BaseModel):
             project_id: 所属项目ID
             tags: 标签列表
             sort_order: 排序顺序
-            time_zone: 时区，默认为Asia/Shanghai
+            time_zone: 时区，时间属性按该时区表示，默认为Asia/Shanghai
             is_floating: 是否浮动
             is_all_day: 是否全天
             reminder: 提醒
@@ -78,8 +84,8 @@ class Task(BaseModel):
         self.priority = priority
         self.status = status
         self.time_zone = time_zone
-        self.start_date = self._parse_datetime_with_timezone(start_date)
-        self.due_date = self._parse_datetime_with_timezone(due_date)
+        self.start_date = start_date
+        self.due_date = due_date
         self.project_id = project_id
         self.tags = tags or []
         self.sort_order = sort_order
@@ -91,10 +97,10 @@ class Task(BaseModel):
         self.ex_date = ex_date or []
         self.items = items or []
         self.progress = progress
-        self.modified_time = self._parse_datetime_with_timezone(modified_time)
+        self.modified_time = modified_time
         self.etag = etag
         self.deleted = deleted
-        self.created_time = self._parse_datetime_with_timezone(created_time)
+        self.created_time = created_time
         self.creator = creator
         self.attachments = attachments or []
         self.column_id = column_id
@@ -110,14 +116,13 @@ class Task(BaseModel):
             date_str: ISO格式的时间字符串
             
         Returns:
-            datetime: 转换后的datetime对象（带时区信息）
+            datetime: 转换后的datetime对象（任务所在时区）
         """
         if not date_str:
             return None
             
         try:
-            # 设置默认时区为北京时间
-            local_tz = pytz.timezone('Asia/Shanghai')
+            local_tz = get_timezone(self.time_zone)
             
             # 如果是ISO格式带时区的时间
             if 'T' in date_str and ('+' in date_str or 'Z' in date_str):
@@ -126,13 +131,13 @@ class Task(BaseModel):
                 dt = datetime.fromisoformat(clean_date_str)
                 # 如果时间没有时区信息，假定为UTC时间
                 if dt.tzinfo is None:
-                    dt = pytz.UTC.localize(dt)
+                    dt = dt.replace(tzinfo=UTC)
             else:
-                # 如果是普通格式的时间字符串，直接作为北京时间处理
+                # 如果是普通格式的时间字符串，直接作为任务时区的本地时间处理
                 dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-                dt = local_tz.localize(dt)
+                dt = localize(dt, local_tz)
             
-            # 确保返回北京时间
+            # 确保返回任务时区的时间
             return dt.astimezone(local_tz)
         except Exception as e:
             print(f"Warning: Failed to parse datetime {date_str}: {e}")
@@ -159,7 +164,7 @@ class Task(BaseModel):
             project_id=data.get('projectId'),
             tags=data.get('tags', []),
             sort_order=data.get('sortOrder', 0),
-            time_zone=data.get('timeZone', 'Asia/Shanghai'),
+            time_zone=data.get('timeZone') or DEFAULT_TIMEZONE,
             is_floating=data.get('isFloating', False),
             is_all_day=data.get('isAllDay', False),
             reminder=data.get('reminder', ''),
@@ -195,7 +200,7 @@ class Task(BaseModel):
             'priority': self.priority,
             'status': self.status,
             'sortOrder': self.sort_order,
-            'timeZone': 'Asia/Shanghai',  # 固定使用北京时区
+            'timeZone': self.time_zone,
             'isFloating': self.is_floating,
             'isAllDay': self.is_all_day,
             'reminder': self.reminder,
@@ -210,19 +215,19 @@ class Task(BaseModel):
         
         # 转换时间为UTC时区（用于API请求）
         if self.start_date:
-            utc_start = self.start_date.astimezone(pytz.UTC)
+            utc_start = self.start_date.astimezone(UTC)
             data['startDate'] = utc_start.strftime("%Y-%m-%dT%H:%M:%S.000Z")
             
         if self.due_date:
-            utc_due = self.due_date.astimezone(pytz.UTC)
+            utc_due = self.due_date.astimezone(UTC)
             data['dueDate'] = utc_due.strftime("%Y-%m-%dT%H:%M:%S.000Z")
             
         if self.modified_time:
-            utc_modified = self.modified_time.astimezone(pytz.UTC)
+            utc_modified = self.modified_time.astimezone(UTC)
             data['modifiedTime'] = utc_modified.strftime("%Y-%m-%dT%H:%M:%S.000Z")
             
         if self.created_time:
-            utc_created = self.created_time.astimezone(pytz.UTC)
+            utc_created = self.created_time.astimezone(UTC)
             data['createdTime'] = utc_created.strftime("%Y-%m-%dT%H:%M:%S.000Z")
             
         if self.tags:
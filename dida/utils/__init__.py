@@ -4,5 +4,28 @@
 
 from .http import HttpClient
 from .auth import TokenManager, get_token
+from .tree_index import TaskTreeIndex, FilteredTaskTree, TaskView
+from .recurrence import RecurrenceEngine
+from .date_index import DateIndex
+from .scheduler import ReminderScheduler
+from .resolver import NameResolver
+from .ids import generate_id, generate_seed, derive_id
+from .timezone import DEFAULT_TIMEZONE, get_timezone
 
-__all__ = ["HttpClient", "TokenManager", "get_token"]
+__all__ = [
+    "HttpClient",
+    "TokenManager",
+    "get_token",
+    "TaskTreeIndex",
+    "FilteredTaskTree",
+    "TaskView",
+    "RecurrenceEngine",
+    "DateIndex",
+    "ReminderScheduler",
+    "NameResolver",
+    "generate_id",
+    "generate_seed",
+    "derive_id",
+    "DEFAULT_TIMEZONE",
+    "get_timezone",
+]
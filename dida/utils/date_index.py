@@ -0,0 +1,66 @@
+"""
+任务日期索引
+
+按开始时间排序保存任务的时间区间，窗口查询通过二分查找定位候选任务，
+重复任务交给 RecurrenceEngine 展开（带缓存）。
+"""
+from typing import Dict, Any, List, Iterable, Iterator, Tuple
+from datetime import datetime, timedelta
+import bisect
+from .recurrence import RecurrenceEngine, is_recurring
+
+
+class DateIndex:
+    """
+    任务日期索引
+
+    一次构建后可以对任意多个窗口查询，不需要每个窗口都重新扫描全部任务：
+    普通任务的候选范围是开始时间落在 [窗口开始 - 最长持续时间, 窗口结束) 内的任务。
+    """
+
+    def __init__(self, tasks: Iterable[Dict[str, Any]], engine: RecurrenceEngine):
+        """
+        构建索引
+
+        Args:
+            tasks: 扁平任务列表
+            engine: 重复任务展开引擎，同时决定任务时间的解析时区
+        """
+        self._engine = engine
+        spans = []
+        self._recurring: List[Dict[str, Any]] = []
+        for task in tasks:
+            if is_recurring(task):
+                self._recurring.append(task)
+                continue
+            span = engine.span(task)
+            if span is not None:
+                spans.append((span[0], span[1], task))
+        spans.sort(key=lambda entry: entry[0])
+        self._starts = [entry[0] for entry in spans]
+        self._spans = spans
+        self._max_duration = max((end - start for start, end, _ in spans), default=timedelta(0))
+
+    def __len__(self) -> int:
+        return len(self._spans) + len(self._recurring)
+
+    def occurrences(self, window_start: datetime,
+                    window_end: datetime) -> Iterator[Tuple[Dict[str, Any], datetime, datetime]]:
+        """
+        产出与窗口 [window_start, window_end) 重叠的所有发生
+
+        Args:
+            window_start: 窗口开始时间（带时区）
+            window_end: 窗口结束时间（带时区）
+
+        Yields:
+            (任务, 发生开始, 发生结束)
+        """
+        low = bisect.bisect_left(self._starts, window_start - self._max_duration)
+        high = bisect.bisect_left(self._starts, window_end)
+        for start, end, task in self._spans[low:high]:
+            if end >= window_start:
+                yield task, start, end
+        for task in self._recurring:
+            for start, end in self._engine.expand(task, window_start, window_end):
+                yield task, start, end
@@ -0,0 +1,74 @@
+"""
+客户端生成实体ID
+
+滴答清单的任务、项目和提醒ID都是24位十六进制的 ObjectId。ID在客户端生成后，创建请求可以安全重试，
+批量创建的结果可以按ID对应回输入，创建的实体也可以在服务端响应之前加入本地索引。
+"""
+import os
+import threading
+import time
+
+_lock = threading.Lock()
+_state = {'pid': None, 'process': b'', 'counter': 0}
+
+
+def _reset_for_process() -> None:
+    """为当前进程生成随机的进程标识和计数器初始值（需持有锁）"""
+    _state['pid'] = os.getpid()
+    _state['process'] = os.urandom(5)
+    _state['counter'] = int.from_bytes(os.urandom(3), 'big')
+
+
+def generate_id() -> str:
+    """
+    生成 ObjectId 格式的ID：4字节秒级时间戳 + 5字节进程随机数 + 3字节自增计数器
+
+    同一进程的多个线程通过锁共享计数器，fork 出的子进程会重新生成随机数，
+    因此不同线程和进程之间不会冲突；ID大致按生成时间递增。
+
+    Returns:
+        str: 24位十六进制ID，如 "67c5c01e6f3a314670cbebb6"
+    """
+    with _lock:
+        if _state['pid'] != os.getpid():
+            _reset_for_process()
+        _state['counter'] = (_state['counter'] + 1) & 0xFFFFFF
+        counter = _state['counter']
+        process = _state['process']
+    timestamp = int(time.time()) & 0xFFFFFFFF
+    return (timestamp.to_bytes(4, 'big') + process + counter.to_bytes(3, 'big')).hex()
+
+
+def generate_seed() -> str:
+    """
+    生成 derive_id 使用的种子：4字节秒级时间戳 + 独立的5字节随机数 + 3字节随机计数器初始值
+
+    随机数和计数器不使用 generate_id 的进程状态，派生的ID不会与本进程之后 generate_id 生成的ID重复。
+    种子需要保存下来（如导入检查点），之后用同一个种子才能派生出相同的ID。
+
+    Returns:
+        str: 24位十六进制种子
+    """
+    timestamp = int(time.time()) & 0xFFFFFFFF
+    return (timestamp.to_bytes(4, 'big') + os.urandom(8)).hex()
+
+
+def derive_id(seed: str, index: int) -> str:
+    """
+    由种子和序号确定性地生成 ObjectId 格式的ID，相同的种子和序号总是得到相同的ID
+
+    沿用种子的时间戳和随机数，计数器从种子的计数器之后按序号依次编号，溢出时进位到时间戳，
+    因此同一种子派生的ID互不相同，并按序号递增。
+
+    Args:
+        seed: generate_seed 生成的种子
+        index: 序号（从0开始）
+
+    Returns:
+        str: 24位十六进制ID
+    """
+    raw = bytes.fromhex(seed)
+    timestamp = int.from_bytes(raw[:4], 'big')
+    counter = int.from_bytes(raw[9:12], 'big') + index + 1
+    timestamp = (timestamp + (counter >> 24)) & 0xFFFFFFFF
+    return (timestamp.to_bytes(4, 'big') + raw[4:9] + (counter & 0xFFFFFF).to_bytes(3, 'big')).hex()
@@ -0,0 +1,268 @@
+"""
+重复任务展开
+
+将带有 repeatFlag 的任务按重复规则展开为查询窗口内的各次发生时间，支持 RRULE 字符串、
+README 中列出的中文简写以及 exDate 排除日期。展开结果按 (任务etag, 窗口) 缓存。
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta, tzinfo
+import threading
+from dateutil.rrule import rrulestr
+from .timezone import DEFAULT_TIMEZONE, UTC, get_timezone, localize
+
+# 中文简写对应的重复规则
+SHORTHAND_RULES = {
+    '每天': 'RRULE:FREQ=DAILY;INTERVAL=1',
+    '每周': 'RRULE:FREQ=WEEKLY;INTERVAL=1',
+    '每月': 'RRULE:FREQ=MONTHLY;INTERVAL=1',
+    '每年': 'RRULE:FREQ=YEARLY;INTERVAL=1',
+    '每周工作日': 'RRULE:FREQ=WEEKLY;INTERVAL=1;BYDAY=MO,TU,WE,TH,FR',
+    # 本地没有节假日数据，法定工作日按周一至周五处理
+    '法定工作日': 'RRULE:FREQ=WEEKLY;INTERVAL=1;BYDAY=MO,TU,WE,TH,FR',
+}
+
+# 艾宾浩斯记忆法：从开始日期起的复习间隔（天）
+EBBINGHAUS_OFFSETS = (0, 1, 2, 4, 7, 15, 30)
+
+# dateutil 支持的 RRULE 参数，其余（如滴答清单扩展的 TT_SKIP）会被忽略
+_SUPPORTED_PARTS = {
+    'FREQ', 'INTERVAL', 'COUNT', 'UNTIL', 'WKST', 'BYSETPOS', 'BYMONTH', 'BYMONTHDAY',
+    'BYYEARDAY', 'BYEASTER', 'BYWEEKNO', 'BYDAY', 'BYWEEKDAY', 'BYHOUR', 'BYMINUTE', 'BYSECOND',
+}
+
+Occurrence = Tuple[datetime, datetime]
+
+
+def parse_task_datetime(value: Optional[str], tz: tzinfo) -> Optional[datetime]:
+    """
+    解析任务中的时间字符串为指定时区的本地时间（不带时区信息）
+
+    支持 API 返回的UTC格式（2025-02-20T01:00:00.000+0000）、简化后的本地格式
+    （2025-02-20 09:00:00）以及 exDate 常见的紧凑格式（20250220T010000Z、20250220）。
+
+    Args:
+        value: 时间字符串
+        tz: 本地时区
+
+    Returns:
+        Optional[datetime]: 本地时间，无法解析时返回None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z", "%Y%m%dT%H%M%SZ"):
+        try:
+            dt = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=UTC)
+        return dt.astimezone(tz).replace(tzinfo=None)
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y%m%dT%H%M%S", "%Y%m%d", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def normalize_rule(repeat_flag: str) -> Optional[str]:
+    """
+    将 repeatFlag 规范化为 dateutil 可以解析的 RRULE 字符串
+
+    Args:
+        repeat_flag: 任务的重复规则
+
+    Returns:
+        Optional[str]: RRULE 字符串；艾宾浩斯规则或无法识别时返回None
+    """
+    rule = SHORTHAND_RULES.get(repeat_flag.strip(), repeat_flag.strip())
+    if not rule.upper().startswith('RRULE:'):
+        return None
+    parts = [
+        part for part in rule[len('RRULE:'):].split(';')
+        if part and part.split('=', 1)[0].upper() in _SUPPORTED_PARTS
+    ]
+    return 'RRULE:' + ';'.join(parts) if parts else None
+
+
+def _localize_until(rule: str, tz: tzinfo) -> str:
+    """
+    将规则中的 UNTIL 转换为本地无时区时间
+
+    规则按不带时区的本地时间展开，dateutil 不接受与 dtstart 时区不一致的 UTC 格式 UNTIL
+    （如 20251231T160000Z），这里换算为本地时间后去掉时区标记。
+    """
+    parts = []
+    for part in rule[len('RRULE:'):].split(';'):
+        key, _, value = part.partition('=')
+        if key.upper() == 'UNTIL':
+            until = parse_task_datetime(value, tz)
+            if until is not None:
+                if len(value.strip()) == 8:
+                    # 只有日期时包含当天全天
+                    until = until.replace(hour=23, minute=59, second=59)
+                part = f"{key}={until.strftime('%Y%m%dT%H%M%S')}"
+        parts.append(part)
+    return 'RRULE:' + ';'.join(parts)
+
+
+def is_recurring(task: Dict[str, Any]) -> bool:
+    """判断任务是否设置了重复规则"""
+    return bool(task.get('repeatFlag'))
+
+
+class RecurrenceEngine:
+    """
+    重复任务展开引擎
+
+    展开结果按 (任务ID, etag, 窗口) 做LRU缓存，etag 变化（任务被修改）后自动失效；
+    没有 etag 的任务使用时间和规则字段作为缓存键。可以在多个线程中共享。
+    """
+
+    def __init__(self, timezone: str = DEFAULT_TIMEZONE, cache_size: int = 4096):
+        """
+        初始化展开引擎
+
+        Args:
+            timezone: 本地时区，重复规则按本地时间展开
+            cache_size: 最多缓存的 (任务, 窗口) 数量
+        """
+        self.tz = get_timezone(timezone)
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[tuple, Tuple[Occurrence, ...]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._cache.clear()
+
+    def expand(self, task: Dict[str, Any], window_start: datetime,
+               window_end: datetime) -> List[Occurrence]:
+        """
+        展开任务在窗口内的所有发生时间
+
+        不重复的任务按 startDate 到 dueDate 作为唯一的一次发生。判断规则与按天查询一致：
+        全天任务的结束时间为截止日期当天的23:59:59，发生区间与 [window_start, window_end) 有重叠即算在窗口内。
+
+        Args:
+            task: 任务数据（原始或简化后的格式均可）
+            window_start: 窗口开始时间（包含），不带时区时视为本地时间
+            window_end: 窗口结束时间（不包含）
+
+        Returns:
+            List[Occurrence]: 按开始时间排序的 (开始, 结束) 列表，均为带时区的本地时间
+        """
+        start = self._to_local_naive(window_start)
+        end = self._to_local_naive(window_end)
+        key = self._cache_key(task, start, end)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return list(cached)
+
+        occurrences = tuple(
+            (localize(occ_start, self.tz), localize(occ_end, self.tz))
+            for occ_start, occ_end in self._expand_naive(task, start, end)
+        )
+        with self._lock:
+            self._cache[key] = occurrences
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return list(occurrences)
+
+    def occurs_in(self, task: Dict[str, Any], window_start: datetime, window_end: datetime) -> bool:
+        """判断任务在窗口内是否至少发生一次"""
+        return bool(self.expand(task, window_start, window_end))
+
+    def _to_local_naive(self, value: datetime) -> datetime:
+        """转换为本地时区的无时区时间"""
+        if value.tzinfo is not None:
+            value = value.astimezone(self.tz).replace(tzinfo=None)
+        return value
+
+    def _cache_key(self, task: Dict[str, Any], start: datetime, end: datetime) -> tuple:
+        """生成缓存键，etag 缺失时退化为使用影响展开结果的字段"""
+        if task.get('etag'):
+            identity = (task.get('id'), task['etag'])
+        else:
+            identity = (task.get('id'), task.get('startDate'), task.get('dueDate'), task.get('isAllDay'),
+                        task.get('repeatFlag'), tuple(task.get('exDate') or ()))
+        return identity + (start, end)
+
+    def span(self, task: Dict[str, Any]) -> Optional[Occurrence]:
+        """
+        获取任务首次发生的 (开始, 结束)，不考虑重复规则
+
+        Returns:
+            Optional[Occurrence]: 带时区的本地时间，任务没有时间时返回None
+        """
+        span = self._span(task)
+        if span is None:
+            return None
+        return localize(span[0], self.tz), localize(span[1], self.tz)
+
+    def _span(self, task: Dict[str, Any]) -> Optional[Occurrence]:
+        """获取任务首次发生的 (开始, 结束) 本地时间"""
+        start = parse_task_datetime(task.get('startDate'), self.tz)
+        due = parse_task_datetime(task.get('dueDate'), self.tz)
+        if not start and not due:
+            return None
+        start = start or due
+        due = due or start
+        if task.get('isAllDay'):
+            due = due.replace(hour=23, minute=59, second=59)
+        return start, max(start, due)
+
+    def _expand_naive(self, task: Dict[str, Any], window_start: datetime,
+                      window_end: datetime) -> List[Occurrence]:
+        """在本地无时区时间上展开"""
+        span = self._span(task)
+        if span is None:
+            return []
+        first_start, first_end = span
+        duration = first_end - first_start
+
+        repeat_flag = (task.get('repeatFlag') or '').strip()
+        if not repeat_flag:
+            starts = [first_start]
+        elif repeat_flag == '艾宾浩斯记忆法' or 'FORGETTINGCURVE' in repeat_flag.upper():
+            starts = [first_start + timedelta(days=offset) for offset in EBBINGHAUS_OFFSETS]
+        else:
+            rule = normalize_rule(repeat_flag)
+            if rule is None:
+                starts = [first_start]
+            else:
+                try:
+                    rrule = rrulestr(_localize_until(rule, self.tz), dtstart=first_start)
+                except (ValueError, TypeError) as e:
+                    print(f"Warning: Failed to parse repeat rule {repeat_flag}: {e}")
+                    starts = [first_start]
+                else:
+                    # 开始时间早于窗口的发生也可能因为持续时间而覆盖窗口
+                    starts = rrule.between(window_start - duration, window_end, inc=True)
+
+        excluded = self._excluded(task)
+        occurrences = []
+        for occ_start in starts:
+            occ_end = occ_start + duration
+            if occ_start >= window_end or occ_end < window_start:
+                continue
+            if occ_start in excluded or occ_start.date() in excluded:
+                continue
+            occurrences.append((occ_start, occ_end))
+        return occurrences
+
+    def _excluded(self, task: Dict[str, Any]) -> set:
+        """解析 exDate，带时间的按具体时间排除，只有日期的按整天排除"""
+        excluded = set()
+        for value in task.get('exDate') or ():
+            parsed = parse_task_datetime(value, self.tz)
+            if parsed is None:
+                continue
+            is_date_only = len(value.strip()) in (8, 10)
+            excluded.add(parsed.date() if is_date_only else parsed)
+        return excluded
@@ -0,0 +1,134 @@
+"""
+项目、标签和栏目的名称解析缓存
+"""
+from typing import Dict, Any, List, Optional, Iterable
+import threading
+
+
+class NameResolver:
+    """
+    名称解析缓存：项目名称→项目ID、标签名称→标签、栏目ID→栏目
+
+    缓存由同步数据（/api/v2/batch/check）填充，SDK 每次同步都会刷新缓存；本地的创建、
+    修改和删除操作通过 put_*/remove_* 方法同步更新缓存，因此解析名称时不需要再请求网络。
+    同一个客户端的各个API模块共享同一个实例，可以在多个线程中使用。
+    """
+
+    def __init__(self):
+        self._projects: Dict[str, Dict[str, Any]] = {}
+        self._project_ids: Dict[str, str] = {}
+        self._tags: Dict[str, Dict[str, Any]] = {}
+        self._columns: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        """是否已经用同步数据填充过"""
+        return self._loaded
+
+    def sync(self, response: Dict[str, Any], full: bool = True) -> None:
+        """
+        用同步数据更新缓存
+
+        Args:
+            response: /api/v2/batch/check 的响应数据
+            full: True表示全量数据（check/0），会替换整个缓存；False表示增量数据，只更新其中出现的项目和标签
+        """
+        projects = response.get('projectProfiles')
+        tags = response.get('tags')
+        with self._lock:
+            if full:
+                self._projects.clear()
+                self._project_ids.clear()
+                self._tags.clear()
+                self._columns.clear()
+            for project in projects or ():
+                self.put_project(project)
+            for tag in tags or ():
+                self.put_tag(tag)
+            # 部分接口把栏目单独放在同步数据中
+            self.put_columns(response.get('columns') or ())
+            if full:
+                self._loaded = True
+
+    def clear(self) -> None:
+        """清空缓存，下次解析时重新同步"""
+        with self._lock:
+            self._projects.clear()
+            self._project_ids.clear()
+            self._tags.clear()
+            self._columns.clear()
+            self._loaded = False
+
+    def project_id(self, name: str) -> Optional[str]:
+        """根据项目名称查找项目ID，未找到时返回None"""
+        return self._project_ids.get(name)
+
+    def project(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """根据项目ID查找项目"""
+        return self._projects.get(project_id)
+
+    def projects(self) -> List[Dict[str, Any]]:
+        """所有已缓存的项目"""
+        with self._lock:
+            return list(self._projects.values())
+
+    def tag(self, name: str) -> Optional[Dict[str, Any]]:
+        """根据标签名称查找标签"""
+        return self._tags.get(name)
+
+    def tags(self) -> List[Dict[str, Any]]:
+        """所有已缓存的标签"""
+        with self._lock:
+            return list(self._tags.values())
+
+    def column(self, column_id: str) -> Optional[Dict[str, Any]]:
+        """根据栏目ID查找栏目"""
+        return self._columns.get(column_id)
+
+    def put_project(self, project: Dict[str, Any]) -> None:
+        """新增或更新项目（包括项目中的栏目）"""
+        with self._lock:
+            previous = self._projects.get(project['id'])
+            if previous is not None and self._project_ids.get(previous.get('name')) == project['id']:
+                del self._project_ids[previous['name']]
+            merged = dict(previous or {}, **project)
+            self._projects[project['id']] = merged
+            if merged.get('name'):
+                self._project_ids[merged['name']] = project['id']
+            self.put_columns(project.get('columns') or ())
+
+    def remove_project(self, project_id: str) -> None:
+        """删除项目及其栏目"""
+        with self._lock:
+            project = self._projects.pop(project_id, None)
+            if project is None:
+                return
+            if self._project_ids.get(project.get('name')) == project_id:
+                del self._project_ids[project['name']]
+            for column_id in [cid for cid, column in self._columns.items() if column.get('projectId') == project_id]:
+                del self._columns[column_id]
+
+    def put_tag(self, tag: Dict[str, Any]) -> None:
+        """新增或更新标签"""
+        with self._lock:
+            self._tags[tag['name']] = dict(self._tags.get(tag['name']) or {}, **tag)
+
+    def rename_tag(self, old_name: str, new_name: str) -> None:
+        """重命名标签"""
+        with self._lock:
+            tag = self._tags.pop(old_name, None)
+            if tag is not None:
+                self._tags[new_name] = dict(tag, name=new_name, label=new_name)
+
+    def remove_tag(self, name: str) -> None:
+        """删除标签"""
+        with self._lock:
+            self._tags.pop(name, None)
+
+    def put_columns(self, columns: Iterable[Dict[str, Any]]) -> None:
+        """新增或更新栏目"""
+        with self._lock:
+            for column in columns:
+                self._columns[column['id']] = column
@@ -0,0 +1,314 @@
+"""
+本地提醒调度
+
+根据任务的 reminders 触发器（如 TRIGGER:-PT15M）计算绝对提醒时间，并在到期时调用回调函数。
+使用最小堆保存待触发的提醒，每次调度和触发都是 O(log n)；任务变化时只重新调度发生变化的任务。
+"""
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple
+from datetime import datetime, timedelta
+import heapq
+import itertools
+import re
+import threading
+import time
+from .recurrence import RecurrenceEngine, is_recurring, parse_task_datetime
+from .timezone import DEFAULT_TIMEZONE, get_timezone, localize
+
+_TRIGGER_PATTERN = re.compile(
+    r'^(?P<sign>[-+])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?'
+    r'(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$'
+)
+
+ReminderCallback = Callable[[Dict[str, Any], datetime, str], None]
+
+
+def parse_trigger(trigger: str) -> Optional[timedelta]:
+    """
+    解析提醒触发器为相对任务时间的偏移
+
+    Args:
+        trigger: 触发器字符串，如 "TRIGGER:-PT15M"、"TRIGGER:-P1D"、"TRIGGER:P0DT9H0M0S"
+
+    Returns:
+        Optional[timedelta]: 偏移量（提前为负数），格式不正确时返回None
+    """
+    if not trigger:
+        return None
+    value = trigger.strip()
+    if value.upper().startswith('TRIGGER:'):
+        value = value[len('TRIGGER:'):]
+    match = _TRIGGER_PATTERN.match(value.upper())
+    if not match:
+        return None
+    parts = {name: int(number) for name, number in match.groupdict().items()
+             if name != 'sign' and number}
+    offset = timedelta(
+        weeks=parts.get('weeks', 0), days=parts.get('days', 0), hours=parts.get('hours', 0),
+        minutes=parts.get('minutes', 0), seconds=parts.get('seconds', 0)
+    )
+    return -offset if match.group('sign') == '-' else offset
+
+
+class ReminderScheduler:
+    """
+    基于最小堆的提醒调度器
+
+    - 堆中每个元素是 (触发时间戳, 序号, 任务ID, 版本, 触发器)，任务重新调度时只增加版本号，
+      旧元素在弹出时被丢弃（延迟删除），失效元素过多时整体压缩
+    - sync() 按任务的 etag（没有时使用相关字段）判断是否变化，只重新调度变化的任务
+    - 可以手动调用 run_pending()，也可以 start() 启动后台线程在到期时自动触发
+
+    普通任务的提醒以 startDate（没有时为 dueDate）为基准；全天任务以当天零点为基准，
+    例如 TRIGGER:P0DT9H0M0S 表示当天 09:00。已完成和已删除的任务不会提醒。
+    重复任务按重复规则展开，为 horizon 范围内的每次发生调度提醒，时间推进后自动向后续排。
+    """
+
+    def __init__(self, callback: ReminderCallback, timezone: str = DEFAULT_TIMEZONE,
+                 catch_up: timedelta = timedelta(0), horizon: timedelta = timedelta(days=7),
+                 engine: Optional[RecurrenceEngine] = None):
+        """
+        初始化调度器
+
+        Args:
+            callback: 提醒回调，参数为 (任务数据, 提醒时间, 触发器)
+            timezone: 任务时间所在的时区
+            catch_up: 调度时仍然保留的已过期提醒的时间范围，默认丢弃所有已过期的提醒
+            horizon: 重复任务预先调度的时间范围
+            engine: 重复任务展开引擎，默认按 timezone 新建
+        """
+        self.callback = callback
+        self.tz = get_timezone(timezone)
+        self.catch_up = catch_up
+        self.horizon = horizon
+        self.engine = engine or RecurrenceEngine(timezone)
+        self._heap: List[Tuple[float, int, str, int, str]] = []
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._signatures: Dict[str, tuple] = {}
+        self._versions: Dict[str, int] = {}
+        self._live = 0  # 堆中仍然有效的元素数量
+        self._live_per_task: Dict[str, int] = {}
+        self._scheduled_until: Dict[str, float] = {}  # 重复任务已调度到的时间戳
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def __len__(self) -> int:
+        """待触发的提醒数量"""
+        return self._live
+
+    def sync(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """
+        同步任务快照：新增或变化的任务重新调度，快照中不存在的任务取消提醒
+
+        Args:
+            tasks: 任务列表
+        """
+        seen = set()
+        for task in tasks:
+            seen.add(task['id'])
+            self.update_task(task)
+        for task_id in [task_id for task_id in self._tasks if task_id not in seen]:
+            self.remove_task(task_id)
+
+    def update_task(self, task: Dict[str, Any]) -> None:
+        """
+        新增或更新单个任务的提醒，任务没有变化时不做任何操作
+
+        Args:
+            task: 任务数据
+        """
+        task_id = task['id']
+        signature = self._signature(task)
+        with self._lock:
+            if self._signatures.get(task_id) == signature:
+                self._tasks[task_id] = task
+                return
+            self._invalidate(task_id)
+            self._tasks[task_id] = task
+            self._signatures[task_id] = signature
+            now = time.time()
+            self._schedule(task_id, now - self.catch_up.total_seconds(), now + self.horizon.total_seconds())
+            self._maybe_compact()
+            self._wakeup.notify_all()
+
+    def remove_task(self, task_id: str) -> None:
+        """
+        取消任务的所有提醒
+
+        Args:
+            task_id: 任务ID
+        """
+        with self._lock:
+            self._invalidate(task_id)
+            self._tasks.pop(task_id, None)
+            self._signatures.pop(task_id, None)
+            self._scheduled_until.pop(task_id, None)
+            self._maybe_compact()
+            self._wakeup.notify_all()
+
+    def next_fire_time(self) -> Optional[datetime]:
+        """获取下一次提醒的时间，没有待触发的提醒时返回None"""
+        with self._lock:
+            self._drop_stale()
+            if not self._heap:
+                return None
+            return datetime.fromtimestamp(self._heap[0][0], self.tz)
+
+    def run_pending(self, now: Optional[datetime] = None) -> int:
+        """
+        触发所有已到期的提醒
+
+        Args:
+            now: 当前时间，默认为系统时间
+
+        Returns:
+            int: 本次触发的提醒数量
+        """
+        deadline = now.timestamp() if now is not None else time.time()
+        due = []
+        with self._lock:
+            self._extend(deadline)
+            while self._heap and self._heap[0][0] <= deadline:
+                fire_at, _, task_id, version, trigger = heapq.heappop(self._heap)
+                if self._versions.get(task_id) != version:
+                    continue
+                self._live -= 1
+                self._live_per_task[task_id] -= 1
+                due.append((self._tasks[task_id], datetime.fromtimestamp(fire_at, self.tz), trigger))
+        # 回调在锁外执行，回调中可以安全地更新调度器
+        for task, fire_time, trigger in due:
+            self.callback(task, fire_time, trigger)
+        return len(due)
+
+    def start(self) -> None:
+        """启动后台线程，在提醒到期时自动触发"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._loop, name='dida-reminders', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """停止后台线程"""
+        with self._lock:
+            self._running = False
+            self._wakeup.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def _loop(self) -> None:
+        """后台线程：等待到下一次提醒或调度变化"""
+        while True:
+            with self._lock:
+                if not self._running:
+                    return
+                self._drop_stale()
+                wake_at = [self._heap[0][0]] if self._heap else []
+                if self._scheduled_until:
+                    # 重复任务需要在调度范围用完之前向后续排
+                    wake_at.append(min(self._scheduled_until.values()) - self.horizon.total_seconds() / 2)
+                timeout = min(wake_at) - time.time() if wake_at else None
+                if timeout is None or timeout > 0:
+                    self._wakeup.wait(timeout)
+                    continue
+            self.run_pending()
+
+    def _signature(self, task: Dict[str, Any]) -> tuple:
+        """任务中影响提醒时间的字段"""
+        if task.get('etag'):
+            return (task['etag'],)
+        reminders = tuple(
+            reminder.get('trigger') if isinstance(reminder, dict) else reminder
+            for reminder in task.get('reminders') or ()
+        )
+        return (task.get('startDate'), task.get('dueDate'), task.get('isAllDay'), task.get('status'),
+                task.get('deleted'), task.get('reminder'), reminders)
+
+    def _schedule(self, task_id: str, since: float, until: float) -> None:
+        """
+        将任务在 [since, until) 内的提醒加入堆（需持有锁）
+
+        不重复的任务只有一次发生，提醒不受 until 限制；重复任务记录调度到的位置，之后由 _extend 续排。
+        """
+        task = self._tasks[task_id]
+        version = self._versions[task_id]
+        recurring = is_recurring(task)
+        for fire_at, trigger in self._fire_times(task, since, until):
+            if fire_at < since or (recurring and fire_at >= until):
+                continue
+            heapq.heappush(self._heap, (fire_at, next(self._sequence), task_id, version, trigger))
+            self._live += 1
+            self._live_per_task[task_id] = self._live_per_task.get(task_id, 0) + 1
+        if recurring:
+            self._scheduled_until[task_id] = until
+        else:
+            self._scheduled_until.pop(task_id, None)
+
+    def _extend(self, now: float) -> None:
+        """调度范围剩余不到一半的重复任务向后续排到 now + horizon（需持有锁）"""
+        horizon = self.horizon.total_seconds()
+        for task_id, until in list(self._scheduled_until.items()):
+            if until - now < horizon / 2:
+                self._schedule(task_id, until, now + horizon)
+
+    def _fire_times(self, task: Dict[str, Any], since: float,
+                    until: float) -> List[Tuple[float, str]]:
+        """计算任务所有提醒的触发时间戳，重复任务只展开 [since, until) 附近的发生"""
+        if task.get('status') == 2 or task.get('isCompleted') or task.get('deleted'):
+            return []
+        triggers = [
+            reminder.get('trigger') if isinstance(reminder, dict) else reminder
+            for reminder in task.get('reminders') or ()
+        ]
+        if not triggers and task.get('reminder'):
+            triggers = [task['reminder']]
+        offsets = [(trigger, parse_trigger(trigger)) for trigger in dict.fromkeys(triggers)]
+        offsets = [(trigger, offset) for trigger, offset in offsets if offset is not None]
+        if not offsets:
+            return []
+
+        if is_recurring(task):
+            # 提醒可能早于或晚于发生时间，展开窗口按最大偏移放宽
+            earliest = min(offset for _, offset in offsets)
+            latest = max(offset for _, offset in offsets)
+            window_start = datetime.fromtimestamp(since, self.tz) - max(latest, timedelta(0))
+            window_end = datetime.fromtimestamp(until, self.tz) - min(earliest, timedelta(0))
+            anchors = [occ_start for occ_start, _ in self.engine.expand(task, window_start, window_end)]
+        else:
+            anchor = parse_task_datetime(task.get('startDate') or task.get('dueDate'), self.tz)
+            if anchor is None:
+                return []
+            anchors = [localize(anchor, self.tz)]
+        if task.get('isAllDay'):
+            anchors = [
+                localize(anchor.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None), self.tz)
+                for anchor in anchors
+            ]
+
+        return [
+            ((anchor + offset).timestamp(), trigger)
+            for anchor in anchors
+            for trigger, offset in offsets
+        ]
+
+    def _invalidate(self, task_id: str) -> None:
+        """使任务在堆中的所有元素失效（需持有锁）"""
+        self._versions[task_id] = self._versions.get(task_id, 0) + 1
+        self._live -= self._live_per_task.pop(task_id, 0)
+        self._scheduled_until.pop(task_id, None)
+
+    def _drop_stale(self) -> None:
+        """弹出堆顶的失效元素（需持有锁）"""
+        while self._heap and self._versions.get(self._heap[0][2]) != self._heap[0][3]:
+            heapq.heappop(self._heap)
+
+    def _maybe_compact(self) -> None:
+        """失效元素超过一半时重建堆，避免频繁重新调度导致堆无限增长（需持有锁）"""
+        if len(self._heap) > 64 and len(self._heap) > 2 * self._live:
+            self._heap = [entry for entry in self._heap if self._versions.get(entry[2]) == entry[3]]
+            heapq.heapify(self._heap)
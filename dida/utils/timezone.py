@@ -0,0 +1,74 @@
+"""
+时区处理
+
+优先使用标准库 zoneinfo（Python 3.9+），系统没有时区数据库或 Python 版本较低时退回 pytz。
+时区对象按名称缓存，在逐任务的循环中反复获取不会重新加载时区数据。
+"""
+from typing import Optional
+from datetime import datetime, timedelta, timezone as _timezone, tzinfo
+from functools import lru_cache
+import pytz
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python 3.7/3.8
+    ZoneInfo = None
+
+# 未指定时区时使用的默认时区
+DEFAULT_TIMEZONE = 'Asia/Shanghai'
+
+UTC = _timezone.utc
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name: Optional[str] = None) -> tzinfo:
+    """
+    获取时区对象（带缓存）
+
+    Args:
+        name: IANA 时区名称，如 "Asia/Shanghai"、"America/New_York"，默认为 DEFAULT_TIMEZONE
+
+    Returns:
+        tzinfo: zoneinfo.ZoneInfo，不可用时为 pytz 时区
+
+    Raises:
+        pytz.UnknownTimeZoneError: 时区名称无效
+    """
+    name = name or DEFAULT_TIMEZONE
+    if ZoneInfo is not None:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return pytz.timezone(name)
+
+
+def localize(value: datetime, tz: tzinfo) -> datetime:
+    """
+    为不带时区信息的本地时间附加时区，夏令时按该时刻实际生效的偏移处理
+
+    Args:
+        value: 不带时区信息的本地时间
+        tz: get_timezone 返回的时区
+
+    Returns:
+        datetime: 带时区的时间
+    """
+    if hasattr(tz, 'localize'):
+        return tz.localize(value)
+    return value.replace(tzinfo=tz)
+
+
+def shift(value: datetime, delta: timedelta, tz: tzinfo) -> datetime:
+    """
+    按实际经过的时间偏移带时区的时间，跨越夏令时切换时结果的UTC偏移会相应变化
+
+    Args:
+        value: 带时区的时间
+        delta: 偏移量
+        tz: 结果所在的时区
+
+    Returns:
+        datetime: 带时区的时间
+    """
+    return (value.astimezone(UTC) + delta).astimezone(tz)
@@ -0,0 +1,391 @@
+"""
+任务树索引
+
+维护任务之间的父子关系和欧拉序区间，使子树、祖先查询变成区间操作，并且全部使用迭代实现，
+层级很深时也不会触发Python的递归深度限制。
+"""
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Set
+from collections.abc import Mapping
+
+
+class TaskTreeIndex:
+    """
+    持久化的任务树索引
+
+    - 父指针和子节点表在新增、删除、移动任务时增量更新
+    - 欧拉序区间（进入序号tin和子树最后一个节点序号tout）在结构变化后惰性重建，
+      多次修改只会在下一次区间查询时重建一次
+    - 子节点按加入顺序排列，已存在的任务在同步时保持原有位置
+    - 父任务暂时不存在时，子任务作为根任务，父任务出现后自动挂回
+    """
+
+    def __init__(self, tasks: Optional[Iterable[Dict[str, Any]]] = None):
+        """
+        初始化索引
+
+        Args:
+            tasks: 可选的扁平任务列表
+        """
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._declared: Dict[str, Optional[str]] = {}  # 任务数据中声明的父任务ID
+        self._parent: Dict[str, Optional[str]] = {}  # 实际生效的父任务ID
+        # 用字典作为有序集合，删除子节点是O(1)；键None表示根任务
+        self._children: Dict[Optional[str], Dict[str, None]] = {None: {}}
+        self._waiting: Dict[str, Dict[str, None]] = {}  # 父任务ID -> 等待挂载的子任务
+        self._order: List[str] = []
+        self._tin: Dict[str, int] = {}
+        self._tout: Dict[str, int] = {}
+        self._dirty = True
+        if tasks is not None:
+            self.sync(tasks)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._nodes
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """获取任务数据"""
+        return self._nodes.get(task_id)
+
+    def parent(self, task_id: str) -> Optional[str]:
+        """获取父任务ID，根任务返回None"""
+        return self._parent.get(task_id)
+
+    def children(self, task_id: Optional[str]) -> List[str]:
+        """获取直接子任务ID列表，task_id为None时返回根任务"""
+        return list(self._children.get(task_id, ()))
+
+    def roots(self) -> List[str]:
+        """获取根任务ID列表"""
+        return list(self._children[None])
+
+    def sync(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """
+        将索引同步为给定的任务列表，只对新增、删除和父任务变化的任务做修改
+
+        Args:
+            tasks: 扁平任务列表
+        """
+        seen = set()
+        for task in tasks:
+            task_id = task['id']
+            seen.add(task_id)
+            if task_id in self._nodes:
+                self.update(task)
+            else:
+                self.add(task)
+        for task_id in [task_id for task_id in self._nodes if task_id not in seen]:
+            self.remove(task_id)
+
+    def add(self, task: Dict[str, Any]) -> None:
+        """
+        新增任务，已存在时等同于更新
+
+        Args:
+            task: 任务数据
+        """
+        task_id = task['id']
+        if task_id in self._nodes:
+            self.update(task)
+            return
+        self._nodes[task_id] = task
+        self._children.setdefault(task_id, {})
+        self._attach(task_id, task.get('parentId') or None, strict=False)
+        # 挂回之前因为找不到父任务而暂时作为根任务的子任务
+        for child_id in self._waiting.pop(task_id, {}):
+            if self._declared.get(child_id) == task_id:
+                self._detach(child_id)
+                self._attach(child_id, task_id, strict=False)
+
+    def update(self, task: Dict[str, Any]) -> None:
+        """
+        更新任务数据，父任务变化时移动到新的位置
+
+        Args:
+            task: 任务数据
+        """
+        task_id = task['id']
+        if task_id not in self._nodes:
+            self.add(task)
+            return
+        self._nodes[task_id] = task
+        parent_id = task.get('parentId') or None
+        if parent_id != self._declared.get(task_id):
+            self._detach(task_id)
+            self._attach(task_id, parent_id, strict=False)
+
+    def move(self, task_id: str, parent_id: Optional[str]) -> None:
+        """
+        将任务移动到新的父任务下
+
+        Args:
+            task_id: 任务ID
+            parent_id: 新的父任务ID，None表示移动为根任务
+
+        Raises:
+            KeyError: 任务不存在
+            ValueError: 新的父任务是该任务自身或其子孙任务
+        """
+        if task_id not in self._nodes:
+            raise KeyError(task_id)
+        if parent_id is not None and self._creates_cycle(task_id, parent_id):
+            raise ValueError(f"不能将任务 '{task_id}' 移动到其自身或子任务下")
+        self._detach(task_id)
+        self._attach(task_id, parent_id, strict=True)
+
+    def remove(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        删除任务，其子任务变为根任务，父任务重新出现时会自动挂回
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            Optional[Dict[str, Any]]: 被删除的任务数据
+        """
+        if task_id not in self._nodes:
+            return None
+        self._detach(task_id)
+        for child_id in list(self._children.pop(task_id, {})):
+            self._parent[child_id] = None
+            self._children[None][child_id] = None
+            self._waiting.setdefault(task_id, {})[child_id] = None
+        self._declared.pop(task_id, None)
+        self._parent.pop(task_id, None)
+        self._dirty = True
+        return self._nodes.pop(task_id)
+
+    def descendants(self, task_id: str) -> List[str]:
+        """
+        获取所有子孙任务ID（先序），即欧拉序区间 (tin, tout] 内的任务
+
+        Args:
+            task_id: 任务ID
+        """
+        self._ensure_tour()
+        return self._order[self._tin[task_id] + 1:self._tout[task_id] + 1]
+
+    def subtree(self, task_id: str) -> List[str]:
+        """获取任务自身及所有子孙任务ID（先序）"""
+        self._ensure_tour()
+        return self._order[self._tin[task_id]:self._tout[task_id] + 1]
+
+    def ancestors(self, task_id: str) -> List[str]:
+        """
+        获取所有祖先任务ID，从直接父任务到根任务
+
+        Args:
+            task_id: 任务ID
+        """
+        result = []
+        parent_id = self._parent.get(task_id)
+        while parent_id is not None:
+            result.append(parent_id)
+            parent_id = self._parent.get(parent_id)
+        return result
+
+    def is_ancestor(self, ancestor_id: str, task_id: str) -> bool:
+        """判断 ancestor_id 是否为 task_id 的祖先（或自身），O(1)区间判断"""
+        self._ensure_tour()
+        return self._tin[ancestor_id] <= self._tin[task_id] <= self._tout[ancestor_id]
+
+    def with_ancestors(self, task_ids: Iterable[str]) -> Set[str]:
+        """
+        返回给定任务及其所有祖先，用于"保留祖先的过滤树"
+
+        向上查找遇到已加入的任务即停止，总开销与结果大小成正比。
+
+        Args:
+            task_ids: 任务ID列表
+        """
+        kept: Set[str] = set()
+        for task_id in task_ids:
+            while task_id is not None and task_id not in kept and task_id in self._nodes:
+                kept.add(task_id)
+                task_id = self._parent.get(task_id)
+        return kept
+
+    def preorder(self) -> Iterator[str]:
+        """按先序（欧拉序）遍历所有任务ID"""
+        self._ensure_tour()
+        return iter(self._order)
+
+    def sort_preorder(self, task_ids: Iterable[str]) -> List[str]:
+        """将给定任务按先序排列，只对给定任务排序，不遍历整棵树"""
+        self._ensure_tour()
+        return sorted(task_ids, key=self._tin.__getitem__)
+
+    def build_tree(self) -> List[Dict[str, Any]]:
+        """
+        为任务数据设置 children 字段并返回根任务列表，与 build_task_tree 的结果结构一致
+
+        Returns:
+            List[Dict[str, Any]]: 根任务列表
+        """
+        for task_id, task in self._nodes.items():
+            task['children'] = [self._nodes[child_id] for child_id in self._children.get(task_id, ())]
+        return [self._nodes[task_id] for task_id in self._children[None]]
+
+    def _creates_cycle(self, task_id: str, parent_id: str) -> bool:
+        """判断把任务挂到 parent_id 下是否会形成环"""
+        current: Optional[str] = parent_id
+        while current is not None:
+            if current == task_id:
+                return True
+            current = self._parent.get(current)
+        return False
+
+    def _detach(self, task_id: str) -> None:
+        """从当前父任务（以及等待列表）中移除"""
+        parent_id = self._parent.get(task_id)
+        self._children.get(parent_id, {}).pop(task_id, None)
+        declared = self._declared.get(task_id)
+        if declared is not None and declared in self._waiting:
+            self._waiting[declared].pop(task_id, None)
+            if not self._waiting[declared]:
+                del self._waiting[declared]
+        self._dirty = True
+
+    def _attach(self, task_id: str, parent_id: Optional[str], strict: bool) -> None:
+        """挂到父任务下；父任务不存在或会形成环时作为根任务"""
+        self._declared[task_id] = parent_id
+        effective = parent_id
+        if parent_id is not None:
+            if parent_id not in self._nodes:
+                self._waiting.setdefault(parent_id, {})[task_id] = None
+                effective = None
+            elif not strict and self._creates_cycle(task_id, parent_id):
+                effective = None
+        self._parent[task_id] = effective
+        self._children.setdefault(effective, {})[task_id] = None
+        self._dirty = True
+
+    def _ensure_tour(self) -> None:
+        """结构变化后重建欧拉序区间（迭代实现）"""
+        if not self._dirty:
+            return
+        order: List[str] = []
+        tin: Dict[str, int] = {}
+        tout: Dict[str, int] = {}
+        stack = [(None, iter(list(self._children[None])))]
+        while stack:
+            node_id, children = stack[-1]
+            child_id = next(children, None)
+            if child_id is None:
+                stack.pop()
+                if node_id is not None:
+                    tout[node_id] = len(order) - 1
+                continue
+            tin[child_id] = len(order)
+            order.append(child_id)
+            stack.append((child_id, iter(list(self._children.get(child_id, ())))))
+        self._order, self._tin, self._tout = order, tin, tout
+        self._dirty = False
+
+
+class FilteredTaskTree:
+    """
+    过滤后的任务树
+
+    只保存匹配标记和裁剪后的子任务ID列表，任务数据与快照共享，不做任何复制。
+    """
+
+    __slots__ = ('_tasks', '_children', '_matched')
+
+    def __init__(self, tasks: Dict[str, Dict[str, Any]], children: Dict[Optional[str], List[str]],
+                 matched: Set[str]):
+        """
+        初始化过滤树
+
+        Args:
+            tasks: 保留的任务ID -> 共享的任务数据
+            children: 父任务ID（根为None） -> 保留的子任务ID列表
+            matched: 自身匹配条件的任务ID（其余保留的任务是因为有匹配的子孙任务）
+        """
+        self._tasks = tasks
+        self._children = children
+        self._matched = matched
+
+    @classmethod
+    def from_index(cls, index: TaskTreeIndex, matched: Set[str]) -> 'FilteredTaskTree':
+        """
+        根据树索引和匹配的任务构建过滤树，匹配任务的祖先会被保留
+
+        Args:
+            index: 任务树索引
+            matched: 自身匹配条件的任务ID
+        """
+        kept = index.with_ancestors(matched)
+        children: Dict[Optional[str], List[str]] = {}
+        # 按先序排列保证兄弟任务的相对顺序不变
+        for task_id in index.sort_preorder(kept):
+            children.setdefault(index.parent(task_id), []).append(task_id)
+        return cls({task_id: index.get(task_id) for task_id in kept}, children, matched)
+
+    def roots(self) -> List['TaskView']:
+        """获取根任务视图列表"""
+        return [TaskView(self, task_id) for task_id in self._children.get(None, ())]
+
+
+class TaskView(Mapping):
+    """
+    过滤树中单个任务的只读视图
+
+    行为与任务字典一致（支持 task['title']、task.get()、in、dict(task) 等），
+    其中 children 只包含过滤后保留的子任务，访问时才生成对应的视图。
+    需要真正的字典时调用 to_dict()，例如 json.dumps(tasks, default=TaskView.to_dict)。
+    """
+
+    __slots__ = ('_tree', '_task_id')
+
+    def __init__(self, tree: FilteredTaskTree, task_id: str):
+        self._tree = tree
+        self._task_id = task_id
+
+    @property
+    def matched(self) -> bool:
+        """任务自身是否匹配条件（False表示只是因为有匹配的子孙任务而被保留）"""
+        return self._task_id in self._tree._matched
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'children':
+            return [TaskView(self._tree, child_id) for child_id in self._tree._children.get(self._task_id, ())]
+        return self._tree._tasks[self._task_id][key]
+
+    def __iter__(self) -> Iterator[str]:
+        task = self._tree._tasks[self._task_id]
+        yield from task
+        if 'children' not in task:
+            yield 'children'
+
+    def __len__(self) -> int:
+        task = self._tree._tasks[self._task_id]
+        return len(task) + (0 if 'children' in task else 1)
+
+    def __repr__(self) -> str:
+        return f"TaskView({self._tree._tasks[self._task_id].get('title')!r})"
+
+    def copy(self) -> Dict[str, Any]:
+        """复制为字典，与 dict.copy 一致只复制一层"""
+        return dict(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为独立的字典，children 会递归转换（迭代实现）
+
+        Returns:
+            Dict[str, Any]: 任务数据
+        """
+        tree = self._tree
+        result = dict(tree._tasks[self._task_id])
+        stack = [(self._task_id, result)]
+        while stack:
+            task_id, data = stack.pop()
+            data['children'] = []
+            for child_id in tree._children.get(task_id, ()):
+                child = dict(tree._tasks[child_id])
+                data['children'].append(child)
+                stack.append((child_id, child))
+        return result
@@ -32,5 +32,10 @@ setup(
         "python-dateutil>=2.8.0",
         "pytz>=2024.1",
     ],
+    entry_points={
+        "console_scripts": [
+            "dida-import=dida.importer:main",
+        ],
+    },
     keywords="dida365 ticktick todo task management api sdk",
 ) 
\ No newline at end of file